@@ -0,0 +1,80 @@
+import sys
+import time
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+from tracing import span
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 배치 모드 여부 (True면 plt.show()를 호출하지 않음)
+_BATCH_MODE = False
+
+# finish_figure 단계별 소요 시간 기록 (벤치마크용, None이면 기록하지 않음)
+_STAGE_TIMINGS = None
+
+def enable_batch_mode():
+    """배치 모드 활성화: 비대화형 Agg 백엔드 강제, plt.show() 생략"""
+    global _BATCH_MODE
+    matplotlib.use('Agg', force=True)
+    _BATCH_MODE = True
+
+def is_batch_mode():
+    """배치 모드 여부"""
+    return _BATCH_MODE
+
+def record_stage_timings(enabled=True):
+    """finish_figure의 tight_layout/savefig 소요 시간 기록 시작 (enabled=False면 중지)"""
+    global _STAGE_TIMINGS
+    _STAGE_TIMINGS = [] if enabled else None
+
+def pop_stage_timings():
+    """기록된 단계별 소요 시간 목록을 반환하고 비움"""
+    if _STAGE_TIMINGS is None:
+        return []
+    timings = list(_STAGE_TIMINGS)
+    _STAGE_TIMINGS.clear()
+    return timings
+
+def finish_figure(fig, path=None, dpi=300):
+    """레이아웃 정리 → 저장 → (대화형일 때만) 표시 → 그림 해제"""
+    start = time.perf_counter()
+    with span('tight_layout', cat='layout'):
+        fig.tight_layout()
+    laid_out = time.perf_counter()
+    if path is not None:
+        with span('savefig', cat='savefig', path=path):
+            fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    if _STAGE_TIMINGS is not None:
+        _STAGE_TIMINGS.append({'path': path,
+                               'tight_layout': laid_out - start,
+                               'savefig': time.perf_counter() - laid_out})
+    if not _BATCH_MODE:
+        plt.show()
+    plt.close(fig)
+
+def _maxrss_mb(who):
+    """getrusage 최대 RSS를 MB 단위로 변환 (Linux는 KB, macOS는 바이트)"""
+    maxrss = resource.getrusage(who).ru_maxrss
+    if sys.platform == 'darwin':
+        return maxrss / (1024 * 1024)
+    return maxrss / 1024
+
+def peak_memory_mb():
+    """현재 프로세스와 종료된 자식 프로세스(병렬 워커)의 최대 RSS (MB)"""
+    if resource is None:
+        return None, None
+    return _maxrss_mb(resource.RUSAGE_SELF), _maxrss_mb(resource.RUSAGE_CHILDREN)
+
+def report_peak_memory():
+    """실행당 최대 메모리 사용량과 해제되지 않은 그림 수 출력"""
+    self_mb, children_mb = peak_memory_mb()
+    if self_mb is None:
+        print("최대 메모리 사용량: 이 플랫폼에서는 측정할 수 없습니다")
+    else:
+        print(f"최대 메모리 사용량: {self_mb:.1f} MB (병렬 워커 최대: {children_mb:.1f} MB)")
+    print(f"열려 있는 그림 수: {len(plt.get_fignums())}")
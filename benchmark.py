@@ -0,0 +1,285 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import partial
+
+
+# 벤치마크 기록 기본 경로 (실행마다 하나씩 추가)
+DEFAULT_HISTORY = '.benchmark_history.json'
+# 기본 데이터 크기 (논문 데이터 6.6K ~ 대용량 10M)
+DEFAULT_SIZES = (6600, 100_000, 1_000_000, 10_000_000)
+# 스위트 공통 단계(generation, statistics)의 figure 이름
+# 그림별 단계는 artists(플롯 함수 본문: 그림별 계산 + 아티스트 생성), tight_layout, savefig
+SHARED = '*'
+
+def _paper_suite(bw=False):
+    """paper_visualization(.py / _bw.py): 생성 → 공유 분석 → 그림 6종"""
+    import paper_visualization as pv
+    if bw:
+        import paper_visualization_bw as module
+        funcs = [module.plot_kde_comparison_bw, module.plot_histogram_comparison_bw,
+                 module.plot_boxplot_comparison_bw, module.plot_violin_comparison_bw,
+                 module.plot_hexbin_comparison_bw, module.plot_statistical_summary_bw]
+    else:
+        funcs = [func for _, func, _ in pv.FIGURE_KINDS]
+
+    def generate(n_queries):
+        return pv.load_paper_datasets(n_queries)
+
+    def statistics(data):
+        return {'analysis': pv.compute_paper_analysis(*data)}
+
+    return generate, statistics, [(func.__name__, func) for func in funcs]
+
+def _percentile_suite():
+    """percentile_histogram.py: 세 분포 생성 → 임계값 → 그림 4종"""
+    import percentile_histogram as ph
+
+    def generate(n_queries):
+        return [ph.load_dataset(generator, n_queries, seed)
+                for generator, seed in ((ph.generate_concentrated_array, 42),
+                                        (ph.generate_dispersed_array, 123),
+                                        (ph.generate_balanced_array, 456))]
+
+    def statistics(data):
+        # 생성 단계의 메모리 캐시를 그대로 쓰므로 임계값 계산만 측정됨
+        return {'datasets': ph.load_percentile_datasets(len(data[0]))}
+
+    funcs = [func for _, func, _ in ph.FIGURES + ph.SWEEP_FIGURES]
+    return generate, statistics, [(func.__name__, func) for func in funcs]
+
+def _performance_suite():
+    """performance_evaluation.py: 성능 표 → 그림 5종 (데이터 크기와 무관)"""
+    import performance_evaluation as pe
+
+    def generate(n_queries):
+        return pe.create_performance_data()
+
+    def statistics(df):
+        return {'df': df}
+
+    funcs = [pe.plot_performance_comparison, pe.plot_relative_improvement, pe.plot_improvement_analysis,
+             pe.plot_metric_focus, pe.plot_performance_heatmap]
+    return generate, statistics, [(func.__name__, func) for func in funcs]
+
+def _scatter_suite():
+    """main.py: 점수 파일 생성 → 산점도 (전체 / 축소 렌더링)"""
+    import main as query_scatter
+    import paper_visualization as pv
+    from score_io import save_scores
+
+    def generate(n_queries):
+        paths = ('baseline_scores.npy', 'proposed_scores.npy')
+        for path, generator in zip(paths, (pv.generate_baseline_array, pv.generate_proposed_array)):
+            save_scores(path, generator(n_queries))
+        return paths
+
+    def statistics(paths):
+        return {'baseline': paths[0], 'proposed': paths[1], 'output': 'query_scatter.png'}
+
+    return generate, statistics, [('main', query_scatter.main),
+                                  ('main_reduced', partial(query_scatter.main, reduce=True))]
+
+# 스위트 이름 -> (생성기, 데이터 크기에 따라 달라지는지)
+SUITES = {
+    'paper_visualization': (_paper_suite, True),
+    'paper_visualization_bw': (partial(_paper_suite, bw=True), True),
+    'percentile_histogram': (_percentile_suite, True),
+    'performance_evaluation': (_performance_suite, False),
+    'main': (_scatter_suite, True),
+}
+
+def _timed(func, *args, **kwargs):
+    """(반환값, 소요 시간)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def _record(records, suite, figure, n_queries, stage, seconds):
+    """단계별 시간 기록 (여러 번 반복하면 최솟값)"""
+    key = (suite, figure, n_queries, stage)
+    records[key] = min(seconds, records.get(key, float('inf')))
+
+def run_suite(name, n_queries, repeat, records):
+    """스위트 하나를 한 크기로 repeat번 실행해 단계별 최소 시간을 records에 기록"""
+    from batch_mode import pop_stage_timings
+    from dataset_cache import clear_dataset_cache
+
+    factory, _ = SUITES[name]
+    generate, statistics, figures = factory()
+    for _ in range(repeat):
+        clear_dataset_cache()
+        data, seconds = _timed(generate, n_queries)
+        _record(records, name, SHARED, n_queries, 'generation', seconds)
+        shared, seconds = _timed(statistics, data)
+        _record(records, name, SHARED, n_queries, 'statistics', seconds)
+
+        for figure, func in figures:
+            pop_stage_timings()
+            _, total = _timed(func, **shared)
+            timings = pop_stage_timings()
+            tight_layout = sum(t['tight_layout'] for t in timings)
+            savefig = sum(t['savefig'] for t in timings)
+            _record(records, name, figure, n_queries, 'artists', total - tight_layout - savefig)
+            _record(records, name, figure, n_queries, 'tight_layout', tight_layout)
+            _record(records, name, figure, n_queries, 'savefig', savefig)
+    clear_dataset_cache()
+
+def run_benchmarks(suites, sizes, repeat=1, label=None):
+    """벤치마크 실행 (출력 이미지는 임시 디렉터리에 저장) -> 실행 기록 dict"""
+    # matplotlib은 실행할 때만 로드 (compare는 기록 파일만 읽음)
+    import matplotlib
+    import numpy as np
+    from batch_mode import enable_batch_mode, record_stage_timings
+
+    enable_batch_mode()
+    record_stage_timings()
+    records = {}
+    cwd = os.getcwd()
+    started = datetime.now().isoformat(timespec='seconds')
+    try:
+        with tempfile.TemporaryDirectory(prefix='ol-lab-bench-') as workdir:
+            os.chdir(workdir)
+            for name in suites:
+                # 크기와 무관한 스위트는 한 번만
+                for n_queries in (sizes if SUITES[name][1] else (None,)):
+                    print(f"[{name}] n={n_queries if n_queries else '-'} 측정 중...", flush=True)
+                    run_suite(name, n_queries, repeat, records)
+    finally:
+        os.chdir(cwd)
+        record_stage_timings(False)
+
+    return {
+        'timestamp': started,
+        'label': label,
+        'repeat': repeat,
+        'environment': {'python': platform.python_version(), 'numpy': np.__version__,
+                        'matplotlib': matplotlib.__version__, 'machine': platform.machine()},
+        'records': [{'suite': suite, 'figure': figure, 'n_queries': n_queries,
+                     'stage': stage, 'seconds': seconds}
+                    for (suite, figure, n_queries, stage), seconds in records.items()],
+    }
+
+def load_history(path=DEFAULT_HISTORY):
+    """벤치마크 기록 로드 (없으면 빈 기록)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'runs': []}
+
+def save_history(history, path=DEFAULT_HISTORY):
+    """벤치마크 기록 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _find_run(runs, ref):
+    """실행 선택: 정수면 인덱스 (-1 = 최근), 아니면 라벨 (같은 라벨이 여럿이면 최근 것)"""
+    try:
+        return runs[int(ref)]
+    except ValueError:
+        pass
+    for run in reversed(runs):
+        if run.get('label') == ref:
+            return run
+    raise KeyError(f'벤치마크 실행을 찾을 수 없습니다: {ref}')
+
+def compare_runs(baseline, current, threshold=0.2, min_seconds=0.05):
+    """두 실행의 단계별 시간 비교 -> (비교 행 목록, 회귀 행 목록)
+
+    현재 시간이 기준보다 threshold 비율 이상 느리고 그 차이가 min_seconds 이상이면 회귀.
+    """
+    def index(run):
+        return {(r['suite'], r['figure'], r['n_queries'], r['stage']): r['seconds'] for r in run['records']}
+
+    before, after = index(baseline), index(current)
+    rows = []
+    for key in sorted(before.keys() & after.keys(), key=lambda k: tuple(str(part) for part in k)):
+        old, new = before[key], after[key]
+        ratio = new / old if old > 0 else float('inf')
+        regressed = ratio > 1 + threshold and new - old >= min_seconds
+        rows.append((key, old, new, ratio, regressed))
+    return rows, [row for row in rows if row[4]]
+
+def _run_name(run):
+    return f"{run['timestamp']}{' (' + run['label'] + ')' if run.get('label') else ''}"
+
+def print_run(run):
+    """단계별 시간 표 출력"""
+    print(f"{'suite':<24}{'figure':<36}{'n':>12}{'stage':>14}{'seconds':>10}")
+    for r in run['records']:
+        n_queries = f"{r['n_queries']:,}" if r['n_queries'] else '-'
+        print(f"{r['suite']:<24}{r['figure']:<36}{n_queries:>12}{r['stage']:>14}{r['seconds']:>10.3f}")
+
+def print_comparison(baseline, current, rows, regressions, threshold):
+    """비교 결과 출력 (회귀 행에는 표시)"""
+    print(f"기준: {_run_name(baseline)}")
+    print(f"현재: {_run_name(current)}")
+    for (suite, figure, n_queries, stage), old, new, ratio, regressed in rows:
+        n_queries = f"{n_queries:,}" if n_queries else '-'
+        mark = '  <-- 회귀' if regressed else ''
+        print(f"{suite:<24}{figure:<36}{n_queries:>12}{stage:>14}{old:>10.3f}{new:>10.3f}{ratio:>8.2f}x{mark}")
+    if regressions:
+        print(f"{len(regressions)}개 단계가 {threshold:.0%} 이상 느려졌습니다")
+    else:
+        print("회귀 없음")
+
+def _parse_sizes(value):
+    return [int(size) for size in value.split(',') if size.strip()]
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='그림 생성 단계별 벤치마크')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help=f'기록 파일 (기본값: {DEFAULT_HISTORY})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='벤치마크 실행 후 기록에 추가')
+    run.add_argument('--sizes', type=_parse_sizes, default=list(DEFAULT_SIZES),
+                     help='쿼리 수 목록 (쉼표 구분, 기본값: 6600,100000,1000000,10000000)')
+    run.add_argument('--suites', default=','.join(SUITES),
+                     help=f"측정할 스위트 (쉼표 구분, 기본값: 전체 - {', '.join(SUITES)})")
+    run.add_argument('--repeat', type=int, default=1, help='반복 횟수 (단계별 최솟값 기록, 기본값: 1)')
+    run.add_argument('--label', default=None, help='실행 라벨 (compare에서 이름으로 선택)')
+
+    compare = commands.add_parser('compare', help='두 실행 비교, 회귀가 있으면 종료 코드 1')
+    compare.add_argument('--baseline', default='-2', help='기준 실행 (인덱스 또는 라벨, 기본값: -2)')
+    compare.add_argument('--current', default='-1', help='비교할 실행 (인덱스 또는 라벨, 기본값: -1)')
+    compare.add_argument('--threshold', type=float, default=0.2,
+                         help='회귀로 판단할 느려짐 비율 (기본값: 0.2 = 20%%)')
+    compare.add_argument('--min-seconds', type=float, default=0.05,
+                         help='이보다 작은 차이는 측정 잡음으로 무시 (기본값: 0.05초)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    history = load_history(args.history)
+
+    if args.command == 'run':
+        suites = [name.strip() for name in args.suites.split(',') if name.strip()]
+        unknown = [name for name in suites if name not in SUITES]
+        if unknown:
+            raise SystemExit(f"알 수 없는 스위트: {', '.join(unknown)}")
+        run = run_benchmarks(suites, args.sizes, args.repeat, args.label)
+        history['runs'].append(run)
+        save_history(history, args.history)
+        print_run(run)
+        print(f"기록 저장: {args.history} (총 {len(history['runs'])}회)")
+        return 0
+
+    runs = history['runs']
+    if len(runs) < 2:
+        raise SystemExit('비교하려면 기록된 실행이 2개 이상 필요합니다')
+    baseline, current = _find_run(runs, args.baseline), _find_run(runs, args.current)
+    rows, regressions = compare_runs(baseline, current, args.threshold, args.min_seconds)
+    print_comparison(baseline, current, rows, regressions, args.threshold)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
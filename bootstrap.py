@@ -0,0 +1,136 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from quantized_scores import LEVEL_VALUES, NUM_LEVELS, QuantizedScores
+from tracing import traced
+
+# 요약 통계 (paper_visualization.compute_summary_stats와 같은 순서)
+STATISTICS = ('Mean', 'Median', 'Std', 'Min', 'Max')
+DEFAULT_RESAMPLES = 10000
+# 배치당 재표본 수 (개수 형식) / 인덱스 행렬 원소 수 상한 (원본 배열 형식, int64 기준 약 128MB)
+COUNT_BATCH_SIZE = 1000
+MAX_INDEX_ELEMENTS = 1 << 24
+
+# 워커 프로세스별 공유 데이터 (initializer에서 한 번만 전달)
+_SHARED = {}
+
+def _count_statistics(counts):
+    """재표본 개수 행렬 (재표본, 101) -> 통계별 (재표본,) 배열
+
+    QuantizedScores의 mean/median/std(ddof=0)/min/max와 같은 정의를 행 단위로 계산.
+    """
+    values = LEVEL_VALUES.astype(np.float64)
+    n = counts[0].sum()
+    mean = counts @ values / n
+    var = np.maximum(counts @ (values * values) / n - mean * mean, 0.0)
+    # 중앙값: np.percentile(linear)과 같은 보간, k번째 값 = 누적 개수가 k를 넘는 첫 코드
+    cumulative = np.cumsum(counts, axis=1)
+    pos = 0.5 * (n - 1)
+    lower, upper = int(np.floor(pos)), min(int(np.floor(pos)) + 1, n - 1)
+    lower_value = values[(cumulative <= lower).sum(axis=1)]
+    upper_value = values[(cumulative <= upper).sum(axis=1)]
+    nonzero = counts > 0
+    return {
+        'Mean': mean,
+        'Median': lower_value + (upper_value - lower_value) * (pos - lower),
+        'Std': np.sqrt(var),
+        'Min': values[np.argmax(nonzero, axis=1)],
+        'Max': values[NUM_LEVELS - 1 - np.argmax(nonzero[:, ::-1], axis=1)],
+    }
+
+def _array_statistics(samples):
+    """재표본 값 행렬 (재표본, n) -> 통계별 (재표본,) 배열"""
+    return {
+        'Mean': samples.mean(axis=1),
+        'Median': np.median(samples, axis=1),
+        'Std': samples.std(axis=1),
+        'Min': samples.min(axis=1),
+        'Max': samples.max(axis=1),
+    }
+
+def _resample_batch(data, size, seed):
+    """배치 하나 재표본 (독립 시드 스트림) -> 통계별 (size,) 배열
+
+    QuantizedScores: 다항분포로 101칸 개수를 바로 뽑음 (비용이 쿼리 수와 무관)
+    그 외 배열: (size, n) 인덱스 행렬로 한 번에 뽑음
+    """
+    rng = np.random.default_rng(seed)
+    if isinstance(data, QuantizedScores):
+        n = len(data)
+        return _count_statistics(rng.multinomial(n, data.counts / n, size=size))
+    index = rng.integers(0, len(data), size=(size, len(data)))
+    return _array_statistics(data[index])
+
+def _init_worker(data):
+    _SHARED['data'] = data
+
+def _resample_task(size, seed):
+    return _resample_batch(_SHARED['data'], size, seed)
+
+def _batch_sizes(data, n_resamples, batch_size):
+    """재표본 수를 배치 크기로 나눔 (배열 형식은 인덱스 행렬 메모리 상한 안에서)"""
+    if batch_size is None:
+        if isinstance(data, QuantizedScores):
+            batch_size = COUNT_BATCH_SIZE
+        else:
+            batch_size = max(1, MAX_INDEX_ELEMENTS // max(1, len(data)))
+    sizes = [batch_size] * (n_resamples // batch_size)
+    if n_resamples % batch_size:
+        sizes.append(n_resamples % batch_size)
+    return sizes
+
+@traced(name='bootstrap', cat='stats')
+def bootstrap_statistics(data, n_resamples=DEFAULT_RESAMPLES, seed=0, jobs=1, batch_size=None):
+    """요약 통계의 부트스트랩 분포 -> 통계별 (n_resamples,) 배열
+
+    data: QuantizedScores(개수 형식 재표본) 또는 점수 배열(인덱스 행렬 재표본)
+    seed: 정수 또는 SeedSequence
+    배치마다 SeedSequence(seed).spawn()으로 독립 난수 스트림을 쓰므로
+    jobs(프로세스 수)와 관계없이 같은 seed면 같은 결과.
+    """
+    if not isinstance(data, QuantizedScores):
+        data = np.asarray(data, dtype=np.float64).reshape(-1)
+    if len(data) == 0:
+        raise ValueError('빈 데이터로는 부트스트랩을 할 수 없습니다')
+    sizes = _batch_sizes(data, n_resamples, batch_size)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(sizes))
+
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(sizes))
+    if jobs <= 1:
+        batches = [_resample_batch(data, size, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(data,)) as executor:
+            batches = list(executor.map(_resample_task, sizes, seeds))
+    return {name: np.concatenate([batch[name] for batch in batches]) for name in STATISTICS}
+
+def confidence_interval(samples, confidence=0.95):
+    """백분위수 부트스트랩 신뢰구간 (하한, 상한)"""
+    alpha = (1 - confidence) / 2 * 100
+    lo, hi = np.percentile(samples, [alpha, 100 - alpha])
+    return float(lo), float(hi)
+
+def bootstrap_comparison(baseline, proposed, n_resamples=DEFAULT_RESAMPLES, confidence=0.95,
+                         seed=0, jobs=1):
+    """Baseline/Proposed 요약 통계와 차이(Proposed - Baseline)의 신뢰구간
+
+    두 집단은 서로 독립으로 재표본 (쿼리 대응이 없는 비교).
+    반환값: {'baseline': {통계: (하한, 상한)}, 'proposed': {...},
+             'difference': {통계: (하한, 상한)}, 'confidence', 'n_resamples'}
+    """
+    baseline_seed, proposed_seed = np.random.SeedSequence(seed).spawn(2)
+    baseline_samples = bootstrap_statistics(baseline, n_resamples, baseline_seed, jobs)
+    proposed_samples = bootstrap_statistics(proposed, n_resamples, proposed_seed, jobs)
+    return {
+        'baseline': {name: confidence_interval(baseline_samples[name], confidence) for name in STATISTICS},
+        'proposed': {name: confidence_interval(proposed_samples[name], confidence) for name in STATISTICS},
+        'difference': {name: confidence_interval(proposed_samples[name] - baseline_samples[name], confidence)
+                       for name in STATISTICS},
+        'confidence': confidence,
+        'n_resamples': n_resamples,
+    }
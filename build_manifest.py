@@ -0,0 +1,125 @@
+import ast
+import hashlib
+import inspect
+import json
+import os
+from functools import lru_cache, partial
+
+import matplotlib
+import numpy as np
+
+# 증분 빌드 매니페스트 기본 경로 (출력 이미지 -> 입력 해시)
+DEFAULT_MANIFEST = '.figure_manifest.json'
+
+def _update_hash(h, value):
+    """입력 데이터를 해시에 반영 (배열은 dtype/shape/원시 바이트 기준)"""
+    if isinstance(value, np.ndarray) and value.dtype == object:
+        _update_hash(h, value.tolist())
+    elif isinstance(value, np.ndarray):
+        h.update(f'ndarray:{value.dtype.str}:{value.shape}'.encode('utf-8'))
+        h.update(memoryview(np.ascontiguousarray(value)).cast('B'))
+    elif isinstance(value, dict):
+        h.update(f'dict:{len(value)}'.encode('utf-8'))
+        for key in sorted(value, key=str):
+            _update_hash(h, str(key))
+            _update_hash(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(f'{type(value).__name__}:{len(value)}'.encode('utf-8'))
+        for item in value:
+            _update_hash(h, item)
+    elif hasattr(value, 'to_numpy') and hasattr(value, 'columns'):
+        # pandas DataFrame: 열 이름과 값 기준
+        _update_hash(h, [str(c) for c in value.columns])
+        _update_hash(h, [value[c].to_numpy() for c in value.columns])
+    elif isinstance(value, np.generic):
+        _update_hash(h, np.asarray(value))
+    elif isinstance(value, str):
+        h.update(f'str:{value}'.encode('utf-8'))
+    elif hasattr(value, 'fingerprint'):
+        # 요약 컨테이너(QuantizedScores, RunningStats 등): 객체 id가 아닌 상태 기준
+        h.update(f'{type(value).__name__}:'.encode('utf-8'))
+        _update_hash(h, value.fingerprint())
+    else:
+        h.update(f'{type(value).__name__}:{value!r}'.encode('utf-8'))
+
+def hash_inputs(value):
+    """플롯 입력 데이터 해시"""
+    h = hashlib.sha256()
+    _update_hash(h, value)
+    return h.hexdigest()
+
+@lru_cache(maxsize=None)
+def _local_imports(path):
+    """모듈 파일이 import하는 (함수 안의 지연 import 포함) 같은 디렉터리의 모듈 파일 경로"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+    directory = os.path.dirname(path)
+    candidates = (os.path.join(directory, name.split('.')[0] + '.py') for name in names)
+    return tuple(sorted(c for c in candidates if os.path.isfile(c)))
+
+@lru_cache(maxsize=None)
+def source_digest(path):
+    """모듈 파일과 그 모듈이 직간접적으로 import하는 저장소 내 모듈 소스 전체의 해시
+
+    finish_figure, draw_* 도우미, percentile_sweep처럼 다른 모듈에 있는 코드가 바뀌어도
+    지문이 달라지도록 함 (한 프로세스 안에서는 소스가 바뀌지 않는다고 보고 캐시).
+    """
+    path = os.path.abspath(path)
+    seen, todo = set(), [path]
+    while todo:
+        module = todo.pop()
+        if module not in seen:
+            seen.add(module)
+            todo.extend(_local_imports(module))
+    h = hashlib.sha256()
+    root = os.path.dirname(path)
+    for module in sorted(seen):
+        h.update(f'file:{os.path.relpath(module, root)}'.encode('utf-8'))
+        with open(module, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def figure_fingerprint(func, data_digest, params=None):
+    """입력 데이터 해시 + 플롯 파라미터 + 플롯 함수와 그 함수가 쓰는 저장소 내 모듈 소스를 합친 지문"""
+    h = hashlib.sha256()
+    h.update(data_digest.encode('utf-8'))
+    # functools.partial이면 원래 함수 + 고정 인자(테마 등)를 기준으로
+    while isinstance(func, partial):
+        _update_hash(h, {'args': func.args, 'keywords': func.keywords})
+        func = func.func
+    h.update(func.__qualname__.encode('utf-8'))
+    h.update(source_digest(inspect.getsourcefile(inspect.unwrap(func))).encode('utf-8'))
+    # 렌더링 결과에 영향을 주는 파라미터 (matplotlib 버전 포함)
+    _update_hash(h, {'matplotlib': matplotlib.__version__, **(params or {})})
+    return h.hexdigest()
+
+def load_manifest(path=DEFAULT_MANIFEST):
+    """매니페스트 로드 (없거나 깨졌으면 빈 매니페스트)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault('figures', {})
+    return manifest
+
+def save_manifest(manifest, path=DEFAULT_MANIFEST):
+    """매니페스트 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def is_up_to_date(manifest, output, fingerprint):
+    """출력 이미지가 존재하고 기록된 지문이 같으면 최신 상태"""
+    return os.path.exists(output) and manifest['figures'].get(output) == fingerprint
+
+def record_output(manifest, output, fingerprint):
+    """렌더링한 출력 이미지의 지문 기록"""
+    manifest['figures'][output] = fingerprint
@@ -0,0 +1,93 @@
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 하위 명령 -> (모듈, 진입 함수, 설명)
+# 모듈은 하위 명령이 선택된 뒤에만 import (matplotlib/pandas 로드 비용은 필요한 명령만 부담)
+COMMANDS = {
+    'paper': ('paper_visualization', 'run', '논문용 분포 비교 그림 (색상/흑백)'),
+    'paper-bw': ('paper_visualization_bw', 'run', '논문용 분포 비교 그림 (흑백)'),
+    'percentile': ('percentile_histogram', 'run', '퍼센타일 적용 상황별 히스토그램'),
+    'performance': ('performance_evaluation', 'run', '성능평가 결과 그림'),
+    'scatter': ('main', 'run', '쿼리별 유사도 점수 산점도'),
+    'paired': ('paired_comparison', 'run', '쿼리 ID로 조인한 쿼리별 차이/승패/점수 비교'),
+    'drop-eval': ('drop_evaluation', 'run', '쿼리별 점수로 Drop Precision/Recall/F1 계산'),
+    'significance': ('significance_tests', 'run', '방법별 점수 분포의 쌍별 KS/Mann-Whitney/순열 검정'),
+    'sweep': ('experiment_sweep', 'run', '여러 데이터셋/실행 분포 비교 스윕 (데이터셋 x 방법 요약 그림)'),
+    'density': ('density_grid', 'run', '대용량 점수 파일의 래스터 밀도 그림'),
+    'drift': ('drift_monitor', 'run', '실시간 점수의 슬라이딩 윈도우 퍼센타일/분포 형태 드리프트 감시'),
+    'stats': ('streaming_stats', 'run', '메모리보다 큰 점수 파일의 단일 패스 요약 통계'),
+    'sketch': ('quantile_sketch', 'main', '스트리밍 퀀타일 스케치 생성/병합/질의'),
+    'benchmark': ('benchmark', 'main', '단계별 벤치마크 실행/비교'),
+    'server': ('render_server', 'main', '상주 렌더링 서버 실행/요청'),
+}
+
+# 시작 시간 보고에서 로드 여부를 확인할 무거운 모듈
+HEAVY_MODULES = ('matplotlib.pyplot', 'pandas', 'seaborn', 'scipy')
+
+def load_command(name):
+    """하위 명령의 진입 함수 (이때 처음 해당 모듈을 import)"""
+    module_name, func_name, _ = COMMANDS[name]
+    return getattr(importlib.import_module(module_name), func_name)
+
+def _usage():
+    lines = ['사용법: python cli.py <명령> [옵션...]', '', '명령:']
+    for name, (module_name, _, description) in COMMANDS.items():
+        lines.append(f'  {name:<12} {description} ({module_name}.py)')
+    lines.append(f"  {'startup':<12} 명령별 콜드 스타트 시간 측정")
+    lines.append('')
+    lines.append('명령별 옵션: python cli.py <명령> --help')
+    return '\n'.join(lines)
+
+def _time_process(args, repeat):
+    """새 인터프리터로 args를 repeat번 실행한 소요 시간 목록 (초)"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=here, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def _loaded_heavy_modules(name):
+    """하위 명령 모듈을 로드했을 때 함께 로드되는 무거운 모듈"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = ('import sys, cli; cli.load_command(%r); '
+            'print(",".join(m for m in %r if m in sys.modules))' % (name, HEAVY_MODULES))
+    result = subprocess.run([sys.executable, '-c', code], cwd=here, check=True,
+                            capture_output=True, text=True)
+    return result.stdout.strip() or '-'
+
+def report_startup(repeat=5):
+    """명령별 콜드 스타트 시간 (새 프로세스에서 '<명령> --help'까지, 최솟값/중앙값) 출력"""
+    print(f"콜드 스타트 측정 ({repeat}회, 새 인터프리터 기준)")
+    print(f"{'명령':<14}{'최소(ms)':>10}{'중앙값(ms)':>12}  로드된 무거운 모듈")
+    rows = [('(python)', ['-c', 'pass'], None), ('(cli)', ['cli.py', '--help'], None)]
+    rows += [(name, ['cli.py', name, '--help'], name) for name in COMMANDS]
+    for label, args, name in rows:
+        samples = _time_process(args, repeat)
+        heavy = _loaded_heavy_modules(name) if name else '-'
+        print(f"{label:<14}{min(samples) * 1000:>10.0f}{statistics.median(samples) * 1000:>12.0f}  {heavy}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(_usage())
+        return 0
+    name, rest = argv[0], argv[1:]
+    if name == 'startup':
+        repeat = int(rest[0]) if rest else 5
+        report_startup(repeat)
+        return 0
+    if name not in COMMANDS:
+        print(f"알 수 없는 명령: {name}\n", file=sys.stderr)
+        print(_usage(), file=sys.stderr)
+        return 2
+    return load_command(name)(rest) or 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+import hashlib
+import inspect
+import os
+
+import numpy as np
+
+from tracing import span
+
+# 실행 중 메모리 캐시: (생성기 모듈/이름, 시드, 크기, 디스크 캐시 디렉터리) -> 배열
+_MEMORY_CACHE = {}
+
+def _generator_fingerprint(generator):
+    """생성기 소스 해시 (코드가 바뀌면 디스크 캐시 무효화)"""
+    try:
+        source = inspect.getsource(generator)
+    except (OSError, TypeError):
+        source = generator.__qualname__
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+
+def dataset_cache_path(cache_dir, generator, n_queries, seed):
+    """디스크 캐시 .npy 파일 경로"""
+    name = f'{generator.__name__}_seed{seed}_n{n_queries}_{_generator_fingerprint(generator)}.npy'
+    return os.path.join(cache_dir, name)
+
+def load_dataset(generator, n_queries, seed, cache_dir=None):
+    """생성기/시드/크기별로 데이터를 한 번만 생성 (cache_dir 지정 시 .npy 디스크 캐시 사용)"""
+    # 디스크 캐시 디렉터리가 다르면 (없음 포함) 다른 항목 - 다른 cache_dir에도 파일이 만들어지도록
+    key = (generator.__module__, generator.__qualname__, seed, n_queries,
+           os.path.abspath(cache_dir) if cache_dir else None)
+    if key in _MEMORY_CACHE:
+        return _MEMORY_CACHE[key]
+
+    path = dataset_cache_path(cache_dir, generator, n_queries, seed) if cache_dir else None
+    with span('data_load', cat='data', generator=generator.__name__, n_queries=n_queries):
+        if path and os.path.exists(path):
+            # 재실행 시 생성 없이 메모리 매핑으로 바로 로드
+            data = np.load(path, mmap_mode='r')
+        else:
+            data = generator(n_queries=n_queries, seed=seed)
+            if path:
+                os.makedirs(cache_dir, exist_ok=True)
+                # 쓰는 도중 중단되어도 깨진 캐시가 남지 않도록 임시 파일 후 교체
+                tmp_path = f'{path}.{os.getpid()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, data)
+                os.replace(tmp_path, path)
+
+    _MEMORY_CACHE[key] = data
+    return data
+
+def clear_dataset_cache():
+    """메모리 캐시 비우기 (디스크 캐시는 유지)"""
+    _MEMORY_CACHE.clear()
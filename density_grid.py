@@ -0,0 +1,95 @@
+import os
+import argparse
+
+import numpy as np
+
+from quantized_scores import QuantizedScores
+
+# 한 번에 읽어 누적할 점수 개수 (메모리는 청크 + 격자 크기로 제한)
+CHUNK_SIZE = 1 << 20
+
+def open_scores(source):
+    """점수 배열 열기 (.npy 경로면 메모리 매핑으로 열어 필요한 부분만 읽음)
+
+    QuantizedScores는 그대로 반환 (슬라이스 단위로 float32 점수로 복원됨)
+    """
+    if isinstance(source, QuantizedScores):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        return np.load(source, mmap_mode='r').reshape(-1)
+    return np.asarray(source).reshape(-1)
+
+# 점수는 소수점 둘째 자리로 양자화되어 있으므로 세로 칸을 0.01 점수 단위에 맞춤
+# (0.20-1.00 의 81개 점수 값이 각 칸의 중심)
+DEFAULT_SHAPE = (400, 81)
+DEFAULT_Y_RANGE = (0.195, 1.005)
+
+def compute_density_grid(source, shape=DEFAULT_SHAPE, y_range=DEFAULT_Y_RANGE, chunk_size=CHUNK_SIZE):
+    """쿼리 인덱스 x 유사도 점수의 2차원 개수 격자 (청크 단위 벡터화 누적)
+
+    source: 점수 배열 또는 .npy 경로. 청크 단위로 순회하므로 메모리는 점 개수가 아닌
+    격자 크기(shape)에 비례. y_range 밖의 점수는 그림 범위 밖이므로 제외.
+    """
+    scores = open_scores(source)
+    n = len(scores)
+    nx, ny = shape
+    y_min, y_max = y_range
+    counts = np.zeros(nx * ny, dtype=np.int64)
+
+    for start in range(0, n, chunk_size):
+        chunk = np.asarray(scores[start:start + chunk_size], dtype=np.float64)
+        ix = np.arange(start, start + len(chunk), dtype=np.int64) * nx // n
+        iy = np.floor((chunk - y_min) / (y_max - y_min) * ny).astype(np.int64)
+        # 점수 상한(y_max)은 마지막 칸에 포함
+        iy[chunk == y_max] = ny - 1
+        inside = (iy >= 0) & (iy < ny)
+        counts += np.bincount(ix[inside] * ny + iy[inside], minlength=nx * ny)
+
+    return {'counts': counts.reshape(nx, ny), 'extent': (0, n / 1000, y_min, y_max)}
+
+def draw_density_grid(ax, grid, cmap, alpha=0.8):
+    """개수 격자를 이미지로 렌더링 (아티스트 1개, 비용은 격자 크기에 비례)"""
+    return ax.imshow(grid['counts'].T, origin='lower', extent=grid['extent'], aspect='auto',
+                     interpolation='nearest', cmap=cmap, alpha=alpha)
+
+def main(baseline_path, proposed_path, shape=DEFAULT_SHAPE, themes=('color',)):
+    """디스크의 대용량 점수 파일(.npy)에서 래스터 밀도 그림 생성"""
+    from paper_visualization import plot_hexbin_comparison
+
+    print("래스터 밀도 격자 누적 중...")
+    grids = [compute_density_grid(path, shape) for path in (baseline_path, proposed_path)]
+    analysis = {'density_grid': grids,
+                'hexbin_x_max': max(grid['extent'][1] for grid in grids)}
+    for theme in themes:
+        plot_hexbin_comparison(theme=theme, analysis=analysis)
+    print("래스터 밀도 시각화가 완료되었습니다!")
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='대용량 점수 파일의 래스터 밀도 시각화')
+    parser.add_argument('baseline', help='Baseline 점수 .npy 파일')
+    parser.add_argument('proposed', help='Proposed 점수 .npy 파일')
+    parser.add_argument('--width', type=int, default=DEFAULT_SHAPE[0],
+                        help=f'격자 가로 칸 수 (기본값: {DEFAULT_SHAPE[0]})')
+    parser.add_argument('--height', type=int, default=DEFAULT_SHAPE[1],
+                        help=f'격자 세로 칸 수 (기본값: {DEFAULT_SHAPE[1]}, 0.01 점수 단위)')
+    parser.add_argument('--themes', default='color', help='렌더링할 테마 (쉼표 구분, 기본값: color)')
+    parser.add_argument('--batch', action='store_true',
+                        help='배치 모드: 비대화형 백엔드 사용, plt.show() 생략, 최대 메모리 보고')
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    from batch_mode import enable_batch_mode, report_peak_memory
+
+    args = parse_args(argv)
+    if args.batch:
+        enable_batch_mode()
+    main(args.baseline, args.proposed, (args.width, args.height),
+         tuple(t.strip() for t in args.themes.split(',') if t.strip()))
+    if args.batch:
+        report_peak_memory()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(run())
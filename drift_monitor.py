@@ -0,0 +1,503 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+from batch_mode import enable_batch_mode
+from percentile_histogram import (FIGURES, PERCENTILES, generate_balanced_array,
+                                  generate_concentrated_array, generate_dispersed_array)
+from quantized_scores import LEVEL_VALUES, NUM_LEVELS, QuantizedScores
+from render_pool import figures_in, render_figures
+from streaming_stats import stream_stats
+from tracing import enable_tracing, save_trace, span
+
+# 슬라이딩 윈도우 길이 / 만료 단위 슬롯 길이 (초)
+DEFAULT_WINDOW = 3600.0
+DEFAULT_SLOT = 60.0
+# 드리프트 검사 / 히스토그램 다시 그리기 주기 (초, 점수 타임스탬프 기준)
+DEFAULT_CHECK_EVERY = 60.0
+DEFAULT_REFRESH_EVERY = 600.0
+# 추적할 퍼센타일 임계값 (분포별 적용 퍼센타일 10/20/30 전부)
+TRACKED_PERCENTILES = tuple(sorted(set(PERCENTILES.values())))
+# 기준 대비 임계값 변화 허용치 (점수 단위) / 누적분포 최대 차이(KS 거리) 허용치
+THRESHOLD_TOLERANCE = 0.05
+# 기준 임계값의 현재 윈도우 순위가 이만큼 넘게 바뀌어야 임계값 경보 (두 봉우리 사이 빈 구간에 걸린
+# 퍼센타일은 표본 흔들림만으로 값이 크게 튀므로 값 변화만으로는 경보하지 않음)
+RANK_TOLERANCE = 0.02
+KS_TOLERANCE = 0.1
+# 윈도우 점수가 이보다 적으면 검사하지 않음 (작은 표본의 흔들림으로 경보가 울리지 않도록)
+MIN_COUNT = 500
+# 형태 분류: 폭 0.10 구간 하나에 CONCENTRATED_SHARE 이상이 몰리면 concentrated,
+# 0.1 단위 10칸 히스토그램에서 양쪽 봉우리(각 PEAK_SHARE 이상)보다 VALLEY_RATIO배 이상 낮은 골이 있으면 balanced,
+# 둘 다 아니면 dispersed (percentile_histogram의 세 생성 분포를 200개 표본에서도 구분)
+CONCENTRATED_BAND = 11
+CONCENTRATED_SHARE = 0.6
+SHAPE_BIN_CODES = 10
+PEAK_SHARE = 0.05
+VALLEY_RATIO = 0.5
+# 로그 파일을 한 번에 읽어 집계하는 줄 수 (표준 입력은 한 줄씩)
+BLOCK_LINES = 1 << 16
+# 윈도우 상태 히스토그램 출력 디렉터리 (저장소의 percentile_*.png를 덮어쓰지 않도록 별도 디렉터리)
+DEFAULT_OUTPUT_DIR = 'drift'
+# 경보의 임계값/KS 거리 소수 자릿수 (float32 센타일 값에서 온 잡음 제거)
+ALERT_DECIMALS = 6
+# 경보 로그 필드
+ALERT_FIELDS = ('time', 'stream', 'kind', 'status', 'reference', 'current', 'message')
+
+def classify_shape(counts):
+    """센타일별 개수(길이 101) -> 'concentrated' / 'balanced' / 'dispersed' (O(101))"""
+    counts = np.asarray(counts, dtype=np.float64)
+    mass = counts / counts.sum()
+    if np.convolve(mass, np.ones(CONCENTRATED_BAND), mode='valid').max() >= CONCENTRATED_SHARE:
+        return 'concentrated'
+    # 마지막 칸은 0.90-1.00 (1.00 포함)
+    hist = np.add.reduceat(mass, np.arange(0, NUM_LEVELS - 1, SHAPE_BIN_CODES))
+    left = np.maximum.accumulate(hist)[:-2]
+    right = np.maximum.accumulate(hist[::-1])[::-1][2:]
+    peaks = np.minimum(left, right)
+    if ((peaks >= PEAK_SHARE) & (hist[1:-1] < VALLEY_RATIO * peaks)).any():
+        return 'balanced'
+    return 'dispersed'
+
+def rank_shift(counts, threshold, q):
+    """기준 임계값이 현재 분포에서 q(0-1) 순위에서 벗어난 정도
+
+    같은 값이 여러 개면 순위가 [threshold 미만 비율, threshold 이하 비율] 구간이므로 그 밖으로 벗어난 만큼.
+    """
+    values = LEVEL_VALUES.astype(np.float64)
+    n = np.sum(counts)
+    below = counts[values < threshold].sum() / n
+    upto = counts[values <= threshold].sum() / n
+    return float(max(below - q, q - upto, 0.0))
+
+def ks_distance(counts_a, counts_b):
+    """두 개수 분포의 누적분포 최대 차이 (KS 통계량, O(101))"""
+    cdf_a = np.cumsum(counts_a) / np.sum(counts_a)
+    cdf_b = np.cumsum(counts_b) / np.sum(counts_b)
+    return float(np.abs(cdf_a - cdf_b).max())
+
+class SlidingWindow:
+    """최근 window초 동안의 소수점 둘째 자리 점수를 센타일별 개수로 유지하는 슬라이딩 윈도우
+
+    윈도우를 slot초 단위 슬롯으로 나눈 링 버퍼(슬롯 x 101칸)와 전체 개수를 함께 유지:
+    점수 하나 추가는 두 칸 증가로 O(1), 시간이 지나 만료되는 슬롯은 통째로 빼서 슬롯당 O(101).
+    퍼센타일/형태 질의는 101칸 개수만 보므로 윈도우 크기와 무관.
+    이미 윈도우 밖으로 밀려난 슬롯의 늦은 점수는 버리고 late로 셈.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, slot=DEFAULT_SLOT):
+        n_slots = int(round(window / slot))
+        if n_slots < 1 or not math.isclose(n_slots * slot, window):
+            raise ValueError(f'윈도우 길이({window})는 슬롯 길이({slot})의 배수여야 합니다')
+        self.window = float(window)
+        self.slot = float(slot)
+        self.n_slots = n_slots
+        self.ring = np.zeros((n_slots, NUM_LEVELS), dtype=np.int64)
+        self.counts = np.zeros(NUM_LEVELS, dtype=np.int64)
+        self.n = 0
+        self.head = None
+        self.first = None
+        self.late = 0
+
+    def __len__(self):
+        return self.n
+
+    def _slot_index(self, timestamp):
+        return math.floor(timestamp / self.slot)
+
+    def advance(self, timestamp):
+        """timestamp까지 시간을 진행하며 윈도우 밖 슬롯 만료"""
+        index = self._slot_index(timestamp)
+        if self.head is None:
+            self.head, self.first = index, timestamp
+            return
+        if index <= self.head:
+            return
+        if index - self.head >= self.n_slots:
+            self.ring[:] = 0
+            self.counts[:] = 0
+            self.n = 0
+        else:
+            for expired in range(self.head + 1, index + 1):
+                row = self.ring[expired % self.n_slots]
+                self.counts -= row
+                self.n -= int(row.sum())
+                row[:] = 0
+        self.head = index
+
+    def add(self, score, timestamp):
+        """점수 하나 추가 (O(1)) -> 윈도우에 들어갔는지"""
+        code = round(score * 100)
+        if not 0 <= code < NUM_LEVELS:
+            raise ValueError('점수는 0.00-1.00 범위여야 합니다')
+        self.advance(timestamp)
+        index = self._slot_index(timestamp)
+        if index <= self.head - self.n_slots:
+            self.late += 1
+            return False
+        self.ring[index % self.n_slots, code] += 1
+        self.counts[code] += 1
+        self.n += 1
+        return True
+
+    def add_batch(self, scores, timestamps):
+        """점수 배열 추가 (같은 슬롯이 이어지는 구간마다 bincount 한 번)"""
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+        timestamps = np.asarray(timestamps, dtype=np.float64).reshape(-1)
+        if len(scores) == 0:
+            return
+        codes = np.rint(scores * 100)
+        if codes.min() < 0 or codes.max() > NUM_LEVELS - 1:
+            raise ValueError('점수는 0.00-1.00 범위여야 합니다')
+        codes = codes.astype(np.int64)
+        indices = np.floor(timestamps / self.slot).astype(np.int64)
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(indices)) + 1, [len(indices)]])
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            self.advance(timestamps[stop - 1])
+            index = int(indices[start])
+            if index <= self.head - self.n_slots:
+                self.late += stop - start
+                continue
+            added = np.bincount(codes[start:stop], minlength=NUM_LEVELS)
+            self.ring[index % self.n_slots] += added
+            self.counts += added
+            self.n += stop - start
+
+    def is_full(self, timestamp):
+        """처음 점수부터 윈도우 길이만큼 시간이 지났는지"""
+        return self.first is not None and timestamp - self.first >= self.window
+
+    def scores(self):
+        """현재 윈도우 상태 (개수만 있는 QuantizedScores)"""
+        return QuantizedScores.from_counts(self.counts.copy())
+
+    def thresholds(self, percentiles=TRACKED_PERCENTILES):
+        """{퍼센타일: 임계값}"""
+        values = np.atleast_1d(self.scores().percentile(list(percentiles)))
+        return dict(zip(percentiles, (float(v) for v in values)))
+
+    def shape(self):
+        return classify_shape(self.counts)
+
+class DriftMonitor:
+    """스트림(분포 이름)별 슬라이딩 윈도우 + 기준 대비 드리프트 경보 + 주기적 히스토그램 갱신
+
+    기준: set_reference()로 준 개수, 없으면 스트림의 첫 윈도우가 다 찼을 때의 상태.
+    check_every초마다 스트림별로 10/20/30th 퍼센타일 임계값 변화(값이 tolerance, 순위가 rank_tolerance 초과),
+    형태(concentrated/dispersed/balanced) 변화, KS 거리(ks_tolerance 초과)를 검사해
+    조건이 새로 참이 되면 'fire', 다시 거짓이 되면 'resolve' 경보를 냄 (상태가 유지되는 동안 반복하지 않음).
+    형태 경보는 현재 형태별 조건이라 형태가 다시 바뀌면 이전 경보는 해소되고 새 형태로 경보.
+    refresh_every초마다 윈도우 상태로 percentile_histogram 그림을 output_dir에 다시 렌더링.
+    """
+
+    def __init__(self, names=tuple(PERCENTILES), window=DEFAULT_WINDOW, slot=DEFAULT_SLOT,
+                 check_every=DEFAULT_CHECK_EVERY, refresh_every=DEFAULT_REFRESH_EVERY,
+                 tolerance=THRESHOLD_TOLERANCE, rank_tolerance=RANK_TOLERANCE, ks_tolerance=KS_TOLERANCE,
+                 min_count=MIN_COUNT, on_alert=None, output_dir=DEFAULT_OUTPUT_DIR):
+        self.windows = {name: SlidingWindow(window, slot) for name in names}
+        self.references = {}
+        self.check_every = check_every
+        self.refresh_every = refresh_every
+        self.tolerance = tolerance
+        self.rank_tolerance = rank_tolerance
+        self.ks_tolerance = ks_tolerance
+        self.min_count = min_count
+        self.on_alert = on_alert
+        self.output_dir = output_dir
+        self.active = {}
+        self.alerts = []
+        self.now = None
+        self.next_check = None
+        self.next_refresh = None
+        self.renders = 0
+
+    def set_reference(self, name, counts):
+        """스트림의 기준 분포 (센타일별 개수) 지정"""
+        counts = np.asarray(counts, dtype=np.int64)
+        if counts.shape != (NUM_LEVELS,) or counts.sum() == 0:
+            raise ValueError(f'{name}: 기준은 비어 있지 않은 길이 {NUM_LEVELS} 개수여야 합니다')
+        self.references[name] = counts.copy()
+
+    def add(self, name, score, timestamp):
+        """점수 하나 추가 (O(1), 검사/갱신 시점을 넘었으면 먼저 실행)"""
+        self._tick(timestamp)
+        self.windows[name].add(score, timestamp)
+
+    def add_batch(self, names, scores, timestamps):
+        """(스트림 이름 배열, 점수, 타임스탬프) 추가 - 검사/갱신 시점에서 잘라 순서대로 반영
+
+        타임스탬프는 대체로 증가한다고 가정 (조금 늦게 온 점수는 슬롯이 남아 있으면 반영).
+        감시하지 않는 스트림 이름의 점수는 무시.
+        """
+        names = np.asarray(names)
+        scores = np.asarray(scores, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        start = 0
+        while start < len(timestamps):
+            self._tick(timestamps[start])
+            due = min(self.next_check, self.next_refresh)
+            stop = start + int(np.argmax(timestamps[start:] >= due))
+            if timestamps[stop] < due:
+                stop = len(timestamps)
+            stop = max(stop, start + 1)
+            part = slice(start, stop)
+            for name, window in self.windows.items():
+                mine = names[part] == name
+                if mine.any():
+                    window.add_batch(scores[part][mine], timestamps[part][mine])
+            start = stop
+        if len(timestamps):
+            self.now = max(self.now, float(timestamps.max()))
+
+    def _tick(self, timestamp):
+        if self.now is None:
+            self.next_check = (math.floor(timestamp / self.check_every) + 1) * self.check_every
+            self.next_refresh = (math.floor(timestamp / self.refresh_every) + 1) * self.refresh_every
+        self.now = timestamp if self.now is None else max(self.now, timestamp)
+        if self.now >= self.next_check:
+            self.check(self.next_check)
+            self.next_check = (math.floor(self.now / self.check_every) + 1) * self.check_every
+        if self.now >= self.next_refresh:
+            self.refresh()
+            self.next_refresh = (math.floor(self.now / self.refresh_every) + 1) * self.refresh_every
+
+    def conditions(self, name):
+        """현재 참인 드리프트 조건 {(종류, 세부): (기준, 현재)}"""
+        window, reference = self.windows[name], self.references[name]
+        found = {}
+        current = window.thresholds()
+        expected = dict(zip(TRACKED_PERCENTILES, np.atleast_1d(
+            QuantizedScores.from_counts(reference).percentile(list(TRACKED_PERCENTILES)))))
+        for p in TRACKED_PERCENTILES:
+            if (abs(current[p] - expected[p]) > self.tolerance
+                    and rank_shift(window.counts, expected[p], p / 100) > self.rank_tolerance):
+                found[('threshold', f'p{p}')] = (float(expected[p]), current[p])
+        reference_shape, shape = classify_shape(reference), window.shape()
+        if shape != reference_shape:
+            found[('shape', shape)] = (reference_shape, shape)
+        distance = ks_distance(reference, window.counts)
+        if distance > self.ks_tolerance:
+            found[('ks', '')] = (0.0, distance)
+        return found
+
+    def check(self, timestamp):
+        """모든 스트림 검사 -> 새로 발생/해소된 경보 목록"""
+        events = []
+        with span('drift_check', cat='stats'):
+            for name, window in self.windows.items():
+                window.advance(timestamp)
+                if window.n < self.min_count:
+                    continue
+                if name not in self.references:
+                    if window.is_full(timestamp):
+                        self.set_reference(name, window.counts)
+                        print(f"[t={timestamp:.0f}] {name}: 기준 설정 (n={window.n:,}, "
+                              f"형태 {window.shape()}, {format_thresholds(window.thresholds())})")
+                    continue
+                found = self.conditions(name)
+                for key, (reference, current) in found.items():
+                    if (name, key) not in self.active:
+                        self.active[(name, key)] = (reference, current)
+                        events.append(make_alert(timestamp, name, key, 'fire', reference, current))
+                for key in [key for stream, key in self.active if stream == name]:
+                    if key not in found:
+                        reference, current = self.active.pop((name, key))
+                        events.append(make_alert(timestamp, name, key, 'resolve', reference, current))
+        for event in events:
+            self.alerts.append(event)
+            if self.on_alert:
+                self.on_alert(event)
+        return events
+
+    def datasets(self):
+        """윈도우 상태 -> percentile_histogram 그림 입력 (세 분포 모두 점수가 있어야 함)"""
+        if any(name not in self.windows or self.windows[name].n == 0 for name in PERCENTILES):
+            return None
+        datasets = {name: self.windows[name].scores() for name in PERCENTILES}
+        datasets['thresholds'] = {name: datasets[name].percentile(percentile)
+                                  for name, percentile in PERCENTILES.items()}
+        return datasets
+
+    def refresh(self):
+        """윈도우 상태로 퍼센타일 히스토그램 다시 렌더링 -> 성공 여부"""
+        datasets = self.datasets()
+        if datasets is None:
+            return False
+        os.makedirs(self.output_dir, exist_ok=True)
+        with span('drift_refresh', cat='plot'):
+            print(f"[t={self.now:.0f}] 윈도우 상태로 퍼센타일 히스토그램 갱신 ({self.output_dir})")
+            results = render_figures(figures_in(FIGURES, self.output_dir), {'datasets': datasets})
+        self.renders += 1
+        return all(r['ok'] for r in results)
+
+    def finish(self):
+        """스트림 끝: 마지막 검사 + 히스토그램 갱신"""
+        if self.now is None:
+            return
+        self.check(self.now)
+        self.refresh()
+
+def make_alert(timestamp, name, key, status, reference, current):
+    """경보 dict (ALERT_FIELDS, 숫자 값은 float64로 ALERT_DECIMALS 자리 반올림)"""
+    kind, detail = key
+    if kind != 'shape':
+        reference, current = (round(float(value), ALERT_DECIMALS) for value in (reference, current))
+    if kind == 'threshold':
+        message = f"{detail} 임계값 {reference:.3f} -> {current:.3f}"
+    elif kind == 'shape':
+        message = f"형태 {reference} -> {current}"
+    else:
+        message = f"KS 거리 {current:.3f}"
+    return {'time': float(timestamp), 'stream': name, 'kind': f'{kind}:{detail}' if detail else kind,
+            'status': status, 'reference': reference, 'current': current, 'message': message}
+
+def format_thresholds(thresholds):
+    return ', '.join(f'p{p} {value:.3f}' for p, value in thresholds.items())
+
+def print_alert(event):
+    label = '경보' if event['status'] == 'fire' else '해소'
+    print(f"[t={event['time']:.0f}] {label} {event['stream']} {event['kind']}: {event['message']}")
+
+def iter_event_blocks(path, block_lines=BLOCK_LINES):
+    """'타임스탬프,스트림,점수' 로그 -> (이름, 점수, 타임스탬프) 배열 블록 ('-'면 표준 입력, 한 줄씩)
+
+    숫자가 아닌 줄(헤더)과 0-1 범위 밖 점수는 건너뜀.
+    """
+    if path == '-':
+        f, block_lines = sys.stdin, 1
+    else:
+        f = open(path, encoding='utf-8')
+    with f:
+        while True:
+            lines = list(itertools.islice(f, block_lines))
+            if not lines:
+                return
+            names, scores, timestamps = [], [], []
+            for line in lines:
+                fields = line.strip().split(',')
+                if len(fields) != 3:
+                    continue
+                try:
+                    timestamp, score = float(fields[0]), float(fields[2])
+                except ValueError:
+                    continue
+                if 0 <= score <= 1:
+                    names.append(fields[1].strip())
+                    scores.append(score)
+                    timestamps.append(timestamp)
+            if names:
+                yield np.array(names), np.array(scores), np.array(timestamps)
+
+def simulate_events(duration, rate=20, drift_at=0.5, seed=0):
+    """세 분포의 실시간 점수 흐름 시뮬레이션 (초당 스트림별 rate개, 소수점 둘째 자리)
+
+    drift_at(전체 시간 비율) 이후로는 concentrated 스트림이 dispersed 분포로 바뀜 -> 경보 확인용.
+    """
+    generators = {'concentrated': generate_concentrated_array, 'dispersed': generate_dispersed_array,
+                  'balanced': generate_balanced_array}
+    rng = np.random.default_rng(seed)
+    for second in range(int(duration)):
+        names, scores = [], []
+        for index, (name, generate) in enumerate(generators.items()):
+            if name == 'concentrated' and second >= drift_at * duration:
+                generate = generate_dispersed_array
+            values = generate(rate, seed=int(rng.integers(1 << 31)))
+            names.append(np.full(rate, name))
+            scores.append(np.round(rng.permutation(values), 2))
+        timestamps = second + np.sort(rng.random(rate * len(generators)))
+        order = rng.permutation(rate * len(generators))
+        yield np.concatenate(names)[order], np.concatenate(scores)[order], timestamps
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='실시간 점수의 슬라이딩 윈도우 퍼센타일/분포 형태 드리프트 감시')
+    parser.add_argument('input', nargs='?', default=None,
+                        help="'타임스탬프(초),스트림,점수' 로그 파일 ('-'면 표준 입력, 스트림: "
+                             f"{', '.join(PERCENTILES)})")
+    parser.add_argument('--simulate', type=float, default=None, metavar='SECONDS',
+                        help='입력 대신 세 분포의 점수 흐름을 SECONDS초 동안 시뮬레이션 (중간에 드리프트 발생)')
+    parser.add_argument('--rate', type=int, default=20, help='시뮬레이션 초당 스트림별 점수 수 (기본값: 20)')
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW,
+                        help=f'슬라이딩 윈도우 길이 초 (기본값: {DEFAULT_WINDOW:g})')
+    parser.add_argument('--slot', type=float, default=DEFAULT_SLOT,
+                        help=f'윈도우 만료 단위 초 (기본값: {DEFAULT_SLOT:g})')
+    parser.add_argument('--check-every', type=float, default=DEFAULT_CHECK_EVERY,
+                        help=f'드리프트 검사 주기 초 (기본값: {DEFAULT_CHECK_EVERY:g})')
+    parser.add_argument('--refresh-every', type=float, default=DEFAULT_REFRESH_EVERY,
+                        help=f'퍼센타일 히스토그램 갱신 주기 초 (기본값: {DEFAULT_REFRESH_EVERY:g})')
+    parser.add_argument('--tolerance', type=float, default=THRESHOLD_TOLERANCE,
+                        help=f'임계값 변화 허용치 (기본값: {THRESHOLD_TOLERANCE})')
+    parser.add_argument('--rank-tolerance', type=float, default=RANK_TOLERANCE,
+                        help=f'기준 임계값의 순위 변화 허용치 (기본값: {RANK_TOLERANCE})')
+    parser.add_argument('--ks-tolerance', type=float, default=KS_TOLERANCE,
+                        help=f'기준 대비 KS 거리 허용치 (기본값: {KS_TOLERANCE})')
+    parser.add_argument('--min-count', type=int, default=MIN_COUNT,
+                        help=f'검사에 필요한 윈도우 최소 점수 수 (기본값: {MIN_COUNT})')
+    parser.add_argument('--reference', action='append', default=None, metavar='NAME=PATH',
+                        help='스트림별 기준 점수 파일 (.npy/.scores/텍스트 로그, 없으면 첫 윈도우가 기준)')
+    parser.add_argument('--alerts', metavar='PATH', default=None, help='경보를 JSON Lines로 추가 기록')
+    parser.add_argument('-o', '--out-dir', default=DEFAULT_OUTPUT_DIR,
+                        help=f'윈도우 상태 퍼센타일 히스토그램 출력 디렉터리 (기본값: {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='검사/갱신 span을 Chrome trace JSON으로 저장')
+    args = parser.parse_args(argv)
+    if (args.input is None) == (args.simulate is None):
+        parser.error('입력 로그 또는 --simulate 중 하나를 지정하세요')
+    if args.reference:
+        args.reference = dict(spec.partition('=')[::2] for spec in args.reference)
+        unknown = [name for name in args.reference if name not in PERCENTILES]
+        if unknown:
+            parser.error(f"--reference의 알 수 없는 스트림: {', '.join(unknown)}")
+    return args
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    # 감시 중 plt.show()에서 멈추지 않도록 항상 비대화형으로 렌더링
+    enable_batch_mode()
+    if args.trace:
+        enable_tracing()
+    alerts_file = open(args.alerts, 'a', encoding='utf-8') if args.alerts else None
+
+    def on_alert(event):
+        print_alert(event)
+        if alerts_file:
+            alerts_file.write(json.dumps({key: event[key] for key in ALERT_FIELDS}, ensure_ascii=False) + '\n')
+            alerts_file.flush()
+
+    monitor = DriftMonitor(window=args.window, slot=args.slot, check_every=args.check_every,
+                           refresh_every=args.refresh_every, tolerance=args.tolerance,
+                           rank_tolerance=args.rank_tolerance, ks_tolerance=args.ks_tolerance, min_count=args.min_count,
+                           on_alert=on_alert, output_dir=args.out_dir)
+    for name, path in (args.reference or {}).items():
+        stats = stream_stats(path)
+        if not stats.is_quantized:
+            raise ValueError(f'{path}: 기준 점수는 소수점 둘째 자리여야 합니다')
+        monitor.set_reference(name, stats.counts)
+    if args.simulate is not None:
+        blocks = simulate_events(args.simulate, args.rate)
+    else:
+        blocks = iter_event_blocks(args.input)
+    try:
+        for names, scores, timestamps in blocks:
+            monitor.add_batch(names, scores, timestamps)
+        monitor.finish()
+    finally:
+        if alerts_file:
+            alerts_file.close()
+    for name, window in monitor.windows.items():
+        if window.n:
+            print(f"{name}: 윈도우 n={window.n:,}, 형태 {window.shape()}, "
+                  f"{format_thresholds(window.thresholds())}, 늦은 점수 {window.late:,}")
+    fired = sum(event['status'] == 'fire' for event in monitor.alerts)
+    print(f"경보 {fired}건, 히스토그램 갱신 {monitor.renders}회")
+    if args.trace:
+        save_trace(args.trace)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(run())
@@ -0,0 +1,182 @@
+import argparse
+import json
+
+import numpy as np
+
+from tracing import enable_tracing, save_trace, span, traced
+
+# Drop 판정: 점수가 임계값보다 낮은 쿼리를 드롭 (percentile_histogram의 필터와 같은 규칙)
+# 정답 라벨: True = 드롭해야 하는 쿼리 (관련 문서가 없는 쿼리)
+METRICS = ('Drop Precision', 'Drop Recall', 'Drop F1')
+
+def _as_batch(scores, labels):
+    """점수 (쿼리,) 또는 (방법, 쿼리)와 라벨 -> (방법, 쿼리) 점수/라벨 배열"""
+    scores = np.asarray(scores)
+    if scores.dtype.kind != 'f':
+        scores = scores.astype(np.float64)
+    if scores.ndim == 1:
+        scores = scores[None, :]
+    labels = np.asarray(labels, dtype=bool)
+    if labels.ndim == 1:
+        labels = np.broadcast_to(labels, scores.shape)
+    if labels.shape != scores.shape:
+        raise ValueError(f'점수{scores.shape}와 라벨{labels.shape}의 크기가 다릅니다')
+    return scores, labels
+
+def _ratios(tp, predicted, positives):
+    """TP/예측 수/정답 수 -> (precision, recall, f1), 분모가 0이면 0"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(positives > 0, tp / positives, 0.0)
+        f1 = np.where(predicted + positives > 0, 2 * tp / (predicted + positives), 0.0)
+    return precision, recall, f1
+
+@traced(name='drop_curves', cat='stats')
+def drop_curves(scores, labels):
+    """모든 임계값에 대한 Drop precision/recall/F1 곡선 (방법별 정렬 1회 + 누적합 1회)
+
+    scores: (쿼리,) 또는 (방법, 쿼리) 점수, labels: (쿼리,) 공통 또는 (방법, 쿼리) 라벨
+    반환값: thresholds/precision/recall/f1 (방법, 쿼리) 배열 dict.
+    j번째 열은 점수가 낮은 쪽부터 j+1개를 드롭하는 임계값 (다음 점수, 마지막은 최댓값 바로 위).
+    같은 점수는 함께 드롭되므로 동점 구간은 구간 끝의 값으로 채움.
+    """
+    scores, labels = _as_batch(scores, labels)
+    n_methods, n_queries = scores.shape
+    order = np.argsort(scores, axis=1, kind='stable')
+    sorted_scores = np.take_along_axis(scores, order, axis=1)
+    tp = np.cumsum(np.take_along_axis(labels, order, axis=1), axis=1)
+    predicted = np.arange(1, n_queries + 1)
+    positives = labels.sum(axis=1, keepdims=True)
+
+    # 동점 구간: 각 위치를 같은 점수의 마지막 위치로 옮김 (뒤에서부터 최솟값 누적)
+    boundary = np.ones(scores.shape, dtype=bool)
+    boundary[:, :-1] = sorted_scores[:, 1:] != sorted_scores[:, :-1]
+    last = np.where(boundary, np.arange(n_queries), n_queries)
+    last = np.minimum.accumulate(last[:, ::-1], axis=1)[:, ::-1]
+    tp = np.take_along_axis(tp, last, axis=1)
+    predicted = predicted[last]
+
+    thresholds = np.empty_like(sorted_scores)
+    thresholds[:, :-1] = sorted_scores[:, 1:]
+    thresholds[:, -1] = np.nextafter(sorted_scores[:, -1], np.inf)
+    thresholds = np.take_along_axis(thresholds, last, axis=1)
+
+    precision, recall, f1 = _ratios(tp, predicted, positives)
+    return {'thresholds': thresholds, 'precision': precision, 'recall': recall, 'f1': f1}
+
+@traced(name='drop_metrics', cat='stats')
+def drop_metrics_at(scores, labels, thresholds):
+    """방법별 임계값 하나에서의 (precision, recall, f1) - 비교 마스크 합으로 계산 (정렬 불필요)
+
+    thresholds: 스칼라 또는 방법별 배열 (점수 < 임계값이면 드롭)
+    """
+    scores, labels = _as_batch(scores, labels)
+    thresholds = np.broadcast_to(np.asarray(thresholds, dtype=np.float64), (len(scores),))
+    dropped = scores < thresholds[:, None]
+    return _ratios((dropped & labels).sum(axis=1), dropped.sum(axis=1), labels.sum(axis=1))
+
+def best_f1_thresholds(curves):
+    """방법별 F1 최대 임계값 (동점이면 가장 낮은 임계값)"""
+    best = np.argmax(curves['f1'], axis=1)
+    return curves['thresholds'][np.arange(len(best)), best]
+
+def percentile_thresholds(scores, percentile):
+    """방법별 점수 분포의 percentile 임계값 (percentile_histogram과 같은 규칙)"""
+    return np.percentile(np.asarray(scores, dtype=np.float64), percentile, axis=-1)
+
+def evaluate_methods(method_scores, labels, thresholds=None, percentile=None):
+    """여러 방법을 한 번에 평가 -> {방법: {지표 이름: 백분율}} (create_performance_data 입력 형식)
+
+    method_scores: {방법 이름: 쿼리별 점수} (모든 방법이 같은 쿼리 순서)
+    thresholds: 방법 공통 임계값 또는 {방법: 임계값}
+    percentile: 방법별 점수의 percentile을 임계값으로 사용
+    둘 다 없으면 방법별 F1 최대 임계값 사용.
+    반환값: (지표 dict, 방법별 사용 임계값 dict)
+    """
+    methods = list(method_scores)
+    with span('stack_scores', cat='data'):
+        scores = np.vstack([np.asarray(method_scores[m]).reshape(-1) for m in methods])
+    if isinstance(thresholds, dict):
+        thresholds = np.array([thresholds[m] for m in methods], dtype=np.float64)
+    elif thresholds is None and percentile is not None:
+        thresholds = percentile_thresholds(scores, percentile)
+    elif thresholds is None:
+        thresholds = best_f1_thresholds(drop_curves(scores, labels))
+    thresholds = np.broadcast_to(np.asarray(thresholds, dtype=np.float64), (len(methods),))
+
+    precision, recall, f1 = drop_metrics_at(scores, labels, thresholds)
+    metrics = {method: dict(zip(METRICS, (float(p) * 100, float(r) * 100, float(f) * 100)))
+               for method, p, r, f in zip(methods, precision, recall, f1)}
+    return metrics, dict(zip(methods, thresholds.tolist()))
+
+def load_labels(path):
+    """드롭 정답 라벨 .npy (bool 또는 0/1, 점수 파일과 같은 쿼리 순서)"""
+    return np.load(path).astype(bool).reshape(-1)
+
+def parse_method_scores(specs):
+    """'이름=경로' 목록 -> {이름: 점수} (score_io 형식, 메모리 매핑으로 열기)"""
+    from score_io import load_scores
+    method_scores = {}
+    for spec in specs:
+        name, sep, path = spec.partition('=')
+        if not sep:
+            raise ValueError(f"방법 점수는 '이름=경로' 형식이어야 합니다: {spec}")
+        method_scores[name] = load_scores(path)[1]
+    return method_scores
+
+def write_metrics(path, metrics, dataset=None):
+    """평가 결과를 metrics_table 형식 long JSONL로 저장 (performance_evaluation --metrics 입력)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for method, values in metrics.items():
+            for metric, value in values.items():
+                record = {'method': method, 'metric': metric, 'value': round(value, 4)}
+                if dataset:
+                    record = {'dataset': dataset, **record}
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def print_metrics(metrics, thresholds):
+    """방법별 임계값과 지표 표 출력"""
+    width = max(len(m) for m in metrics)
+    header = ''.join(f'{name:>16}' for name in METRICS)
+    print(f"{'Method':<{width}}{'Threshold':>11}{header}")
+    for method, values in metrics.items():
+        row = ''.join(f'{values[name]:>16.1f}' for name in METRICS)
+        print(f"{method:<{width}}{thresholds[method]:>11.4f}{row}")
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='쿼리별 점수와 드롭 정답 라벨로 Drop Precision/Recall/F1 계산')
+    parser.add_argument('--labels', required=True,
+                        help='드롭 정답 라벨 .npy (True = 드롭해야 하는 쿼리, 점수와 같은 순서)')
+    parser.add_argument('--method', action='append', required=True, metavar='NAME=PATH',
+                        help='방법 이름과 점수 파일 (.npy 또는 .scores, 여러 번 지정, 첫 번째가 기준 방법)')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--threshold', type=float, default=None,
+                       help='모든 방법에 같은 임계값 사용 (점수 < 임계값이면 드롭)')
+    group.add_argument('--percentile', type=float, default=None,
+                       help='방법별 점수의 percentile을 임계값으로 사용')
+    parser.add_argument('--output', default=None,
+                        help='결과를 long JSONL로 저장 (performance_evaluation.py --metrics로 그림 생성)')
+    parser.add_argument('--dataset', default=None, help='JSONL에 기록할 데이터셋 이름')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='단계별 span을 Chrome trace JSON으로 저장')
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    if args.trace:
+        enable_tracing()
+    labels = load_labels(args.labels)
+    method_scores = parse_method_scores(args.method)
+    metrics, thresholds = evaluate_methods(method_scores, labels, args.threshold, args.percentile)
+    print_metrics(metrics, thresholds)
+    if args.output:
+        write_metrics(args.output, metrics, args.dataset)
+        print(f"결과 저장: {args.output}")
+    if args.trace:
+        save_trace(args.trace)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(run())
@@ -0,0 +1,329 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import argparse
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from batch_mode import enable_batch_mode, finish_figure, report_peak_memory
+from fast_kde import fast_kde
+from quantized_scores import LEVEL_VALUES, NUM_LEVELS, QuantizedScores
+from render_pool import figures_in
+from significance_tests import quantize_if_exact
+from tracing import (add_trace_events, enable_tracing, pop_trace_events, save_trace, span,
+                     trace_origin, traced)
+
+# 한글 폰트 설정
+plt.rcParams['font.family'] = 'DejaVu Sans'
+plt.rcParams['axes.unicode_minus'] = False
+
+# 실행(run)별로 기록하는 분포 통계 (소수점 둘째 자리 점수면 centile 개수에서, 아니면 원본에서 정확하게)
+SUMMARY_STATS = ('Mean', 'Median', 'Std', 'P10', 'P90')
+# 합성 실행 (--synthetic): paper_visualization 생성기를 데이터셋/시드별로 다른 시드로 호출
+SYNTHETIC_METHODS = ('Baseline', 'Proposed')
+SYNTHETIC_SEED_OFFSET = 500
+# 요약 그림 한 칸 크기 (인치)와 전체 크기 상한
+FACET_WIDTH, FACET_HEIGHT = 2.4, 1.8
+MAX_FIGURE_INCHES = 24
+
+def load_sweep_spec(path):
+    """실행 목록 JSON/JSONL 읽기
+
+    실행마다 {"dataset": 이름, "run": 이름(선택), "methods": {방법: 점수 파일}, "labels": 라벨 .npy(선택)}.
+    점수 파일은 score_io 형식(.npy 또는 .scores), 첫 번째 방법이 기준 방법.
+    점수는 임의의 실수여도 되며, 요약 그림의 분포 칸만 0-1 범위의 0.01 단위로 그림 (evaluate_run 참고).
+    """
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            runs = [json.loads(line) for line in f if line.strip()]
+        else:
+            runs = json.load(f)
+    for i, run in enumerate(runs):
+        if 'dataset' not in run or not run.get('methods'):
+            raise ValueError(f'{path}: {i + 1}번째 실행에 dataset/methods가 없습니다')
+        run.setdefault('run', f'run{i + 1}')
+    return runs
+
+def synthetic_runs(datasets, seeds, n_queries):
+    """합성 실행 목록 (데이터셋 x 시드) - 데이터는 워커에서 생성하므로 목록에는 시드만 기록"""
+    return [{'dataset': dataset, 'run': f'seed{seed}',
+             'synthetic': {'n_queries': n_queries, 'seed': 1000 * d + seed}}
+            for d, dataset in enumerate(datasets) for seed in range(seeds)]
+
+def _load_run_scores(run):
+    """실행의 방법별 점수 {방법: 배열} (점수 파일은 메모리 매핑, 합성 실행은 이 프로세스에서 생성)"""
+    if 'synthetic' in run:
+        from paper_visualization import generate_baseline_array, generate_proposed_array
+        n_queries, seed = run['synthetic']['n_queries'], run['synthetic']['seed']
+        baseline, proposed = SYNTHETIC_METHODS
+        return {baseline: generate_baseline_array(n_queries, seed=seed),
+                proposed: generate_proposed_array(n_queries, seed=seed + SYNTHETIC_SEED_OFFSET)}
+    from score_io import load_scores
+    return {method: load_scores(path)[1] for method, path in run['methods'].items()}
+
+def _run_figures(run, method_scores, out_dir, themes):
+    """실행별 논문 그림 (첫 번째/마지막 방법 비교)을 out_dir/<dataset>/<run>/에 저장"""
+    from paper_visualization import build_figures, compute_paper_analysis
+
+    methods = list(method_scores)
+    analysis = compute_paper_analysis(method_scores[methods[0]], method_scores[methods[-1]])
+    run_dir = os.path.join(out_dir, run['dataset'], run['run'])
+    os.makedirs(run_dir, exist_ok=True)
+    try:
+        for _, func, _ in figures_in(build_figures(themes), run_dir):
+            func(analysis=analysis)
+    finally:
+        plt.close('all')
+    return run_dir
+
+def _method_stats(scores):
+    """방법 하나의 (SUMMARY_STATS 값, 요약 그림용 101칸 개수)
+
+    소수점 둘째 자리 0-1 점수면 개수에서 정확하게 계산.
+    아니면 통계는 원본 배열에서 정확하게 계산하고, 그림용 개수만 가장 가까운 0.01 칸으로
+    모음 (0-1 범위 밖 값은 양 끝 칸).
+    """
+    quantized = quantize_if_exact(scores)
+    if isinstance(quantized, QuantizedScores):
+        return _distribution_stats(quantized.counts), quantized.counts
+    values = np.asarray(quantized, dtype=np.float64)
+    median, p10, p90 = np.percentile(values, [50, 10, 90])
+    stats = dict(zip(SUMMARY_STATS, map(float, (values.mean(), median, values.std(), p10, p90))))
+    codes = np.rint(np.clip(values, 0, 1) * 100).astype(np.int64)
+    return stats, np.bincount(codes, minlength=NUM_LEVELS)
+
+def evaluate_run(run, out_dir=None, themes=(), drop_percentile=None):
+    """실행 하나의 방법별 통계 계산 (워커에서 실행) -> 결과 dict
+
+    부모로는 방법별 요약 통계, 101칸 개수와 Drop 지표만 돌려보내므로
+    프로세스 간 전송량이 쿼리 수와 무관 (코어 수에 비례해 확장).
+    """
+    start = time.perf_counter()
+    result = {'dataset': run['dataset'], 'run': run['run'], 'ok': True, 'error': None}
+    try:
+        with span('run', cat='sweep', dataset=run['dataset'], run=run['run']):
+            with span('data_load', cat='data'):
+                method_scores = _load_run_scores(run)
+            with span('quantize', cat='stats'):
+                stats, counts = zip(*(_method_stats(scores) for scores in method_scores.values()))
+            result['methods'] = list(method_scores)
+            result['stats'] = list(stats)
+            result['counts'] = np.vstack(counts)
+            if run.get('labels'):
+                from drop_evaluation import evaluate_methods, load_labels
+                result['drop'], _ = evaluate_methods(method_scores, load_labels(run['labels']),
+                                                     percentile=drop_percentile)
+            if out_dir and themes:
+                result['figures'] = _run_figures(run, method_scores, out_dir, themes)
+    except Exception:
+        result.update(ok=False, error=traceback.format_exc())
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def _init_worker(origin=None):
+    """워커 초기화: 배치 모드, 부모가 추적 중이면 같은 시간축으로 추적"""
+    enable_batch_mode()
+    if origin is not None:
+        enable_tracing(origin)
+
+def _evaluate_task(run, out_dir, themes, drop_percentile):
+    """워커 작업 (기록한 span은 결과와 함께 부모로 전달)"""
+    result = evaluate_run(run, out_dir, themes, drop_percentile)
+    result['trace_events'] = pop_trace_events()
+    return result
+
+def _report(result, done, total):
+    label = f"[{done}/{total}] {result['dataset']}/{result['run']}"
+    if result['ok']:
+        print(f"{label} 완료 ({result['seconds']:.2f}s)")
+    else:
+        print(f"{label} 실패 ({result['seconds']:.2f}s)")
+        print(result['error'])
+
+@traced(name='sweep', cat='sweep')
+def run_sweep(runs, jobs=1, out_dir=None, themes=(), drop_percentile=None):
+    """실행 목록을 프로세스 풀에서 평가 (jobs > 1) -> 결과 목록 (runs 순서 유지)"""
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(runs))
+    results = [None] * len(runs)
+    if jobs <= 1:
+        for i, run in enumerate(runs):
+            results[i] = evaluate_run(run, out_dir, themes, drop_percentile)
+            _report(results[i], i + 1, len(runs))
+        return results
+
+    print(f"{len(runs)}개 실행을 {jobs}개 프로세스로 병렬 평가 중...")
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(trace_origin(),)) as executor:
+        futures = {executor.submit(_evaluate_task, run, out_dir, themes, drop_percentile): i
+                   for i, run in enumerate(runs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # 워커 프로세스 자체가 죽은 경우
+                result = {'dataset': runs[i]['dataset'], 'run': runs[i]['run'], 'ok': False,
+                          'error': traceback.format_exc(), 'seconds': 0.0}
+            add_trace_events(result.pop('trace_events', []))
+            results[i] = result
+            _report(result, done, len(runs))
+    return results
+
+def _distribution_stats(counts):
+    """101칸 개수 -> SUMMARY_STATS 값"""
+    scores = QuantizedScores.from_counts(counts)
+    return dict(zip(SUMMARY_STATS, (scores.mean(), scores.median(), scores.std(),
+                                    scores.percentile(10), scores.percentile(90))))
+
+@traced(name='summarize', cat='stats')
+def summarize_sweep(results):
+    """실행별 결과를 (데이터셋, 방법)별로 합침
+
+    반환값: {'datasets', 'methods', 'counts' (데이터셋, 방법, 101) 합계,
+             'runs' 데이터셋별 실행 수, 'records' 실행별 long 형식 기록 목록}
+    """
+    ok = [r for r in results if r['ok']]
+    datasets = list(dict.fromkeys(r['dataset'] for r in ok))
+    methods = list(dict.fromkeys(m for r in ok for m in r['methods']))
+    counts = np.zeros((len(datasets), len(methods), NUM_LEVELS), dtype=np.int64)
+    runs = np.zeros(len(datasets), dtype=np.int64)
+    records = []
+    for r in ok:
+        d = datasets.index(r['dataset'])
+        runs[d] += 1
+        for method, method_stats, method_counts in zip(r['methods'], r['stats'], r['counts']):
+            counts[d, methods.index(method)] += method_counts
+            values = dict(method_stats)
+            values.update(r.get('drop', {}).get(method, {}))
+            records += [{'dataset': r['dataset'], 'run': r['run'], 'method': method,
+                         'metric': metric, 'value': float(value)} for metric, value in values.items()]
+    return {'datasets': datasets, 'methods': methods, 'counts': counts, 'runs': runs,
+            'records': records}
+
+def write_sweep_records(path, summary):
+    """실행별 기록을 long JSONL로 저장 (performance_evaluation.py --metrics로 바로 그림 생성 가능)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in summary['records']:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+@traced
+def plot_sweep_summary(summary, output='sweep_summary.png'):
+    """데이터셋 x 방법 격자 요약 그림 (칸마다 전체 실행을 합친 분포 + 실행 간 평균 편차)"""
+    datasets, methods, counts = summary['datasets'], summary['methods'], summary['counts']
+    # 실행별 평균 (칸마다 실행 간 평균 ± 표준편차 표시)
+    run_means = {}
+    for record in summary['records']:
+        if record['metric'] == 'Mean':
+            run_means.setdefault((record['dataset'], record['method']), []).append(record['value'])
+
+    n_rows, n_cols = len(datasets), len(methods)
+    figsize = (min(FACET_WIDTH * n_cols + 1, MAX_FIGURE_INCHES), min(FACET_HEIGHT * n_rows + 0.5, MAX_FIGURE_INCHES))
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=figsize, sharex=True, sharey=True, squeeze=False)
+    edges = np.append(LEVEL_VALUES - 0.005, LEVEL_VALUES[-1] + 0.005)
+    colors = plt.get_cmap('tab10')
+
+    for d, dataset in enumerate(datasets):
+        for m, method in enumerate(methods):
+            ax = axes[d, m]
+            cell = counts[d, m]
+            if cell.sum() == 0:
+                ax.text(0.5, 0.5, 'n/a', ha='center', va='center', transform=ax.transAxes, color='gray')
+                continue
+            scores = QuantizedScores.from_counts(cell)
+            color = colors(m % colors.N)
+            # 센타일 개수를 그대로 계단형 히스토그램(밀도)으로
+            ax.stairs(cell / cell.sum() / 0.01, edges, fill=True, alpha=0.3, color=color)
+            grid, density = fast_kde(scores, decimals=2)
+            ax.plot(grid, density, color=color, linewidth=1.2)
+            ax.axvline(scores.median(), color='black', linestyle='--', linewidth=0.8)
+            means = np.asarray(run_means.get((dataset, method), []))
+            ax.text(0.03, 0.95, f'mean {means.mean():.3f}±{means.std():.3f}\nruns {len(means)}',
+                    transform=ax.transAxes, va='top', fontsize=7)
+            ax.grid(True, alpha=0.3)
+        axes[d, 0].set_ylabel(dataset, fontsize=9, fontweight='bold')
+    for m, method in enumerate(methods):
+        axes[0, m].set_title(method, fontsize=9, fontweight='bold')
+        axes[-1, m].set_xlabel('Similarity Score', fontsize=8)
+    for ax in axes.flat:
+        ax.tick_params(axis='both', labelsize=7)
+
+    finish_figure(fig, output)
+
+@traced(cat='main')
+def main(runs, jobs=1, out_dir='sweep', themes=(), drop_percentile=None):
+    """실행 목록 평가 -> 요약 그림/기록 저장"""
+    print(f"실험 스윕: {len(runs)}개 실행")
+    os.makedirs(out_dir, exist_ok=True)
+    results = run_sweep(runs, jobs, out_dir, themes, drop_percentile)
+    failed = [f"{r['dataset']}/{r['run']}" for r in results if not r['ok']]
+    if failed:
+        print(f"실패한 실행: {', '.join(failed)}")
+    if len(failed) == len(results):
+        return results
+
+    summary = summarize_sweep(results)
+    records_path = os.path.join(out_dir, 'sweep_summary.jsonl')
+    figure_path = os.path.join(out_dir, 'sweep_summary.png')
+    write_sweep_records(records_path, summary)
+    plot_sweep_summary(summary, figure_path)
+    print("생성된 파일들:")
+    print(f"- {figure_path} (데이터셋 {len(summary['datasets'])} x 방법 {len(summary['methods'])})")
+    print(f"- {records_path} (실행별 통계, performance_evaluation.py --metrics 입력)")
+    if themes:
+        print(f"- {out_dir}/<dataset>/<run>/ (실행별 논문 그림)")
+    return results
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='여러 데이터셋/실행에 대한 분포 비교 스윕')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--spec', help='실행 목록 JSON/JSONL ({"dataset", "run", "methods": {방법: 점수 파일}, "labels"})')
+    source.add_argument('--synthetic', metavar='DATASETS',
+                        help='합성 데이터셋 이름 (쉼표 구분) - paper_visualization 생성기로 데이터셋/시드별 실행 생성')
+    parser.add_argument('--seeds', type=int, default=3, help='--synthetic 데이터셋별 시드 수 (기본값: 3)')
+    parser.add_argument('--n-queries', type=int, default=6600, help='--synthetic 실행별 쿼리 수 (기본값: 6600)')
+    parser.add_argument('-o', '--out-dir', default='sweep', help='출력 디렉터리 (기본값: sweep)')
+    parser.add_argument('--run-figures', default='',
+                        help='실행별 논문 그림 테마 (쉼표 구분, 예: color 또는 color,bw, 기본값: 생성 안 함)')
+    parser.add_argument('--drop-percentile', type=float, default=None,
+                        help='라벨이 있는 실행의 드롭 임계값 percentile (기본값: 방법별 F1 최대 임계값)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='병렬 평가 프로세스 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='실행/단계별 span을 Chrome trace JSON으로 저장 (워커 포함)')
+    parser.add_argument('--batch', action='store_true',
+                        help='배치 모드: 비대화형 백엔드 사용, plt.show() 생략, 최대 메모리 보고')
+    args = parser.parse_args(argv)
+    args.run_figures = tuple(t.strip() for t in args.run_figures.split(',') if t.strip())
+    unknown = [t for t in args.run_figures if t not in ('color', 'bw')]
+    if unknown:
+        parser.error(f"알 수 없는 테마: {', '.join(unknown)}")
+    if args.seeds > SYNTHETIC_SEED_OFFSET:
+        parser.error(f'--seeds는 {SYNTHETIC_SEED_OFFSET} 이하여야 합니다')
+    return args
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    if args.batch:
+        enable_batch_mode()
+    if args.trace:
+        enable_tracing()
+    if args.spec:
+        runs = load_sweep_spec(args.spec)
+    else:
+        datasets = [d.strip() for d in args.synthetic.split(',') if d.strip()]
+        runs = synthetic_runs(datasets, args.seeds, args.n_queries)
+    results = main(runs, args.jobs, args.out_dir, args.run_figures, args.drop_percentile)
+    if args.trace:
+        save_trace(args.trace)
+    if args.batch:
+        report_peak_memory()
+    return 0 if all(r['ok'] for r in results) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(run())
@@ -0,0 +1,148 @@
+import math
+
+import numpy as np
+
+from quantized_scores import QuantizedScores
+
+# 한 번에 처리할 원소 수 (임시 배열 메모리를 청크 크기로 제한)
+CHUNK_SIZE = 1 << 20
+
+def _iter_chunks(data, chunk_size=CHUNK_SIZE):
+    """1차원 배열을 청크 단위로 순회 (메모리 매핑 배열도 그대로 사용)"""
+    data = np.asarray(data).reshape(-1)
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+def quantized_counts(data, decimals=2):
+    """소수점 decimals 자리로 양자화된 점수의 정확한 값별 개수 (값, 개수)"""
+    if isinstance(data, QuantizedScores) and decimals == 2:
+        # 이미 센타일별 개수가 있으므로 다시 순회하지 않음
+        nonzero = data.counts > 0
+        return data.values.astype(np.float64)[nonzero], data.counts[nonzero]
+    scale = 10 ** decimals
+    counts = np.zeros(0, dtype=np.int64)
+    offset = None
+    for chunk in _iter_chunks(data):
+        codes = np.rint(chunk.astype(np.float64) * scale).astype(np.int64)
+        low = int(codes.min())
+        if offset is None or low < offset:
+            # 더 작은 값이 나오면 개수 배열 앞쪽을 늘림
+            shift = 0 if offset is None else offset - low
+            counts = np.concatenate([np.zeros(shift, dtype=np.int64), counts])
+            offset = low
+        chunk_counts = np.bincount(codes - offset)
+        if len(chunk_counts) > len(counts):
+            counts = np.concatenate([counts, np.zeros(len(chunk_counts) - len(counts), dtype=np.int64)])
+        counts[:len(chunk_counts)] += chunk_counts
+    if offset is None:
+        raise ValueError('빈 데이터로는 KDE를 계산할 수 없습니다')
+    values = (np.arange(len(counts)) + offset) / scale
+    nonzero = counts > 0
+    return values[nonzero], counts[nonzero]
+
+def _data_summary(data):
+    """한 번의 순회로 개수, 평균, 표본 표준편차, 최솟값, 최댓값 계산 (청크별 Chan 병합)"""
+    n, mean, m2 = 0, 0.0, 0.0
+    lo, hi = math.inf, -math.inf
+    for chunk in _iter_chunks(data):
+        chunk = chunk.astype(np.float64)
+        k = len(chunk)
+        chunk_mean = chunk.mean()
+        chunk_m2 = np.square(chunk - chunk_mean).sum()
+        delta = chunk_mean - mean
+        total = n + k
+        mean += delta * k / total
+        m2 += chunk_m2 + delta * delta * n * k / total
+        n = total
+        lo = min(lo, float(chunk.min()))
+        hi = max(hi, float(chunk.max()))
+    if n < 2:
+        raise ValueError('KDE에는 2개 이상의 데이터가 필요합니다')
+    return n, mean, math.sqrt(m2 / (n - 1)), lo, hi
+
+def _bandwidth(n, std, bw_method):
+    """커널 대역폭 (scipy gaussian_kde와 같은 규칙: factor * 표본 표준편차)"""
+    if bw_method == 'scott':
+        factor = n ** (-1. / 5)
+    elif bw_method == 'silverman':
+        factor = (n * 3 / 4.) ** (-1. / 5)
+    else:
+        factor = float(bw_method)
+    return factor * std
+
+def _linear_binning(data, lo, delta, num_bins):
+    """선형 구간화: 각 점의 가중치를 인접한 두 격자점에 거리 비율로 분배"""
+    grid_counts = np.zeros(num_bins + 1)
+    for chunk in _iter_chunks(data):
+        pos = (chunk.astype(np.float64) - lo) / delta
+        idx = np.clip(np.floor(pos).astype(np.int64), 0, num_bins - 1)
+        frac = pos - idx
+        grid_counts += np.bincount(idx, weights=1.0 - frac, minlength=num_bins + 1)
+        grid_counts += np.bincount(idx + 1, weights=frac, minlength=num_bins + 1)
+    return grid_counts
+
+def _fft_smooth(grid_counts, delta, bw):
+    """격자 개수와 Gaussian 커널의 FFT 합성곱"""
+    m = len(grid_counts)
+    # 커널은 ±5 대역폭까지만 (그 밖은 1e-6 미만)
+    half = min(m - 1, int(math.ceil(5 * bw / delta)))
+    offsets = np.arange(-half, half + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2)
+    size = 1 << int(math.ceil(math.log2(m + len(kernel) - 1)))
+    smoothed = np.fft.irfft(np.fft.rfft(grid_counts, size) * np.fft.rfft(kernel, size), size)
+    return smoothed[half:half + m]
+
+def _summary_from_counts(values, counts):
+    """값별 개수로부터 개수, 평균, 표본 표준편차, 최솟값, 최댓값 계산"""
+    n = int(counts.sum())
+    if n < 2:
+        raise ValueError('KDE에는 2개 이상의 데이터가 필요합니다')
+    mean = float(values @ counts) / n
+    m2 = float(np.square(values - mean) @ counts)
+    return n, mean, math.sqrt(m2 / (n - 1)), float(values[0]), float(values[-1])
+
+def _prepare(data, decimals):
+    """요약 통계 (+ 양자화 시 값별 개수)를 한 번의 순회로 준비"""
+    if decimals is not None:
+        values, counts = quantized_counts(data, decimals)
+        return _summary_from_counts(values, counts), (values, counts)
+    return _data_summary(data), None
+
+def _density(data, coords, bw_method, num_bins, summary, quantized):
+    """준비된 요약/개수로 coords 위치의 밀도 계산"""
+    n, _, std, lo, hi = summary
+    bw = _bandwidth(n, std, bw_method)
+    norm = n * bw * math.sqrt(2 * math.pi)
+
+    if quantized is not None:
+        # 값 종류가 적으므로 (2자리 점수는 최대 101개) 값 x 격자 직접 합산
+        values, counts = quantized
+        z = (coords[:, None] - values[None, :]) / bw
+        return np.exp(-0.5 * z * z) @ counts / norm
+
+    # 격자는 데이터 범위와 평가 위치를 모두 포함
+    grid_lo = min(lo, coords.min())
+    grid_hi = max(hi, coords.max())
+    delta = (grid_hi - grid_lo) / num_bins if grid_hi > grid_lo else 1.0
+    grid_counts = _linear_binning(data, grid_lo, delta, num_bins)
+    density = _fft_smooth(grid_counts, delta, bw) / norm
+    grid = grid_lo + np.arange(num_bins + 1) * delta
+    return np.interp(coords, grid, density)
+
+def kde_density(data, coords, bw_method='scott', decimals=None, num_bins=2048):
+    """coords 위치의 Gaussian KDE 밀도 (구간화 후 커널 합성곱, 비용은 데이터 크기에 선형인 구간화뿐)
+
+    decimals 지정 시 양자화된 점수의 정확한 값별 개수로 계산하므로 정확한 KDE와 같음.
+    지정하지 않으면 num_bins개 격자에 선형 구간화 후 FFT 합성곱 (격자 간격의 제곱 수준 오차).
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    summary, quantized = _prepare(data, decimals)
+    return _density(data, coords, bw_method, num_bins, summary, quantized)
+
+def fast_kde(data, gridsize=200, cut=3, bw_method='scott', decimals=None, num_bins=2048):
+    """밀도 곡선 (격자, 밀도) 계산 - seaborn kdeplot 기본값과 같은 범위 (최솟값/최댓값 ± cut * 대역폭)"""
+    summary, quantized = _prepare(data, decimals)
+    n, _, std, lo, hi = summary
+    bw = _bandwidth(n, std, bw_method)
+    grid = np.linspace(lo - cut * bw, hi + cut * bw, gridsize)
+    return grid, _density(data, grid, bw_method, num_bins, summary, quantized)
@@ -1,44 +1,115 @@
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
+import numpy as np
+import argparse
+import os
+
+from batch_mode import enable_batch_mode, finish_figure, report_peak_memory
+from scatter_decimation import reduced_scatter
+from score_io import load_scores
+from tracing import enable_tracing, save_trace, span, traced
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['axes.unicode_minus'] = False
 
-def main():
+# 기본 점수 파일 (.npy 또는 쿼리 ID가 있는 .scores 열 형식 디렉터리)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_BASELINE = os.path.join(DATA_DIR, 'baseline_scores.npy')
+DEFAULT_PROPOSED = os.path.join(DATA_DIR, 'proposed_scores.npy')
+
+def load_query_scores(path):
+    """점수 파일을 메모리 매핑으로 열어 (x축 쿼리 번호, 점수) 반환"""
+    query_ids, scores = load_scores(path)
+    if query_ids is None:
+        # 쿼리 ID가 없으면 1부터 순서대로
+        query_ids = np.arange(1, len(scores) + 1)
+    return query_ids, scores
+
+# 고정 y축 범위
+Y_RANGE = (0.1, 1.0)
+
+def draw_scores(ax, x, y, reduce=False, cell_px=None):
+    """쿼리 번호 x 점수 산점도 (reduce=True면 축 영역의 칸마다 점 하나만 그림)"""
+    style = dict(color="black", marker="o", s=8)
+    with span('scatter', cat='artists', reduce=reduce):
+        if not reduce:
+            ax.scatter(x, y, **style)
+            return len(y)
+        _, drawn = reduced_scatter(ax, x, y, Y_RANGE, cell_px=cell_px, **style)
+        return drawn
+
+@traced(name='query_scatter')
+def main(baseline=DEFAULT_BASELINE, proposed=DEFAULT_PROPOSED, output=None, reduce=False, cell_px=None):
     # Baseline 데이터 (SBERT + CE)
-    y_baseline = [0.91, 0.86, 0.91, 0.85, 0.49, 0.92, 0.92, 0.85, 0.91, 0.89, 0.65, 0.49, 0.91, 0.49, 0.85, 0.89, 0.86, 0.69, 0.49, 0.86, 0.89, 0.73, 0.89, 0.89, 0.65, 0.86, 0.91, 0.49, 0.69, 0.49, 0.65, 0.92, 0.92, 0.89, 0.92, 0.92, 0.49, 0.73, 0.89, 0.82, 0.89, 0.82, 0.86, 0.82, 0.49, 0.65, 0.69, 0.85, 0.85, 0.65, 0.69, 0.89, 0.92, 0.92, 0.69, 0.91, 0.89, 0.49, 0.89, 0.86, 0.86, 0.49, 0.91, 0.89, 0.92, 0.92, 0.89, 0.86, 0.73, 0.91, 0.49, 0.86, 0.65, 0.65, 0.73, 0.89, 0.91, 0.65, 0.82, 0.49, 0.73, 0.85, 0.89, 0.65, 0.82, 0.92, 0.92, 0.82, 0.69, 0.86, 0.85, 0.82, 0.82, 0.89, 0.65, 0.65, 0.85, 0.85, 0.91, 0.69, 0.92, 0.92, 0.86, 0.89, 0.49, 0.85, 0.92, 0.92, 0.82, 0.73, 0.89, 0.86, 0.65, 0.69, 0.91, 0.49, 0.65, 0.82, 0.65, 0.86, 0.85, 0.91, 0.91, 0.91, 0.49, 0.82, 0.69, 0.49, 0.49, 0.85, 0.85, 0.85, 0.91, 0.65, 0.49, 0.91, 0.85, 0.69, 0.49, 0.86, 0.91, 0.86, 0.91, 0.89, 0.65, 0.73, 0.85, 0.69, 0.69, 0.86, 0.65, 0.86, 0.92, 0.92, 0.85, 0.91, 0.69, 0.85, 0.89, 0.82, 0.91, 0.89, 0.65, 0.73, 0.89, 0.65, 0.69, 0.91, 0.91, 0.85, 0.86, 0.86, 0.69, 0.49, 0.73, 0.73, 0.89, 0.65, 0.82, 0.85, 0.73, 0.65, 0.86, 0.82, 0.86, 0.69, 0.69, 0.49, 0.91, 0.49, 0.85, 0.91, 0.49, 0.69, 0.89, 0.89, 0.82, 0.73, 0.86, 0.82, 0.69, 0.86, 0.86, 0.91, 0.89, 0.73, 0.89, 0.85, 0.89, 0.49, 0.49, 0.73, 0.89, 0.49, 0.49, 0.86, 0.85, 0.82, 0.69, 0.65, 0.65, 0.65, 0.69, 0.92, 0.92, 0.91, 0.65, 0.49, 0.85, 0.89, 0.49, 0.92, 0.92, 0.86, 0.86, 0.92, 0.92, 0.69, 0.49, 0.49, 0.86, 0.89, 0.73, 0.82, 0.82, 0.89, 0.82, 0.82, 0.92, 0.92, 0.89, 0.65, 0.73, 0.89, 0.86, 0.91, 0.89, 0.92, 0.92, 0.49, 0.86, 0.73, 0.82, 0.89, 0.82, 0.73, 0.73, 0.82, 0.49, 0.92, 0.92, 0.69, 0.86, 0.85, 0.86, 0.92, 0.92, 0.69, 0.89, 0.91, 0.86, 0.69, 0.86, 0.85, 0.89, 0.85, 0.92, 0.92, 0.86, 0.89, 0.49, 0.89, 0.82, 0.49, 0.86, 0.69, 0.73, 0.49, 0.86, 0.49, 0.89, 0.65, 0.49, 0.49, 0.69, 0.89, 0.82, 0.65, 0.86, 0.86, 0.65, 0.82, 0.91, 0.82, 0.65, 0.49, 0.85, 0.73, 0.86, 0.73, 0.86, 0.49, 0.69, 0.69, 0.73, 0.73, 0.49, 0.86, 0.85, 0.69, 0.86, 0.65, 0.92, 0.92, 0.85, 0.86, 0.92, 0.92, 0.91, 0.82, 0.89, 0.82, 0.65, 0.86, 0.49, 0.82, 0.49, 0.73, 0.65, 0.69, 0.86, 0.85, 0.65, 0.86, 0.49, 0.65, 0.86, 0.92, 0.92, 0.91, 0.86, 0.85, 0.85, 0.91, 0.82, 0.82, 0.49, 0.86, 0.49, 0.82, 0.82, 0.69, 0.73, 0.85, 0.89, 0.49, 0.65, 0.92, 0.92, 0.65, 0.92, 0.92, 0.73, 0.65, 0.49, 0.69, 0.86, 0.82, 0.49, 0.89, 0.86, 0.92, 0.92, 0.85, 0.65, 0.85, 0.69, 0.69, 0.65, 0.82, 0.69, 0.92, 0.92, 0.65, 0.91, 0.69, 0.92, 0.92, 0.91, 0.69, 0.85, 0.65, 0.82, 0.65, 0.82, 0.69, 0.92, 0.92, 0.49, 0.86, 0.89, 0.82, 0.65, 0.65, 0.82, 0.92, 0.92, 0.82, 0.69, 0.92, 0.92, 0.85, 0.89, 0.89, 0.82, 0.92, 0.92, 0.92, 0.92, 0.91, 0.86, 0.65, 0.65, 0.82, 0.73, 0.91, 0.89, 0.86, 0.49, 0.92, 0.92, 0.82, 0.92, 0.92, 0.86, 0.89, 0.86, 0.49, 0.73, 0.91, 0.89, 0.69, 0.69, 0.86, 0.85, 0.73, 0.92, 0.92, 0.65, 0.69, 0.73, 0.49, 0.92, 0.92, 0.86, 0.89, 0.92, 0.92, 0.73, 0.86, 0.65, 0.82, 0.85, 0.82, 0.73, 0.89, 0.89, 0.86, 0.73, 0.91, 0.82, 0.65, 0.85, 0.91, 0.86, 0.89, 0.49, 0.82, 0.86, 0.91, 0.91, 0.86, 0.85, 0.91, 0.82, 0.89, 0.89, 0.86, 0.82, 0.85, 0.89, 0.49, 0.86, 0.73, 0.82, 0.82, 0.86, 0.91, 0.85, 0.69, 0.73, 0.49, 0.89, 0.92, 0.92, 0.69, 0.89, 0.69, 0.49, 0.65, 0.92, 0.92, 0.49, 0.92, 0.92, 0.69, 0.49, 0.65, 0.92, 0.92, 0.86, 0.49, 0.73, 0.49, 0.91, 0.82, 0.69, 0.69, 0.85, 0.89, 0.65, 0.82, 0.86, 0.91, 0.85, 0.92, 0.92, 0.92, 0.92, 0.86, 0.69, 0.73, 0.49, 0.65, 0.92, 0.92, 0.89, 0.92, 0.92, 0.85, 0.82, 0.92, 0.92, 0.65, 0.73, 0.82, 0.86, 0.85, 0.92, 0.92, 0.82, 0.91, 0.85, 0.86, 0.73, 0.92, 0.92, 0.69, 0.92, 0.92, 0.73, 0.89, 0.49, 0.92, 0.92, 0.92, 0.92, 0.86, 0.92, 0.92, 0.89, 0.89, 0.86, 0.92, 0.92, 0.49, 0.86, 0.49, 0.49, 0.73, 0.73, 0.89, 0.65, 0.49, 0.92, 0.92, 0.65, 0.91, 0.91, 0.86, 0.85, 0.49, 0.49, 0.91, 0.86, 0.86, 0.82, 0.85, 0.89, 0.92, 0.92, 0.82, 0.86, 0.82, 0.69, 0.82, 0.73, 0.91, 0.85, 0.86, 0.91, 0.73, 0.69, 0.69, 0.49, 0.85, 0.91, 0.82, 0.69, 0.86, 0.73, 0.82, 0.91, 0.49, 0.82, 0.92, 0.92, 0.86, 0.89, 0.82, 0.89, 0.49, 0.89, 0.89, 0.92, 0.92, 0.85, 0.73, 0.92, 0.92, 0.69, 0.69, 0.85, 0.73, 0.49, 0.73, 0.92, 0.92, 0.92, 0.92, 0.73, 0.85, 0.73, 0.91, 0.85, 0.82, 0.91, 0.89, 0.86, 0.49, 0.65, 0.49, 0.92, 0.92, 0.91, 0.89, 0.92, 0.92, 0.73, 0.86, 0.92, 0.92, 0.92, 0.92, 0.86, 0.89, 0.49, 0.89, 0.49, 0.91, 0.91, 0.86, 0.91, 0.85, 0.49, 0.92, 0.92, 0.85, 0.91, 0.89, 0.65, 0.49, 0.91, 0.49, 0.85, 0.89, 0.86, 0.69, 0.49, 0.86, 0.89, 0.73, 0.89, 0.89, 0.65, 0.86, 0.91, 0.49, 0.69, 0.49, 0.65, 0.92, 0.92, 0.89, 0.92, 0.92, 0.49, 0.73, 0.89, 0.82, 0.89, 0.82, 0.86, 0.82, 0.49, 0.65, 0.69, 0.85, 0.85, 0.65, 0.69, 0.89, 0.92, 0.92, 0.69, 0.91, 0.89, 0.49, 0.89, 0.86, 0.86, 0.49, 0.91, 0.89, 0.92, 0.92, 0.89, 0.86, 0.73, 0.91, 0.49, 0.86, 0.65, 0.65, 0.73, 0.89, 0.91, 0.65, 0.82, 0.49, 0.73, 0.85, 0.89, 0.65, 0.82, 0.92, 0.92, 0.82, 0.69, 0.86, 0.85, 0.82, 0.82, 0.89, 0.65, 0.65, 0.85, 0.85, 0.91, 0.69, 0.92, 0.92, 0.86, 0.89, 0.49, 0.85, 0.92, 0.92, 0.82, 0.73, 0.89, 0.86, 0.65, 0.69, 0.91, 0.49, 0.65, 0.82, 0.65, 0.86, 0.85, 0.91, 0.91, 0.91, 0.49, 0.82, 0.69, 0.49, 0.49, 0.85, 0.85, 0.85, 0.91, 0.65, 0.49, 0.91, 0.85, 0.69, 0.49, 0.86, 0.91, 0.86, 0.91, 0.89, 0.65, 0.73, 0.85, 0.69, 0.69, 0.86, 0.65, 0.86, 0.92, 0.92, 0.85, 0.91, 0.69, 0.85, 0.89, 0.82, 0.91, 0.89, 0.65, 0.73, 0.89, 0.65, 0.69, 0.91, 0.91, 0.85, 0.86, 0.86, 0.69, 0.49, 0.73, 0.73, 0.89, 0.65, 0.82, 0.85, 0.73, 0.65, 0.86, 0.82, 0.86, 0.69, 0.69, 0.49, 0.91, 0.49, 0.85, 0.91, 0.49, 0.69, 0.89, 0.89, 0.82, 0.73, 0.86, 0.82, 0.69, 0.86, 0.86, 0.91, 0.89, 0.73, 0.89, 0.85, 0.89, 0.49, 0.49, 0.73, 0.89, 0.49, 0.49, 0.86, 0.85, 0.82, 0.69, 0.65, 0.65, 0.65, 0.69, 0.92, 0.92, 0.91, 0.65, 0.49, 0.85, 0.89, 0.49, 0.92, 0.92, 0.86, 0.86, 0.92, 0.92, 0.69, 0.49, 0.49, 0.86, 0.89, 0.73, 0.82, 0.82, 0.89, 0.82, 0.82, 0.92, 0.92, 0.89, 0.65, 0.73, 0.89, 0.86, 0.91, 0.89, 0.92, 0.92, 0.49, 0.86, 0.73, 0.82, 0.89, 0.82, 0.73, 0.73, 0.82, 0.49, 0.92, 0.92, 0.69, 0.86, 0.85, 0.86, 0.92, 0.92, 0.69, 0.89, 0.91, 0.86, 0.69, 0.86, 0.85, 0.89, 0.85, 0.92, 0.92, 0.86, 0.89]
-    
-    # Proposed 데이터 (SBERT + CE + SDE) - 예시 데이터 (실제 데이터로 교체 필요)
-    y_proposed = [0.89, 0.89, 0.92, 0.51, 0.86, 0.83, 0.89, 0.92, 0.85, 0.68, 0.73, 0.8, 0.89, 0.89, 0.68, 0.51, 0.49, 0.83, 0.92, 0.55, 0.86, 0.89, 0.91, 0.85, 0.49, 0.86, 0.92, 0.73, 0.83, 0.8, 0.55, 0.8, 0.65, 0.61, 0.55, 0.65, 0.51, 0.92, 0.68, 0.65, 0.49, 0.68, 0.86, 0.89, 0.68, 0.49, 0.51, 0.68, 0.82, 0.49, 0.91, 0.49, 0.49, 0.89, 0.54, 0.82, 0.69, 0.73, 0.55, 0.86, 0.55, 0.55, 0.49, 0.8, 0.92, 0.73, 0.73, 0.68, 0.55, 0.51, 0.68, 0.49, 0.68, 0.8, 0.68, 0.86, 0.61, 0.68, 0.82, 0.86, 0.55, 0.83, 0.68, 0.86, 0.89, 0.92, 0.82, 0.68, 0.69, 0.91, 0.51, 0.86, 0.55, 0.92, 0.61, 0.61, 0.86, 0.73, 0.92, 0.92, 0.92, 0.68, 0.92, 0.68, 0.8, 0.68, 0.49, 0.68, 0.73, 0.91, 0.73, 0.73, 0.92, 0.86, 0.82, 0.51, 0.68, 0.83, 0.51, 0.54, 0.65, 0.61, 0.61, 0.69, 0.85, 0.51, 0.83, 0.73, 0.73, 0.86, 0.49, 0.49, 0.55, 0.55, 0.61, 0.55, 0.83, 0.82, 0.68, 0.89, 0.92, 0.68, 0.82, 0.68, 0.83, 0.91, 0.92, 0.65, 0.86, 0.55, 0.8, 0.82, 0.85, 0.49, 0.73, 0.8, 0.68, 0.82, 0.68, 0.55, 0.68, 0.8, 0.55, 0.54, 0.82, 0.68, 0.86, 0.55, 0.92, 0.83, 0.92, 0.65, 0.8, 0.55, 0.92, 0.54, 0.68, 0.55, 0.92, 0.69, 0.73, 0.85, 0.89, 0.89, 0.73, 0.68, 0.89, 0.92, 0.68, 0.68, 0.83, 0.55, 0.83, 0.73, 0.55, 0.65, 0.61, 0.49, 0.68, 0.82, 0.73, 0.91, 0.92, 0.82, 0.92, 0.49, 0.55, 0.85, 0.61, 0.61, 0.8, 0.92, 0.82, 0.86, 0.8, 0.92, 0.8, 0.49, 0.65, 0.68, 0.54, 0.49, 0.73, 0.61, 0.69, 0.86, 0.92, 0.73, 0.86, 0.73, 0.92, 0.91, 0.55, 0.69, 0.69, 0.8, 0.68, 0.85, 0.68, 0.89, 0.92, 0.61, 0.92, 0.86, 0.92, 0.92, 0.61, 0.92, 0.83, 0.8, 0.61, 0.51, 0.61, 0.8, 0.89, 0.51, 0.83, 0.54, 0.55, 0.92, 0.54, 0.83, 0.69, 0.61, 0.69, 0.8, 0.65, 0.69, 0.8, 0.89, 0.73, 0.68, 0.55, 0.51, 0.55, 0.51, 0.55, 0.92, 0.49, 0.55, 0.85, 0.68, 0.68, 0.89, 0.91, 0.89, 0.65, 0.68, 0.49, 0.8, 0.85, 0.91, 0.49, 0.68, 0.51, 0.73, 0.68, 0.49, 0.83, 0.68, 0.92, 0.61, 0.55, 0.85, 0.68, 0.68, 0.54, 0.68, 0.8, 0.68, 0.73, 0.92, 0.82, 0.65, 0.69, 0.54, 0.8, 0.68, 0.55, 0.49, 0.51, 0.83, 0.69, 0.51, 0.83, 0.91, 0.68, 0.73, 0.8, 0.86, 0.68, 0.68, 0.73, 0.73, 0.86, 0.55, 0.89, 0.92, 0.55, 0.8, 0.69, 0.54, 0.61, 0.68, 0.85, 0.86, 0.82, 0.86, 0.85, 0.49, 0.8, 0.91, 0.8, 0.51, 0.91, 0.61, 0.85, 0.82, 0.65, 0.68, 0.69, 0.61, 0.68, 0.65, 0.69, 0.68, 0.86, 0.86, 0.86, 0.89, 0.92, 0.68, 0.73, 0.51, 0.89, 0.65, 0.69, 0.68, 0.8, 0.54, 0.91, 0.68, 0.8, 0.73, 0.73, 0.73, 0.69, 0.92, 0.89, 0.8, 0.51, 0.92, 0.55, 0.51, 0.68, 0.55, 0.68, 0.54, 0.55, 0.73, 0.55, 0.85, 0.82, 0.61, 0.82, 0.68, 0.69, 0.68, 0.91, 0.61, 0.69, 0.86, 0.55, 0.51, 0.73, 0.55, 0.68, 0.68, 0.86, 0.68, 0.82, 0.55, 0.68, 0.61, 0.49, 0.65, 0.55, 0.49, 0.82, 0.92, 0.83, 0.68, 0.86, 0.51, 0.69, 0.8, 0.91, 0.55, 0.92, 0.69, 0.68, 0.83, 0.68, 0.61, 0.61, 0.55, 0.82, 0.51, 0.68, 0.49, 0.85, 0.61, 0.55, 0.92, 0.51, 0.73, 0.86, 0.65, 0.69, 0.86, 0.69, 0.49, 0.68, 0.82, 0.68, 0.51, 0.83, 0.8, 0.92, 0.61, 0.68, 0.92, 0.89, 0.92, 0.55, 0.61, 0.54, 0.73, 0.61, 0.73, 0.61, 0.73, 0.51, 0.65, 0.73, 0.83, 0.8, 0.85, 0.92, 0.86, 0.68, 0.65, 0.85, 0.73, 0.91, 0.89, 0.86, 0.82, 0.68, 0.86, 0.83, 0.68, 0.61, 0.83, 0.61, 0.82, 0.92, 0.65, 0.49, 0.92, 0.82, 0.68, 0.82, 0.61, 0.68, 0.86, 0.61, 0.92, 0.65, 0.69, 0.73, 0.49, 0.68, 0.51, 0.86, 0.61, 0.83, 0.68, 0.91, 0.73, 0.85, 0.69, 0.92, 0.49, 0.92, 0.83, 0.85, 0.82, 0.73, 0.85, 0.73, 0.8, 0.51, 0.61, 0.8, 0.68, 0.89, 0.8, 0.65, 0.65, 0.65, 0.73, 0.55, 0.8, 0.82, 0.91, 0.8, 0.49, 0.8, 0.73, 0.49, 0.68, 0.83, 0.83, 0.85, 0.89, 0.68, 0.68, 0.73, 0.61, 0.92, 0.49, 0.68, 0.73, 0.92, 0.68, 0.83, 0.61, 0.92, 0.68, 0.54, 0.68, 0.8, 0.85, 0.51, 0.85, 0.91, 0.92, 0.82, 0.92, 0.54, 0.68, 0.86, 0.92, 0.49, 0.73, 0.8, 0.54, 0.55, 0.61, 0.73, 0.89, 0.86, 0.92, 0.92, 0.85, 0.92, 0.69, 0.91, 0.54, 0.49, 0.85, 0.61, 0.89, 0.65, 0.68, 0.68, 0.65, 0.73, 0.92, 0.68, 0.68, 0.55, 0.92, 0.92, 0.73, 0.83, 0.54, 0.8, 0.86, 0.82, 0.54, 0.89, 0.86, 0.91, 0.69, 0.83, 0.54, 0.86, 0.89, 0.61, 0.83, 0.89, 0.55, 0.92, 0.82, 0.73, 0.55, 0.61, 0.86, 0.82, 0.69, 0.68, 0.73, 0.55, 0.85, 0.49, 0.92, 0.65, 0.65, 0.92, 0.65, 0.89, 0.92, 0.85, 0.85, 0.61, 0.54, 0.86, 0.82, 0.8, 0.68, 0.68, 0.54, 0.49, 0.8, 0.68, 0.49, 0.92, 0.55, 0.8, 0.89, 0.82, 0.68, 0.73, 0.92, 0.51, 0.54, 0.86, 0.65, 0.68, 0.89, 0.68, 0.49, 0.91, 0.54, 0.83, 0.55, 0.61, 0.65, 0.82, 0.61, 0.89, 0.49, 0.92, 0.55, 0.68, 0.92, 0.49, 0.55, 0.68, 0.55, 0.91, 0.51, 0.8, 0.54, 0.49, 0.73, 0.83, 0.68, 0.83, 0.91, 0.69, 0.8, 0.49, 0.92, 0.73, 0.68, 0.85, 0.65, 0.8, 0.89, 0.8, 0.89, 0.92, 0.49, 0.91, 0.92, 0.89, 0.68, 0.55, 0.92, 0.61, 0.89, 0.61, 0.68, 0.65, 0.86, 0.8, 0.61, 0.8, 0.73, 0.92, 0.65, 0.55, 0.92, 0.61, 0.8, 0.68, 0.54, 0.68, 0.85, 0.68, 0.73, 0.8, 0.92, 0.8, 0.69, 0.55, 0.68, 0.54, 0.92, 0.55, 0.73, 0.55, 0.8, 0.91, 0.69, 0.55, 0.83, 0.68, 0.55, 0.86, 0.92, 0.61, 0.65, 0.8, 0.85, 0.55, 0.61, 0.89, 0.49, 0.69, 0.55, 0.69, 0.83, 0.55, 0.83, 0.65, 0.8, 0.91, 0.54, 0.86, 0.54, 0.82, 0.68, 0.73, 0.86, 0.91, 0.86, 0.8, 0.89, 0.61, 0.49, 0.91, 0.68, 0.68, 0.73, 0.69, 0.92, 0.82, 0.54, 0.92, 0.54, 0.85, 0.83, 0.65, 0.83, 0.55, 0.82, 0.65, 0.91, 0.83, 0.85, 0.89, 0.83, 0.49, 0.68, 0.73, 0.91, 0.8, 0.55, 0.82, 0.89, 0.68, 0.91, 0.82, 0.89, 0.69, 0.86, 0.69, 0.73, 0.68, 0.68, 0.85, 0.55, 0.91, 0.49, 0.85, 0.8, 0.8, 0.65, 0.65, 0.68, 0.69, 0.83, 0.86, 0.55, 0.86, 0.83, 0.49, 0.65, 0.91, 0.83, 0.83, 0.68, 0.69, 0.82, 0.92, 0.82, 0.89, 0.92, 0.8, 0.68, 0.68, 0.82, 0.65, 0.65, 0.55, 0.68, 0.73, 0.73, 0.55, 0.49, 0.89, 0.55, 0.68, 0.65, 0.68, 0.54, 0.55, 0.86, 0.82, 0.89, 0.92, 0.73, 0.85, 0.89, 0.89, 0.49, 0.68, 0.73, 0.82, 0.68, 0.54, 0.92, 0.49, 0.83, 0.86, 0.68, 0.68, 0.55, 0.55, 0.89, 0.83, 0.91, 0.49, 0.68, 0.49, 0.8, 0.68, 0.89, 0.73, 0.54, 0.69, 0.61, 0.86, 0.51, 0.91, 0.61, 0.86, 0.83, 0.85, 0.73, 0.51, 0.83, 0.61, 0.86, 0.49, 0.82, 0.73, 0.8, 0.68, 0.91, 0.61, 0.89, 0.55, 0.65, 0.91, 0.92, 0.89, 0.73, 0.92, 0.8, 0.86, 0.61, 0.83, 0.51, 0.55, 0.86, 0.51, 0.55, 0.55, 0.55, 0.49, 0.69, 0.89, 0.92, 0.86, 0.54, 0.91, 0.92, 0.86, 0.61, 0.82, 0.55, 0.92, 0.65, 0.8, 0.73, 0.91, 0.54, 0.49, 0.49, 0.73, 0.8, 0.8, 0.68, 0.82, 0.51]
+    x_baseline, y_baseline = load_query_scores(baseline)
     
-    # 각 데이터의 길이에 맞춰 x축을 동적으로 생성 (1부터 시작)
-    x_baseline = list(range(1, len(y_baseline) + 1))
-    x_proposed = list(range(1, len(y_proposed) + 1))
+    # Proposed 데이터 (SBERT + CE + SDE)
+    x_proposed, y_proposed = load_query_scores(proposed)
 
     # 두 개의 서브플롯 생성 (1행 2열)
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
     
     # 첫 번째 그래프 (Baseline)
-    ax1.scatter(x_baseline, y_baseline, color="black", marker="o", s=8)
+    drawn_baseline = draw_scores(ax1, x_baseline, y_baseline, reduce, cell_px)
     ax1.set_xlabel("Query Number")
     ax1.set_ylabel("Similarity Score")
     ax1.set_title("SBERT + CE (Baseline)")
-    ax1.set_ylim(0.1, 1.0)
+    ax1.set_ylim(*Y_RANGE)
     ax1.grid(True, linestyle="--", alpha=0.6)
     
     # 두 번째 그래프 (Proposed)
-    ax2.scatter(x_proposed, y_proposed, color="black", marker="o", s=8)
+    drawn_proposed = draw_scores(ax2, x_proposed, y_proposed, reduce, cell_px)
     ax2.set_xlabel("Query Number")
     ax2.set_ylabel("Similarity Score")
     ax2.set_title("SBERT + CE + SDE (Proposed)")
-    ax2.set_ylim(0.1, 1.0)
+    ax2.set_ylim(*Y_RANGE)
     ax2.grid(True, linestyle="--", alpha=0.6)
     
-    # 레이아웃 조정
-    plt.tight_layout()
-    plt.show()
+    if reduce:
+        print(f"축소 렌더링: Baseline {drawn_baseline:,}/{len(y_baseline):,}점, "
+              f"Proposed {drawn_proposed:,}/{len(y_proposed):,}점")
+    
+    # 레이아웃 조정 후 저장/표시, 그림 해제
+    finish_figure(fig, output)
+
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='쿼리별 유사도 점수 산점도')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline 점수 파일 (.npy 또는 .scores 디렉터리, 기본값: data/baseline_scores.npy)')
+    parser.add_argument('--proposed', default=DEFAULT_PROPOSED,
+                        help='Proposed 점수 파일 (.npy 또는 .scores 디렉터리, 기본값: data/proposed_scores.npy)')
+    parser.add_argument('--output', default=None,
+                        help='저장할 이미지 경로 (배치 모드 기본값: query_scatter.png)')
+    parser.add_argument('--reduce', action='store_true',
+                        help='대용량용 축소 렌더링: 축 영역의 칸마다 점 하나만 그림 (위치 오차 1칸 미만)')
+    parser.add_argument('--cell-px', type=float, default=None,
+                        help='축소 렌더링 칸 크기 (출력 픽셀 단위, 기본값: 마커 지름의 1/4)')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='plot/단계별 span(벽시계/CPU 시간, 최대 RSS 증가량)을 Chrome trace JSON으로 저장')
+    parser.add_argument('--batch', action='store_true',
+                        help='배치 모드: 비대화형 백엔드 사용, plt.show() 생략, 최대 메모리 보고')
+    return parser.parse_args(argv)
+
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    if args.batch:
+        enable_batch_mode()
+        # 배치 모드에서는 화면에 띄우지 않으므로 항상 파일로 저장
+        args.output = args.output or 'query_scatter.png'
+    if args.trace:
+        enable_tracing()
+    main(args.baseline, args.proposed, args.output, args.reduce, args.cell_px)
+    if args.trace:
+        save_trace(args.trace)
+    if args.batch:
+        report_peak_memory()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(run())
@@ -0,0 +1,119 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+# 범주 열 (문자열 -> 정수 코드)과 값 열
+KEY_COLUMNS = ('dataset', 'method', 'metric')
+VALUE_COLUMN = 'value'
+# 데이터셋 열이 없는 기록에 쓰는 이름
+DEFAULT_DATASET = 'default'
+
+def _factorize(labels):
+    """문자열 목록 -> (처음 나온 순서의 고유값 목록, 정수 코드 배열)"""
+    labels = np.asarray(labels, dtype=object).astype(str)
+    if len(labels) == 0:
+        return [], np.zeros(0, dtype=np.int64)
+    uniques, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    # np.unique는 정렬 순서이므로 파일에 처음 나온 순서로 다시 번호를 매김
+    order = np.argsort(first, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return [str(uniques[i]) for i in order], rank[inverse.reshape(-1)]
+
+def _iter_records(path):
+    """JSONL/CSV 기록을 (dataset, method, metric, value)로 순회
+
+    long 형식 기록 {dataset, method, metric, value} 외에
+    wide 형식 기록 {dataset, method, <지표 이름>: 값, ...}도 지표별로 펼쳐서 읽음.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    for row in rows:
+        dataset = row.get('dataset') or DEFAULT_DATASET
+        method = row['method']
+        if 'metric' in row:
+            yield dataset, method, row['metric'], float(row[VALUE_COLUMN])
+            continue
+        for key, value in row.items():
+            if key in KEY_COLUMNS or value in (None, ''):
+                continue
+            yield dataset, method, key, float(value)
+
+class MetricsTable:
+    """실험 결과 long 형식 표 (dataset, method, metric, value)
+
+    범주 열은 정수 코드로 저장하고, 피벗은 코드로 평탄화한 인덱스에
+    bincount로 집계하므로 크기가 커져도 칸별 Python 반복이 없음.
+    """
+
+    def __init__(self, levels, codes, values):
+        self.levels = levels
+        self.codes = codes
+        self.values = np.asarray(values, dtype=np.float64)
+
+    @classmethod
+    def from_records(cls, records):
+        """(dataset, method, metric, value) 목록으로 생성"""
+        records = list(records)
+        columns = list(zip(*records)) if records else [[]] * 4
+        levels, codes = {}, {}
+        for name, labels in zip(KEY_COLUMNS, columns[:3]):
+            levels[name], codes[name] = _factorize(labels)
+        return cls(levels, codes, np.asarray(columns[3], dtype=np.float64))
+
+    @classmethod
+    def from_file(cls, path):
+        """JSONL(.jsonl/.json) 또는 CSV(.csv) 파일에서 읽기"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'실험 결과 파일이 없습니다: {path}')
+        return cls.from_records(_iter_records(path))
+
+    @classmethod
+    def from_wide_frame(cls, df, dataset=DEFAULT_DATASET, metric_column='Metric', methods=None):
+        """create_performance_data() 형식(지표 행 x 방법 열)의 DataFrame을 long 형식으로 변환"""
+        methods = list(methods or [c for c in df.columns if c != metric_column])
+        matrix = df[methods].to_numpy(dtype=np.float64)
+        metrics = df[metric_column].astype(str).tolist()
+        levels = {'dataset': [dataset], 'method': methods, 'metric': metrics}
+        metric_codes, method_codes = np.indices(matrix.shape)
+        codes = {'dataset': np.zeros(matrix.size, dtype=np.int64),
+                 'method': method_codes.reshape(-1), 'metric': metric_codes.reshape(-1)}
+        return cls(levels, codes, matrix.reshape(-1))
+
+    def __len__(self):
+        return len(self.values)
+
+    def select(self, **filters):
+        """범주 값으로 행 선택 (예: select(dataset='fiqa')) - 코드 비교 한 번으로 마스크 생성"""
+        mask = np.ones(len(self), dtype=bool)
+        for name, label in filters.items():
+            if label is None:
+                continue
+            if label not in self.levels[name]:
+                raise KeyError(f'{name}에 {label!r}이(가) 없습니다 (가능한 값: {", ".join(self.levels[name])})')
+            mask &= self.codes[name] == self.levels[name].index(label)
+        codes = {name: code[mask] for name, code in self.codes.items()}
+        return MetricsTable(self.levels, codes, self.values[mask])
+
+    def pivot(self, index='metric', columns='method', aggfunc='mean'):
+        """(행 라벨, 열 라벨, 행렬) 피벗 - 같은 칸의 여러 값은 평균(mean) 또는 합(sum), 빈 칸은 NaN"""
+        row_labels, col_labels = self.levels[index], self.levels[columns]
+        n_rows, n_cols = len(row_labels), len(col_labels)
+        flat = self.codes[index] * n_cols + self.codes[columns]
+        sums = np.bincount(flat, weights=self.values, minlength=n_rows * n_cols)
+        counts = np.bincount(flat, minlength=n_rows * n_cols)
+        if aggfunc == 'sum':
+            matrix = np.where(counts > 0, sums, np.nan)
+        elif aggfunc == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                matrix = np.where(counts > 0, sums / counts, np.nan)
+        else:
+            raise ValueError(f'지원하지 않는 집계 방식: {aggfunc} (mean, sum)')
+        return row_labels, col_labels, matrix.reshape(n_rows, n_cols)
@@ -0,0 +1,274 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import argparse
+from matplotlib.colors import LogNorm
+
+from batch_mode import enable_batch_mode, finish_figure, report_peak_memory
+from main import DEFAULT_BASELINE, DEFAULT_PROPOSED, load_query_scores
+from tracing import enable_tracing, save_trace, span, traced
+
+# 한글 폰트 설정
+plt.rcParams['font.family'] = 'DejaVu Sans'
+plt.rcParams['axes.unicode_minus'] = False
+
+# 한 번에 모아 읽어 누적할 쿼리 수 (메모리는 청크 + 격자 크기로 제한)
+CHUNK_SIZE = 1 << 20
+# 점수/차이는 0.01 단위 칸으로 집계 (점수 0.00-1.00 -> 101칸, 차이 -1.00-+1.00 -> 201칸)
+SCORE_LEVELS = 101
+DELTA_LEVELS = 201
+# 정수 ID 범위가 쿼리 수의 이 배수 이하면 정렬 대신 직접 주소 위치표(해시 인덱스) 사용
+DENSE_INDEX_RATIO = 4
+# 콘솔 보고에 나열할 누락/중복 쿼리 ID 수
+MAX_REPORTED_IDS = 10
+
+def _duplicate_ids(sorted_ids):
+    """정렬된 ID 배열에서 두 번 이상 나온 ID (각 한 번씩)"""
+    repeated = sorted_ids[1:][sorted_ids[1:] == sorted_ids[:-1]]
+    if len(repeated):
+        repeated = repeated[np.concatenate([[True], repeated[1:] != repeated[:-1]])]
+    return repeated
+
+def _sorted_index(ids):
+    """쿼리 ID -> (정렬된 고유 ID, 각 ID의 첫 행 위치, 중복된 ID) - 정렬 키 인덱스
+
+    이미 증가 순서면 정렬을 생략 (O(n) 확인). 중복 ID는 파일에서 처음 나온 행만 사용
+    (불안정 정렬 후 같은 ID 구간마다 최소 행 위치).
+    """
+    ids = np.asarray(ids).reshape(-1)
+    if len(ids) < 2 or np.all(ids[1:] > ids[:-1]):
+        return ids, np.arange(len(ids)), ids[:0]
+    order = np.argsort(ids)
+    sorted_ids = ids[order]
+    starts = np.flatnonzero(np.concatenate([[True], sorted_ids[1:] != sorted_ids[:-1]]))
+    return sorted_ids[starts], np.minimum.reduceat(order, starts), _duplicate_ids(sorted_ids)
+
+def _position_table(ids, lo, id_span):
+    """정수 ID -> 직접 주소 위치표 (칸 = ID - lo, 값 = 첫 행 위치, 없으면 -1)와 중복된 ID"""
+    offsets = (np.asarray(ids).reshape(-1) - lo).astype(np.int64)
+    table = np.full(id_span, len(offsets), dtype=np.int64)
+    np.minimum.at(table, offsets, np.arange(len(offsets)))
+    table[table == len(offsets)] = -1
+    counts = np.bincount(offsets, minlength=id_span)
+    return table, np.flatnonzero(counts > 1) + lo
+
+@traced(name='query_join', cat='data')
+def join_query_ids(ids_a, ids_b):
+    """두 쿼리 ID 배열의 조인 (파이썬 dict 없이 벡터화)
+
+    범위가 좁은 정수 ID(전체 범위 <= DENSE_INDEX_RATIO x 행 수)는 직접 주소 위치표(해시 인덱스)로 O(n),
+    그 외에는 정렬 키 인덱스 + searchsorted.
+    반환값: {'query_ids': 공통 ID (오름차순), 'index_a'/'index_b': 각 배열에서의 행 위치,
+             'only_a'/'only_b': 한쪽에만 있는 ID, 'duplicates_a'/'duplicates_b': 중복된 ID}
+    """
+    ids_a, ids_b = np.asarray(ids_a).reshape(-1), np.asarray(ids_b).reshape(-1)
+    empty = ids_a[:0]
+    if (len(ids_a) == len(ids_b) and (len(ids_a) < 2 or np.all(ids_a[1:] > ids_a[:-1]))
+            and np.array_equal(ids_a, ids_b)):
+        # 같은 증가 순서의 쿼리 (가장 흔한 경우, .npy 점수 포함): 행끼리 바로 대응
+        rows = np.arange(len(ids_a))
+        return {'query_ids': ids_a, 'index_a': rows, 'index_b': rows, 'only_a': empty, 'only_b': empty,
+                'duplicates_a': empty, 'duplicates_b': empty}
+    if len(ids_a) and len(ids_b) and ids_a.dtype.kind in 'iu' and ids_b.dtype.kind in 'iu':
+        lo = min(int(ids_a.min()), int(ids_b.min()))
+        id_span = max(int(ids_a.max()), int(ids_b.max())) - lo + 1
+        if id_span <= DENSE_INDEX_RATIO * (len(ids_a) + len(ids_b)):
+            table_a, duplicates_a = _position_table(ids_a, lo, id_span)
+            table_b, duplicates_b = _position_table(ids_b, lo, id_span)
+            in_a, in_b = table_a >= 0, table_b >= 0
+            matched = np.flatnonzero(in_a & in_b)
+            return {
+                'query_ids': (matched + lo).astype(ids_a.dtype),
+                'index_a': table_a[matched],
+                'index_b': table_b[matched],
+                'only_a': (np.flatnonzero(in_a & ~in_b) + lo).astype(ids_a.dtype),
+                'only_b': (np.flatnonzero(in_b & ~in_a) + lo).astype(ids_b.dtype),
+                'duplicates_a': duplicates_a.astype(ids_a.dtype),
+                'duplicates_b': duplicates_b.astype(ids_b.dtype),
+            }
+
+    keys_a, pos_a, duplicates_a = _sorted_index(ids_a)
+    keys_b, pos_b, duplicates_b = _sorted_index(ids_b)
+    if len(keys_a) == len(keys_b) and np.array_equal(keys_a, keys_b):
+        # 순서만 다른 같은 쿼리 집합: 탐색 생략
+        found = np.ones(len(keys_a), dtype=bool)
+        loc = np.arange(len(keys_b))
+    elif len(keys_b):
+        loc = np.searchsorted(keys_b, keys_a)
+        found = keys_b[np.minimum(loc, len(keys_b) - 1)] == keys_a
+    else:
+        loc, found = np.zeros(len(keys_a), dtype=np.int64), np.zeros(len(keys_a), dtype=bool)
+    matched_b = np.zeros(len(keys_b), dtype=bool)
+    matched_b[loc[found]] = True
+    return {
+        'query_ids': keys_a[found],
+        'index_a': pos_a[found],
+        'index_b': pos_b[loc[found]],
+        'only_a': keys_a[~found],
+        'only_b': keys_b[~matched_b],
+        'duplicates_a': duplicates_a if len(duplicates_a) else empty,
+        'duplicates_b': duplicates_b if len(duplicates_b) else empty,
+    }
+
+def _take(scores, index):
+    """행 위치로 점수 모으기 (위치가 연속 구간이면 슬라이스로 읽어 복사 최소화)"""
+    if len(index) and index[-1] - index[0] == len(index) - 1 and np.all(np.diff(index) == 1):
+        return np.asarray(scores[index[0]:index[-1] + 1], dtype=np.float64)
+    return np.asarray(scores[index], dtype=np.float64)
+
+@traced(name='paired_stats', cat='stats')
+def paired_analysis(baseline, proposed, join, tie_margin=0.0, chunk_size=CHUNK_SIZE):
+    """조인된 쿼리별 차이(Proposed - Baseline) 집계 (청크 단위 벡터화 누적)
+
+    차이가 tie_margin보다 크면 win, -tie_margin보다 작으면 loss, 나머지는 tie.
+    반환값: 차이 히스토그램(0.01 칸), win/loss/tie 수, 차이 평균/표준편차,
+            Baseline x Proposed 점수 개수 격자 (101 x 101)
+    """
+    index_b, index_p = join['index_a'], join['index_b']
+    n = len(index_b)
+    delta_counts = np.zeros(DELTA_LEVELS, dtype=np.int64)
+    grid = np.zeros(SCORE_LEVELS * SCORE_LEVELS, dtype=np.int64)
+    wins = losses = 0
+    total = total_sq = 0.0
+    for start in range(0, n, chunk_size):
+        b = _take(baseline, index_b[start:start + chunk_size])
+        p = _take(proposed, index_p[start:start + chunk_size])
+        delta = p - b
+        wins += int(np.count_nonzero(delta > tie_margin))
+        losses += int(np.count_nonzero(delta < -tie_margin))
+        total += float(delta.sum())
+        total_sq += float(delta @ delta)
+        codes = np.clip(np.rint(delta * 100), -100, 100).astype(np.int64) + 100
+        delta_counts += np.bincount(codes, minlength=DELTA_LEVELS)
+        code_b = np.clip(np.rint(b * 100), 0, SCORE_LEVELS - 1).astype(np.int64)
+        code_p = np.clip(np.rint(p * 100), 0, SCORE_LEVELS - 1).astype(np.int64)
+        grid += np.bincount(code_b * SCORE_LEVELS + code_p, minlength=SCORE_LEVELS * SCORE_LEVELS)
+    mean = total / n if n else 0.0
+    return {
+        'n': n,
+        'delta_counts': delta_counts,
+        'delta_edges': (np.arange(DELTA_LEVELS + 1) - 100.5) / 100,
+        'wins': wins,
+        'losses': losses,
+        'ties': n - wins - losses,
+        'mean_delta': mean,
+        'std_delta': float(np.sqrt(max(total_sq / n - mean * mean, 0.0))) if n else 0.0,
+        'grid': grid.reshape(SCORE_LEVELS, SCORE_LEVELS),
+    }
+
+def load_paired_scores(baseline_path, proposed_path):
+    """두 점수 파일을 메모리 매핑으로 열고 쿼리 ID로 조인 -> (Baseline 점수, Proposed 점수, 조인 결과)"""
+    ids_b, baseline = load_query_scores(baseline_path)
+    ids_p, proposed = load_query_scores(proposed_path)
+    return baseline, proposed, join_query_ids(ids_b, ids_p)
+
+def _format_ids(ids):
+    shown = ', '.join(str(i) for i in ids[:MAX_REPORTED_IDS])
+    return shown + (f' ... (+{len(ids) - MAX_REPORTED_IDS})' if len(ids) > MAX_REPORTED_IDS else '')
+
+def print_join_report(join):
+    """매칭/누락/중복 쿼리 보고"""
+    print(f"매칭된 쿼리: {len(join['query_ids']):,}")
+    for key, label in (('only_a', 'Proposed에 없는 쿼리'), ('only_b', 'Baseline에 없는 쿼리'),
+                       ('duplicates_a', 'Baseline 중복 쿼리 (첫 행 사용)'),
+                       ('duplicates_b', 'Proposed 중복 쿼리 (첫 행 사용)')):
+        if len(join[key]):
+            print(f"{label}: {len(join[key]):,}개 - {_format_ids(join[key])}")
+
+def save_join_report(path, join):
+    """누락/중복 쿼리 ID 전체를 .npz로 저장"""
+    np.savez(path, **{key: join[key] for key in ('only_a', 'only_b', 'duplicates_a', 'duplicates_b')})
+
+@traced(name='paired_comparison')
+def plot_paired_comparison(analysis, output=None):
+    """쿼리별 비교: 차이 히스토그램, win/loss/tie 수, Baseline vs Proposed 점수 격자"""
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(18, 5))
+    n = max(analysis['n'], 1)
+
+    # 차이 히스토그램 (0.01 칸)
+    ax1.stairs(analysis['delta_counts'], analysis['delta_edges'], fill=True, color='steelblue', alpha=0.7)
+    ax1.axvline(0, color='black', linewidth=1)
+    ax1.axvline(analysis['mean_delta'], color='red', linestyle='--', linewidth=1.5,
+                label=f"mean {analysis['mean_delta']:+.3f} (sd {analysis['std_delta']:.3f})")
+    ax1.set_xlabel('Score Delta (Proposed - Baseline)')
+    ax1.set_ylabel('Queries')
+    ax1.set_title('Per-query Delta', fontweight='bold')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # win/loss/tie 수
+    labels = ['Win', 'Tie', 'Loss']
+    counts = [analysis['wins'], analysis['ties'], analysis['losses']]
+    bars = ax2.bar(labels, counts, color=['seagreen', 'lightgray', 'indianred'], alpha=0.8)
+    for bar, count in zip(bars, counts):
+        ax2.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'{count:,}\n({count / n:.1%})',
+                 ha='center', va='bottom', fontsize=9)
+    ax2.set_ylabel('Queries')
+    ax2.set_title(f"Win / Tie / Loss ({analysis['n']:,} queries)", fontweight='bold')
+    ax2.set_ylim(0, max(counts) * 1.2 if max(counts) else 1)
+    ax2.grid(True, axis='y', alpha=0.3)
+
+    # Baseline vs Proposed 산점도 대신 0.01 칸 개수 격자 (쿼리 수와 무관한 아티스트 1개)
+    grid = np.ma.masked_equal(analysis['grid'], 0)
+    image = ax3.imshow(grid.T, origin='lower', extent=(-0.005, 1.005, -0.005, 1.005), aspect='equal',
+                       interpolation='nearest', cmap='viridis',
+                       norm=LogNorm(vmin=1, vmax=max(int(analysis['grid'].max()), 1)))
+    ax3.plot([0, 1], [0, 1], color='red', linestyle='--', linewidth=1)
+    ax3.set_xlabel('Baseline Score')
+    ax3.set_ylabel('Proposed Score')
+    ax3.set_title('Baseline vs Proposed', fontweight='bold')
+    fig.colorbar(image, ax=ax3, label='Queries')
+
+    finish_figure(fig, output)
+
+@traced(cat='main')
+def main(baseline=DEFAULT_BASELINE, proposed=DEFAULT_PROPOSED, output=None, tie_margin=0.0, report=None):
+    """쿼리 ID로 조인한 쿼리별 비교 그림 생성 -> 분석 결과"""
+    baseline_scores, proposed_scores, join = load_paired_scores(baseline, proposed)
+    print_join_report(join)
+    if report:
+        save_join_report(report, join)
+        print(f"누락/중복 쿼리 저장: {report}")
+    with span('paired_analysis', cat='stats'):
+        analysis = paired_analysis(baseline_scores, proposed_scores, join, tie_margin)
+    print(f"Win {analysis['wins']:,} / Tie {analysis['ties']:,} / Loss {analysis['losses']:,}, "
+          f"평균 차이 {analysis['mean_delta']:+.4f}")
+    plot_paired_comparison(analysis, output)
+    return analysis
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='쿼리 ID로 조인한 Baseline/Proposed 쿼리별 비교')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline 점수 파일 (.npy 또는 .scores 디렉터리, 기본값: data/baseline_scores.npy)')
+    parser.add_argument('--proposed', default=DEFAULT_PROPOSED,
+                        help='Proposed 점수 파일 (.npy 또는 .scores 디렉터리, 기본값: data/proposed_scores.npy)')
+    parser.add_argument('--output', default=None,
+                        help='저장할 이미지 경로 (배치 모드 기본값: paired_comparison.png)')
+    parser.add_argument('--tie-margin', type=float, default=0.0,
+                        help='|차이|가 이 값 이하면 tie로 집계 (기본값: 0)')
+    parser.add_argument('--report', metavar='PATH', default=None,
+                        help='누락/중복 쿼리 ID 전체를 .npz로 저장')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='조인/집계/plot 단계별 span을 Chrome trace JSON으로 저장')
+    parser.add_argument('--batch', action='store_true',
+                        help='배치 모드: 비대화형 백엔드 사용, plt.show() 생략, 최대 메모리 보고')
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    if args.batch:
+        enable_batch_mode()
+        # 배치 모드에서는 화면에 띄우지 않으므로 항상 파일로 저장
+        args.output = args.output or 'paired_comparison.png'
+    if args.trace:
+        enable_tracing()
+    main(args.baseline, args.proposed, args.output, args.tie_margin, args.report)
+    if args.trace:
+        save_trace(args.trace)
+    if args.batch:
+        report_peak_memory()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(run())
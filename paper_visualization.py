@@ -1,199 +1,374 @@
 import matplotlib.pyplot as plt
+import matplotlib.transforms as mtransforms
+from matplotlib.collections import PolyCollection
 import numpy as np
-import seaborn as sns
-from scipy import stats
-import random
+import argparse
+import math
+from functools import partial
+
+from batch_mode import enable_batch_mode, finish_figure, report_peak_memory
+from bootstrap import DEFAULT_RESAMPLES, bootstrap_comparison
+from build_manifest import DEFAULT_MANIFEST, hash_inputs
+from dataset_cache import load_dataset
+from density_grid import compute_density_grid, draw_density_grid
+from fast_kde import fast_kde, kde_density
+from quantized_scores import as_quantized
+from render_pool import all_up_to_date, render_figures
+from streaming_stats import RunningStats, stream_stats
+from significance_tests import DEFAULT_PERMUTATIONS, annotation_text, compare_distributions, result_rows, write_table
+from tracing import enable_tracing, save_trace, span, traced
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['axes.unicode_minus'] = False
 
-def generate_baseline_data():
-    """Baseline 데이터 생성 (SBERT + CE) - 6.6K queries"""
-    random.seed(42)
-    
-    # 고성능 구간 (0.85-0.95): 3.96K (60%)
-    high_performance = [round(random.uniform(0.85, 0.95), 2) for _ in range(3960)]
+def generate_baseline_array(n_queries=6600, seed=42):
+    """Baseline 데이터 생성 (SBERT + CE) - NumPy float32 배열, 대규모 쿼리용"""
+    rng = np.random.default_rng(seed)
     
-    # 저성능 구간 (0.45-0.75): 2.64K (40%)
-    low_performance = [round(random.uniform(0.45, 0.75), 2) for _ in range(2640)]
+    # 고성능 구간 (0.85-0.95) 60%, 저성능 구간 (0.45-0.75) 40%
+    n_high = int(round(n_queries * 0.6))
+    y_baseline = np.empty(n_queries, dtype=np.float32)
+    y_baseline[:n_high] = rng.uniform(0.85, 0.95, n_high)
+    y_baseline[n_high:] = rng.uniform(0.45, 0.75, n_queries - n_high)
     
-    # 두 구간을 섞어서 6.6K 데이터 생성
-    y_baseline = high_performance + low_performance
-    random.shuffle(y_baseline)
+    # 소수점 둘째 자리 반올림 후 섞기
+    np.round(y_baseline, 2, out=y_baseline)
+    rng.shuffle(y_baseline)
     
     return y_baseline
 
-def generate_proposed_data():
-    """Proposed 데이터 생성 (SBERT + CE + SDE) - 6.6K queries"""
-    random.seed(123)  # 다른 시드로 다른 분포 생성
+def generate_proposed_array(n_queries=6600, seed=123):
+    """Proposed 데이터 생성 (SBERT + CE + SDE) - NumPy float32 배열, 대규모 쿼리용"""
+    rng = np.random.default_rng(seed)
     
     # 더 넓은 분포: 0.3-0.95 범위에서 다양한 성능
-    y_proposed = [round(random.uniform(0.3, 0.95), 2) for _ in range(6600)]
+    y_proposed = rng.uniform(0.3, 0.95, n_queries).astype(np.float32)
+    np.round(y_proposed, 2, out=y_proposed)
     
     return y_proposed
 
-def plot_kde_comparison():
+def generate_baseline_data(n_queries=6600):
+    """Baseline 데이터 (소수점 둘째 자리 float 리스트) - generate_baseline_array의 리스트 버전"""
+    return np.round(generate_baseline_array(n_queries).astype(np.float64), 2).tolist()
+
+def generate_proposed_data(n_queries=6600):
+    """Proposed 데이터 (소수점 둘째 자리 float 리스트) - generate_proposed_array의 리스트 버전"""
+    return np.round(generate_proposed_array(n_queries).astype(np.float64), 2).tolist()
+
+def load_paper_datasets(n_queries=6600, cache_dir=None):
+    """Baseline/Proposed 데이터를 실행당 한 번만 생성해 공유 (캐시 사용)"""
+    y_baseline = load_dataset(generate_baseline_array, n_queries, 42, cache_dir)
+    y_proposed = load_dataset(generate_proposed_array, n_queries, 123, cache_dir)
+    return y_baseline, y_proposed
+
+# 색상/흑백 스타일 테마 (분석 결과는 공유하고 스타일만 바꿔 렌더링)
+THEMES = {
+    'color': {
+        'suffix': '',
+        'label_suffix': '',
+        'kde_lines': [{'linewidth': 2}, {'linewidth': 2}],
+        'hist': [{'color': 'blue', 'edgecolor': 'black'},
+                 {'color': 'red', 'edgecolor': 'black'}],
+        'patches': [{'facecolor': 'lightblue', 'alpha': 0.7},
+                    {'facecolor': 'lightcoral', 'alpha': 0.7}],
+        'hexbin_cmaps': ['Blues', 'Reds'],
+        'bars': [{'color': 'blue'}, {'color': 'red'}],
+        'summary_kde_lines': [{}, {}],
+    },
+    'bw': {
+        'suffix': '_bw',
+        'label_suffix': ' (흑백)',
+        'kde_lines': [{'linewidth': 3, 'linestyle': '-'}, {'linewidth': 3, 'linestyle': '--'}],
+        'hist': [{'color': 'black', 'edgecolor': 'white', 'linewidth': 0.5},
+                 {'color': 'gray', 'edgecolor': 'black', 'linewidth': 0.5}],
+        # 패턴으로 구분
+        'patches': [{'facecolor': 'white', 'hatch': '', 'edgecolor': 'black', 'linewidth': 1.5},
+                    {'facecolor': 'lightgray', 'hatch': '///', 'edgecolor': 'black', 'linewidth': 1.5}],
+        'hexbin_cmaps': ['Greys', 'Greys'],
+        'bars': [{'color': 'black', 'hatch': ''}, {'color': 'gray', 'hatch': '///'}],
+        'summary_kde_lines': [{'linewidth': 3, 'linestyle': '-'}, {'linewidth': 3, 'linestyle': '--'}],
+    },
+}
+
+# 유사도 점수는 소수점 둘째 자리로 양자화되어 있어 KDE를 정확한 값별 개수로 계산
+SCORE_DECIMALS = 2
+
+# --tests에서 경로를 생략했을 때의 분포 차이 검정 결과 표
+DEFAULT_TESTS_PATH = 'significance_tests.csv'
+
+SERIES_LABELS = ['SBERT + CE (Baseline)', 'SBERT + CE + SDE (Distribution Expanded)']
+TICK_LABELS = ['SBERT + CE\n(Baseline)', 'SBERT + CE + SDE\n(Distribution Expanded)']
+
+def _resolve_theme(theme):
+    """테마 이름 또는 테마 dict를 테마 dict로 변환"""
+    return THEMES[theme] if isinstance(theme, str) else theme
+
+def compute_violin_stats(scores, points=100):
+    """violin()용 통계 (cbook.violin_stats와 같은 키, KDE와 통계는 센타일별 개수로 계산)"""
+    lo, hi = scores.min(), scores.max()
+    coords = np.linspace(lo, hi, points)
+    return {
+        'coords': coords,
+        'vals': kde_density(scores, coords, decimals=SCORE_DECIMALS),
+        'mean': scores.mean(),
+        'median': scores.median(),
+        'min': lo,
+        'max': hi,
+        'quantiles': np.array([]),
+    }
+
+def compute_hexbin_grid(x, y, gridsize=50):
+    """육각 격자에서 셀별 개수와 셀 중심 좌표 계산 (draw_hexbin_grid로 렌더링)
+
+    격자 배치는 ax.hexbin(x, y, gridsize)와 같음: 엇갈린 두 직사각 격자 중 가까운 셀 중심에 배정.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    xmin, xmax = mtransforms.nonsingular(x.min(), x.max(), expander=0.1)
+    ymin, ymax = mtransforms.nonsingular(y.min(), y.max(), expander=0.1)
+    extent = (xmin, xmax, ymin, ymax)
+
+    nx = gridsize
+    ny = int(nx / math.sqrt(3))
+    nx1, ny1 = nx + 1, ny + 1
+
+    # 최댓값이 격자 밖으로 밀리지 않도록 하는 여유 (ax.hexbin과 같은 값)
+    padding = 1.e-9 * (xmax - xmin)
+    x0 = xmin - padding
+    sx = (xmax + padding - x0) / nx
+    sy = (ymax - ymin) / ny
+    ix = (x - x0) / sx
+    iy = (y - ymin) / sy
+    ix1 = np.round(ix).astype(int)
+    iy1 = np.round(iy).astype(int)
+    ix2 = np.floor(ix).astype(int)
+    iy2 = np.floor(iy).astype(int)
+    i1 = np.where((0 <= ix1) & (ix1 < nx1) & (0 <= iy1) & (iy1 < ny1), ix1 * ny1 + iy1 + 1, 0)
+    i2 = np.where((0 <= ix2) & (ix2 < nx) & (0 <= iy2) & (iy2 < ny), ix2 * ny + iy2 + 1, 0)
+    bdist = ((ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+             < (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2)
+
+    counts = np.concatenate([np.bincount(i1[bdist], minlength=1 + nx1 * ny1)[1:],
+                             np.bincount(i2[~bdist], minlength=1 + nx * ny)[1:]])
+
+    # 셀 중심 좌표 (두 격자)
+    cx = np.concatenate([np.repeat(np.arange(nx1), ny1), np.repeat(np.arange(nx) + 0.5, ny)])
+    cy = np.concatenate([np.tile(np.arange(ny1), nx1), np.tile(np.arange(ny), nx) + 0.5])
+    return {'x': cx * sx + x0, 'y': cy * sy + ymin, 'counts': counts,
+            'extent': extent, 'gridsize': gridsize, 'cell': (sx, sy)}
+
+def draw_hexbin_grid(ax, grid, cmap, alpha=0.8):
+    """미리 계산한 육각 격자를 셀별 육각형 PolyCollection 하나로 렌더링 (다시 binning하지 않음)"""
+    sx, sy = grid['cell']
+    hexagon = [sx, sy / 3] * np.array([[.5, -.5], [.5, .5], [0., 1.], [-.5, .5], [-.5, -.5], [0., -1.]])
+    collection = PolyCollection([hexagon], offsets=np.column_stack([grid['x'], grid['y']]),
+                                offset_transform=mtransforms.AffineDeltaTransform(ax.transData),
+                                edgecolors='face', linewidths=[plt.rcParams['patch.linewidth']],
+                                cmap=cmap, alpha=alpha)
+    collection.set_array(grid['counts'])
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+def plot_density_curve(ax, grid, density, **kwargs):
+    """미리 계산된 밀도 곡선 그리기 (seaborn kdeplot처럼 y축 하단을 0에 고정)"""
+    line, = ax.plot(grid, density, **kwargs)
+    line.sticky_edges.y[:] = [0]
+    return line
+
+def compute_summary_stats(data):
+    """Mean/Median/Std/Min/Max 통계 (센타일별 개수로 계산, RunningStats면 단일 패스 누적값)"""
+    if isinstance(data, RunningStats):
+        return data.summary()
+    scores = as_quantized(data)
+    return {
+        'Mean': scores.mean(),
+        'Median': scores.median(),
+        'Std': scores.std(),
+        'Min': scores.min(),
+        'Max': scores.max()
+    }
+
+@traced(name='stats', cat='stats')
+def compute_paper_analysis(y_baseline=None, y_proposed=None, density='hexbin',
+                           bootstrap=DEFAULT_RESAMPLES, bootstrap_jobs=1, permutations=None,
+                           density_sources=None):
+    """색상/흑백 버전이 공유하는 분석을 한 번만 계산 (KDE, 히스토그램, 박스/바이올린 통계, hexbin, 요약 통계)
+
+    density='raster'이면 hexbin 대신 청크 단위로 누적한 2차원 개수 격자를 계산 (대용량용)
+    bootstrap: 요약 통계 신뢰구간용 재표본 수 (0이면 생략, 개수 형식이라 쿼리 수와 무관)
+    permutations: 분포 차이 검정(KS, Mann-Whitney, 순열)의 순열 수 (기본값 None이면 검정 생략, 0이면 순열 검정만 생략)
+    y_baseline/y_proposed는 streaming_stats.RunningStats(파일 단일 패스 결과)일 수도 있음 - 순서 정보가 없으므로
+    raster 밀도 격자는 density_sources(메모리 매핑 점수 배열)에서 다시 순차 스캔
+    점수는 uint8 센타일 코드로 한 번 변환한 뒤, 분포 통계는 모두 101칸 개수에서 계산
+    """
+    if y_baseline is None or y_proposed is None:
+        y_baseline, y_proposed = load_paper_datasets()
+    with span('quantize', cat='stats'):
+        data = [y.quantized() if isinstance(y, RunningStats) else as_quantized(y) for y in (y_baseline, y_proposed)]
+    if any(y is None for y in data):
+        raise ValueError('소수점 둘째 자리가 아닌 점수 파일은 요약 통계만 가능합니다 (cli.py stats 사용)')
+
+    # x축 데이터 (K 단위로 표시)
+    analysis = {'hexbin_x_max': max(len(y_baseline), len(y_proposed)) / 1000}
+
+    with span('kde', cat='stats'):
+        analysis['kde'] = [fast_kde(y, decimals=SCORE_DECIMALS) for y in data]
+    with span('hist', cat='stats'):
+        analysis['hist'] = [y.histogram(bins=50) for y in data]
+    with span('boxplot_stats', cat='stats'):
+        analysis['boxplot'] = [y.boxplot_stats(label) for y, label in zip(data, TICK_LABELS)]
+    with span('violin_stats', cat='stats'):
+        analysis['violin'] = [compute_violin_stats(y, points=100) for y in data]
+    with span('summary_stats', cat='stats'):
+        analysis['summary'] = [compute_summary_stats(y) for y in (y_baseline, y_proposed)]
+    analysis['summary_ci'] = bootstrap_comparison(*data, bootstrap, jobs=bootstrap_jobs) if bootstrap else None
+    with span('significance_tests', cat='stats'):
+        analysis['tests'] = (compare_distributions(*data, permutations, jobs=bootstrap_jobs)
+                             if permutations is not None else None)
+    if density == 'raster':
+        with span('density_grid', cat='stats'):
+            analysis['density_grid'] = [compute_density_grid(y) for y in (density_sources or data)]
+    else:
+        with span('hexbin', cat='stats'):
+            analysis['hexbin'] = [compute_hexbin_grid(np.arange(len(y)) / 1000, y.to_array(), gridsize=50)
+                                  for y in data]
+    return analysis
+
+def annotate_tests(ax, analysis, x, y, va='top', ha='left'):
+    """분포 차이 검정 결과를 축 좌표 (x, y)에 텍스트 상자로 표시 (검정을 생략했으면 아무것도 안 함)"""
+    if analysis.get('tests') is None:
+        return
+    ax.text(x, y, annotation_text(analysis['tests']), transform=ax.transAxes, fontsize=9, va=va, ha=ha,
+            bbox=dict(boxstyle='round', facecolor='white', edgecolor='0.7', alpha=0.9))
+
+@traced
+def plot_kde_comparison(y_baseline=None, y_proposed=None, theme='color', analysis=None, output=None):
     """1. KDE로 분포 비교 (논문 본문용)"""
-    y_baseline = generate_baseline_data()
-    y_proposed = generate_proposed_data()
+    theme = _resolve_theme(theme)
+    if analysis is None:
+        analysis = compute_paper_analysis(y_baseline, y_proposed)
     
     fig, ax = plt.subplots(1, 1, figsize=(10, 6))
     
-    # KDE 플롯
-    sns.kdeplot(y_baseline, label='SBERT + CE (Baseline)', alpha=0.7, linewidth=2)
-    sns.kdeplot(y_proposed, label='SBERT + CE + SDE (Distribution Expanded)', alpha=0.7, linewidth=2)
+    # KDE 플롯 (미리 계산된 밀도 곡선)
+    for (grid, density), label, style in zip(analysis['kde'], SERIES_LABELS, theme['kde_lines']):
+        plot_density_curve(ax, grid, density, label=label, alpha=0.7, **style)
     
     ax.set_xlabel('Similarity Score', fontsize=12)
     ax.set_ylabel('Density', fontsize=12)
     # ax.set_title('Distribution Comparison: Baseline vs Proposed Method', fontsize=14, fontweight='bold')
-    ax.legend(fontsize=11)
+    # 검정 결과를 범례 아래에 두도록 범례 위치 고정
+    ax.legend(fontsize=11, **({'loc': 'upper left'} if analysis.get('tests') else {}))
     ax.grid(True, alpha=0.3)
     ax.set_xlim(0.2, 1.0)
+    annotate_tests(ax, analysis, 0.01, 0.86)
     
-    plt.tight_layout()
-    plt.savefig('kde_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, output or f"kde_comparison{theme['suffix']}.png")
 
-def plot_histogram_comparison():
+@traced
+def plot_histogram_comparison(y_baseline=None, y_proposed=None, theme='color', analysis=None, output=None):
     """2. 히스토그램으로 분포 비교"""
-    y_baseline = generate_baseline_data()
-    y_proposed = generate_proposed_data()
+    theme = _resolve_theme(theme)
+    if analysis is None:
+        analysis = compute_paper_analysis(y_baseline, y_proposed)
     
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
     
-    # Baseline 히스토그램 (6.6K 데이터에 맞춰 bins 증가)
-    ax1.hist(y_baseline, bins=50, alpha=0.7, color='blue', edgecolor='black')
-    ax1.set_title('SBERT + CE (Baseline)', fontsize=12, fontweight='bold')
-    ax1.set_xlabel('Similarity Score')
-    ax1.set_ylabel('Frequency')
-    ax1.grid(True, alpha=0.3)
-    
-    # Proposed 히스토그램 (6.6K 데이터에 맞춰 bins 증가)
-    ax2.hist(y_proposed, bins=50, alpha=0.7, color='red', edgecolor='black')
-    ax2.set_title('SBERT + CE + SDE (Distribution Expanded)', fontsize=12, fontweight='bold')
-    ax2.set_xlabel('Similarity Score')
-    ax2.set_ylabel('Frequency')
-    ax2.grid(True, alpha=0.3)
+    # 미리 계산된 bin 개수로 히스토그램 (6.6K 데이터에 맞춰 bins 증가)
+    for ax, (counts, edges), title, style in zip((ax1, ax2), analysis['hist'], SERIES_LABELS, theme['hist']):
+        ax.hist(edges[:-1], bins=edges, weights=counts, alpha=0.7, **style)
+        ax.set_title(title, fontsize=12, fontweight='bold')
+        ax.set_xlabel('Similarity Score')
+        ax.set_ylabel('Frequency')
+        ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('histogram_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, output or f"histogram_comparison{theme['suffix']}.png")
 
-def plot_boxplot_comparison():
+@traced
+def plot_boxplot_comparison(y_baseline=None, y_proposed=None, theme='color', analysis=None, output=None):
     """3. Boxplot으로 분포 요약 비교"""
-    y_baseline = generate_baseline_data()
-    y_proposed = generate_proposed_data()
+    theme = _resolve_theme(theme)
+    if analysis is None:
+        analysis = compute_paper_analysis(y_baseline, y_proposed)
     
     fig, ax = plt.subplots(1, 1, figsize=(8, 6))
     
-    # 데이터 준비
-    data = [y_baseline, y_proposed]
-    labels = ['SBERT + CE\n(Baseline)', 'SBERT + CE + SDE\n(Distribution Expanded)']
+    # Boxplot (미리 계산된 사분위수/수염/이상치)
+    box_plot = ax.bxp(analysis['boxplot'], patch_artist=True)
     
-    # Boxplot
-    box_plot = ax.boxplot(data, labels=labels, patch_artist=True)
-    
-    # 색상 설정
-    colors = ['lightblue', 'lightcoral']
-    for patch, color in zip(box_plot['boxes'], colors):
-        patch.set_facecolor(color)
-        patch.set_alpha(0.7)
+    # 스타일 설정
+    for patch, style in zip(box_plot['boxes'], theme['patches']):
+        patch.set(**style)
     
     ax.set_ylabel('Similarity Score', fontsize=12)
     # ax.set_title('Distribution Summary: Baseline vs Proposed Method', fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3)
     ax.set_ylim(0.2, 1.0)
+    annotate_tests(ax, analysis, 0.5, 0.02, va='bottom', ha='center')
     
-    plt.tight_layout()
-    plt.savefig('boxplot_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, output or f"boxplot_comparison{theme['suffix']}.png")
 
-def plot_violin_comparison():
+@traced
+def plot_violin_comparison(y_baseline=None, y_proposed=None, theme='color', analysis=None, output=None):
     """4. Violin plot으로 분포 비교"""
-    y_baseline = generate_baseline_data()
-    y_proposed = generate_proposed_data()
+    theme = _resolve_theme(theme)
+    if analysis is None:
+        analysis = compute_paper_analysis(y_baseline, y_proposed)
     
     fig, ax = plt.subplots(1, 1, figsize=(8, 6))
     
-    # 데이터 준비
-    data = [y_baseline, y_proposed]
-    labels = ['SBERT + CE\n(Baseline)', 'SBERT + CE + SDE\n(Distribution Expanded)']
-    
-    # Violin plot
-    parts = ax.violinplot(data, positions=[1, 2], showmeans=True, showmedians=True)
+    # Violin plot (미리 계산된 KDE 통계)
+    parts = ax.violin(analysis['violin'], positions=[1, 2], showmeans=True, showmedians=True)
     
-    # 색상 설정
-    colors = ['lightblue', 'lightcoral']
-    for pc, color in zip(parts['bodies'], colors):
-        pc.set_facecolor(color)
-        pc.set_alpha(0.7)
+    # 스타일 설정
+    for pc, style in zip(parts['bodies'], theme['patches']):
+        pc.set(**style)
     
     ax.set_xticks([1, 2])
-    ax.set_xticklabels(labels)
+    ax.set_xticklabels(TICK_LABELS)
     ax.set_ylabel('Similarity Score', fontsize=12)
     # ax.set_title('Distribution Shape Comparison: Baseline vs Proposed Method', fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3)
     ax.set_ylim(0.2, 1.0)
     
-    plt.tight_layout()
-    plt.savefig('violin_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, output or f"violin_comparison{theme['suffix']}.png")
 
-def plot_hexbin_comparison():
+@traced
+def plot_hexbin_comparison(y_baseline=None, y_proposed=None, theme='color', analysis=None, output=None):
     """5. Hexbin으로 밀도 기반 시각화"""
-    y_baseline = generate_baseline_data()
-    y_proposed = generate_proposed_data()
-    
-    # x축 데이터 생성 (K 단위로 표시)
-    x_baseline = [i/1000 for i in range(len(y_baseline))]  # 0-6.6K 범위
-    x_proposed = [i/1000 for i in range(len(y_proposed))]  # 0-6.6K 범위
+    theme = _resolve_theme(theme)
+    if analysis is None:
+        analysis = compute_paper_analysis(y_baseline, y_proposed)
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
     
-    # Baseline Hexbin (6.6K 데이터에 맞춰 gridsize 증가)
-    hb1 = ax1.hexbin(x_baseline, y_baseline, gridsize=50, cmap='Blues', alpha=0.8)
-    ax1.set_title('SBERT + CE (Baseline)', fontsize=12, fontweight='bold')
-    ax1.set_xlabel('Query Index (K)')
-    ax1.set_ylabel('Similarity Score')
-    ax1.set_ylim(0.2, 1.0)
-    ax1.set_xlim(0, 6.6)
-    plt.colorbar(hb1, ax=ax1, label='Density')
-    
-    # Proposed Hexbin (6.6K 데이터에 맞춰 gridsize 증가)
-    hb2 = ax2.hexbin(x_proposed, y_proposed, gridsize=50, cmap='Reds', alpha=0.8)
-    ax2.set_title('SBERT + CE + SDE (Distribution Expanded)', fontsize=12, fontweight='bold')
-    ax2.set_xlabel('Query Index (K)')
-    ax2.set_ylabel('Similarity Score')
-    ax2.set_ylim(0.2, 1.0)
-    ax2.set_xlim(0, 6.6)
-    plt.colorbar(hb2, ax=ax2, label='Density')
-    
-    plt.tight_layout()
-    plt.savefig('hexbin_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
-
-def plot_statistical_summary():
+    # 래스터 모드: 미리 누적한 개수 격자를 이미지 하나로 렌더링
+    # hexbin 모드: 미리 계산된 셀별 개수를 육각형으로 렌더링
+    raster = 'density_grid' in analysis
+    grids = analysis['density_grid'] if raster else analysis['hexbin']
+    for ax, grid, title, cmap in zip((ax1, ax2), grids, SERIES_LABELS, theme['hexbin_cmaps']):
+        if raster:
+            hb = draw_density_grid(ax, grid, cmap=cmap, alpha=0.8)
+        else:
+            hb = draw_hexbin_grid(ax, grid, cmap=cmap, alpha=0.8)
+        ax.set_title(title, fontsize=12, fontweight='bold')
+        ax.set_xlabel('Query Index (K)')
+        ax.set_ylabel('Similarity Score')
+        ax.set_ylim(0.2, 1.0)
+        ax.set_xlim(0, analysis['hexbin_x_max'])
+        plt.colorbar(hb, ax=ax, label='Density')
+    
+    finish_figure(fig, output or f"hexbin_comparison{theme['suffix']}.png")
+
+@traced
+def plot_statistical_summary(y_baseline=None, y_proposed=None, theme='color', analysis=None, output=None):
     """6. 통계적 요약 비교"""
-    y_baseline = generate_baseline_data()
-    y_proposed = generate_proposed_data()
-    
-    # 통계 계산
-    baseline_stats = {
-        'Mean': np.mean(y_baseline),
-        'Median': np.median(y_baseline),
-        'Std': np.std(y_baseline),
-        'Min': np.min(y_baseline),
-        'Max': np.max(y_baseline)
-    }
+    theme = _resolve_theme(theme)
+    if analysis is None:
+        analysis = compute_paper_analysis(y_baseline, y_proposed)
     
-    proposed_stats = {
-        'Mean': np.mean(y_proposed),
-        'Median': np.median(y_proposed),
-        'Std': np.std(y_proposed),
-        'Min': np.min(y_proposed),
-        'Max': np.max(y_proposed)
-    }
+    baseline_stats, proposed_stats = analysis['summary']
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
     
@@ -205,71 +380,191 @@ def plot_statistical_summary():
     x = np.arange(len(stats_names))
     width = 0.35
     
-    bars1 = ax1.bar(x - width/2, baseline_values, width, label='Baseline', alpha=0.7, color='blue')
-    bars2 = ax1.bar(x + width/2, proposed_values, width, label='Proposed', alpha=0.7, color='red')
+    # 부트스트랩 신뢰구간이 있으면 오차 막대로 표시 (통계별 (하한, 상한) -> 값 기준 아래/위 길이)
+    ci = analysis.get('summary_ci')
+    errors = [None, None]
+    if ci is not None:
+        errors = [np.abs(np.array([ci[group][name] for name in stats_names]).T - np.array(values))
+                  for group, values in (('baseline', baseline_values), ('proposed', proposed_values))]
+    
+    baseline_style, proposed_style = theme['bars']
+    bars1 = ax1.bar(x - width/2, baseline_values, width, label='Baseline', alpha=0.7,
+                    yerr=errors[0], capsize=3 if ci else 0, **baseline_style)
+    bars2 = ax1.bar(x + width/2, proposed_values, width, label='Proposed', alpha=0.7,
+                    yerr=errors[1], capsize=3 if ci else 0, **proposed_style)
     
     ax1.set_xlabel('Statistics')
     ax1.set_ylabel('Values')
     ax1.set_title('Statistical Comparison', fontweight='bold')
     ax1.set_xticks(x)
-    ax1.set_xticklabels(stats_names)
+    if ci is None:
+        ax1.set_xticklabels(stats_names)
+    else:
+        # 차이(Proposed - Baseline)의 신뢰구간을 눈금 라벨 아래에 표시
+        ax1.set_xticklabels([f'{name}\nΔ {ci["difference"][name][0]:+.3f}\n~ {ci["difference"][name][1]:+.3f}'
+                             for name in stats_names], fontsize=8)
+        ax1.set_xlabel(f"Statistics ({ci['confidence']:.0%} bootstrap CI, {ci['n_resamples']} resamples)")
     ax1.legend()
     ax1.grid(True, alpha=0.3)
     
-    # 값 표시
-    for bar in bars1:
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.01,
-                f'{height:.3f}', ha='center', va='bottom', fontsize=8)
-    
-    for bar in bars2:
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.01,
-                f'{height:.3f}', ha='center', va='bottom', fontsize=8)
+    # 값 표시 (오차 막대가 있으면 상한 위에)
+    for bars, error in zip((bars1, bars2), errors):
+        for i, bar in enumerate(bars):
+            height = bar.get_height()
+            top = height if error is None else height + error[1][i]
+            ax1.text(bar.get_x() + bar.get_width()/2., top + 0.01,
+                    f'{height:.3f}', ha='center', va='bottom', fontsize=8)
     
     # 분포 비교 (KDE)
-    sns.kdeplot(y_baseline, ax=ax2, label='Baseline', alpha=0.7)
-    sns.kdeplot(y_proposed, ax=ax2, label='Proposed', alpha=0.7)
+    for (grid, density), label, style in zip(analysis['kde'], ['Baseline', 'Proposed'],
+                                             theme['summary_kde_lines']):
+        plot_density_curve(ax2, grid, density, label=label, alpha=0.7, **style)
     ax2.set_xlabel('Similarity Score')
     ax2.set_ylabel('Density')
     # ax2.set_title('Distribution Comparison', fontweight='bold')
     ax2.legend()
     ax2.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('statistical_summary.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, output or f"statistical_summary{theme['suffix']}.png")
 
-def main():
-    """모든 시각화 실행 (6.6K queries)"""
-    print("논문용 시각화 생성 중... (6.6K queries)")
-    
-    print("1. KDE 분포 비교 생성 중...")
-    plot_kde_comparison()
-    
-    print("2. 히스토그램 비교 생성 중...")
-    plot_histogram_comparison()
-    
-    print("3. Boxplot 비교 생성 중...")
-    plot_boxplot_comparison()
-    
-    print("4. Violin plot 비교 생성 중...")
-    plot_violin_comparison()
-    
-    print("5. Hexbin 밀도 시각화 생성 중...")
-    plot_hexbin_comparison()
-    
-    print("6. 통계적 요약 생성 중...")
-    plot_statistical_summary()
-    
-    print("모든 시각화가 완료되었습니다! (6.6K queries)")
+# 그림 종류 목록 (라벨, 플롯 함수, 출력 파일 이름)
+FIGURE_KINDS = [
+    ('1. KDE 분포 비교', plot_kde_comparison, 'kde_comparison'),
+    ('2. 히스토그램 비교', plot_histogram_comparison, 'histogram_comparison'),
+    ('3. Boxplot 비교', plot_boxplot_comparison, 'boxplot_comparison'),
+    ('4. Violin plot 비교', plot_violin_comparison, 'violin_comparison'),
+    ('5. Hexbin 밀도 시각화', plot_hexbin_comparison, 'hexbin_comparison'),
+    ('6. 통계적 요약', plot_statistical_summary, 'statistical_summary'),
+]
+
+def build_figures(themes=('color', 'bw')):
+    """테마별 렌더링 목록 생성 (라벨, 플롯 함수, 출력 경로)
+
+    각 플롯 함수는 output 키워드로 저장 경로를 받음 (기본값 None이면 출력 경로와 같은 현재 디렉터리 파일)
+    """
+    figures = []
+    for theme_name in themes:
+        theme = THEMES[theme_name]
+        for label, func, stem in FIGURE_KINDS:
+            figures.append((f"{label}{theme['label_suffix']}", partial(func, theme=theme),
+                            f"{stem}{theme['suffix']}.png"))
+    return figures
+
+@traced(cat='main')
+def main(n_queries=6600, cache_dir=None, jobs=1, incremental=False, themes=('color', 'bw'),
+         density='hexbin', bootstrap=DEFAULT_RESAMPLES, bootstrap_jobs=1, permutations=DEFAULT_PERMUTATIONS,
+         tests_path=None, score_files=None, stream_jobs=1):
+    """모든 시각화 실행 (6.6K queries) - 분석은 한 번만 계산하고 테마별로 렌더링
+
+    tests_path: 지정하면 분포 차이 검정(KS, Mann-Whitney, permutations개 순열)을 계산해 그림에 주석으로 달고
+    결과 표를 이 경로에 저장 (기본값 None이면 검정 생략)
+
+    score_files: (Baseline, Proposed) 점수 파일 (.npy/.scores) - 생성 데이터 대신 메모리보다 큰 파일을
+    청크 단위로 한 번 순차 스캔해 개수/통계를 누적하고, 밀도 그림은 raster 격자로 그림
+    """
+    density_sources = None
+    if score_files:
+        from score_io import load_scores
+        print(f"점수 파일 단일 패스 집계 중... ({', '.join(score_files)})")
+        y_baseline, y_proposed = (stream_stats(path, jobs=stream_jobs) for path in score_files)
+        n_queries = max(len(y_baseline), len(y_proposed))
+        density, density_sources = 'raster', [load_scores(path)[1] for path in score_files]
+    else:
+        y_baseline, y_proposed = load_paper_datasets(n_queries, cache_dir)
+    print(f"논문용 시각화 생성 중... ({n_queries} queries, 테마: {', '.join(themes)})")
+    
+    figures = build_figures(themes)
+    manifest_path = DEFAULT_MANIFEST if incremental else None
+    data_digest = None
+    if manifest_path:
+        # 분석은 입력 데이터와 파라미터로 정해지므로 (부트스트랩/순열은 고정 시드) 분석 전에 최신 여부 확인
+        data_digest = hash_inputs({'data': [y_baseline, y_proposed], 'density': density,
+                                   'density_sources': density_sources, 'bootstrap': bootstrap,
+                                   'bootstrap_jobs': bootstrap_jobs,
+                                   'permutations': permutations if tests_path else None})
+    if manifest_path and tests_path is None and all_up_to_date(figures, data_digest, manifest_path):
+        print("입력이 그대로여서 분석 계산을 건너뜀")
+        analysis = None
+    else:
+        # 데이터와 분석(KDE, bin, hexbin 격자, 통계)은 한 번만 계산해 모든 테마/플롯에서 공유
+        analysis = compute_paper_analysis(y_baseline, y_proposed, density, bootstrap, bootstrap_jobs,
+                                          permutations if tests_path else None, density_sources)
+        if analysis['tests'] is not None:
+            write_table(tests_path, result_rows('Baseline', 'Proposed', analysis['tests']))
+            print(f"분포 차이 검정 결과 저장: {tests_path}")
+    
+    results = render_figures(figures, {'analysis': analysis}, jobs,
+                             manifest_path=manifest_path, data_digest=data_digest)
+    failed = [r['label'] for r in results if not r['ok']]
+    if failed:
+        print(f"실패한 시각화: {', '.join(failed)}")
+        return results
+    
+    print(f"모든 시각화가 완료되었습니다! ({n_queries} queries)")
     print("생성된 파일들:")
-    print("- kde_comparison.png (논문 본문 추천)")
-    print("- histogram_comparison.png")
-    print("- boxplot_comparison.png")
-    print("- violin_comparison.png")
-    print("- hexbin_comparison.png")
-    print("- statistical_summary.png")
+    for _, _, output in figures:
+        note = ' (논문 본문 추천)' if output.startswith('kde_comparison') else ''
+        print(f"- {output}{note}")
+    return results
+
+def build_parser(description='논문용 분포 비교 시각화', themes=True):
+    """명령행 파서 (themes=False면 --themes 없이 - 테마가 고정된 paper_visualization_bw용)"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--n-queries', type=int, default=6600, help='쿼리 수 (기본값: 6600)')
+    parser.add_argument('--cache-dir', default=None, help='생성 데이터 .npy 캐시 디렉터리')
+    if themes:
+        parser.add_argument('--themes', default='color,bw',
+                            help=f"렌더링할 테마 (쉼표 구분, 선택: {', '.join(THEMES)}, 기본값: color,bw)")
+    parser.add_argument('--score-files', nargs=2, metavar=('BASELINE', 'PROPOSED'), default=None,
+                        help='생성 데이터 대신 점수 파일 (.npy/.scores, 메모리보다 커도 한 번 순차 스캔, raster 밀도 사용)')
+    parser.add_argument('--stream-jobs', type=int, default=1,
+                        help='점수 파일 청크 집계 스레드 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('--density', choices=('hexbin', 'raster'), default='hexbin',
+                        help='밀도 그림 방식 (raster: 대용량용 개수 격자 이미지, 기본값: hexbin)')
+    parser.add_argument('--bootstrap', type=int, default=DEFAULT_RESAMPLES,
+                        help=f'요약 통계 신뢰구간 부트스트랩 재표본 수 (0이면 생략, 기본값: {DEFAULT_RESAMPLES})')
+    parser.add_argument('--bootstrap-jobs', type=int, default=1,
+                        help='부트스트랩/순열 검정 배치를 나눠 실행할 프로세스 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('--tests', nargs='?', const=DEFAULT_TESTS_PATH, default=None, metavar='PATH',
+                        help='분포 차이 검정(KS, Mann-Whitney, 순열)을 그림에 주석으로 달고 결과 표를 PATH에 저장 '
+                             f'(PATH 생략 시 {DEFAULT_TESTS_PATH})')
+    parser.add_argument('--permutations', type=int, default=DEFAULT_PERMUTATIONS,
+                        help=f'--tests의 평균 차이 순열 검정 순열 수 (0이면 순열 검정 생략, 기본값: {DEFAULT_PERMUTATIONS})')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='병렬 렌더링 프로세스 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'증분 빌드: 입력이 바뀐 그림만 다시 렌더링 ({DEFAULT_MANIFEST} 사용)')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='plot/단계별 span(벽시계/CPU 시간, 최대 RSS 증가량)을 Chrome trace JSON으로 저장')
+    parser.add_argument('--batch', action='store_true',
+                        help='배치 모드: 비대화형 백엔드 사용, plt.show() 생략, 최대 메모리 보고')
+    return parser
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.themes = tuple(t.strip() for t in args.themes.split(',') if t.strip())
+    unknown = [t for t in args.themes if t not in THEMES]
+    if unknown:
+        parser.error(f"알 수 없는 테마: {', '.join(unknown)}")
+    return args
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    if args.batch:
+        enable_batch_mode()
+    if args.trace:
+        enable_tracing()
+    results = main(args.n_queries, args.cache_dir, args.jobs, args.incremental, args.themes,
+                   args.density, args.bootstrap, args.bootstrap_jobs,
+                   args.permutations, args.tests, score_files=args.score_files, stream_jobs=args.stream_jobs)
+    if args.trace:
+        save_trace(args.trace)
+    if args.batch:
+        report_peak_memory()
+    return 0 if all(r['ok'] for r in results) else 1
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(run())
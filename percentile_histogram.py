@@ -1,72 +1,206 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import random
+import argparse
+import os
+
+from batch_mode import enable_batch_mode, finish_figure, report_peak_memory
+from build_manifest import DEFAULT_MANIFEST
+from dataset_cache import load_dataset
+from percentile_sweep import percentile_sweep
+from quantile_sketch import DEFAULT_K, KLLSketch, normalized_rank_error, sketch_scores
+from quantized_scores import QuantizedScores
+from render_pool import render_figures
+from streaming_stats import RunningStats, stream_stats
+from tracing import enable_tracing, save_trace, span, traced
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['axes.unicode_minus'] = False
 
-def generate_concentrated_data():
-    """집중된 분포 데이터 생성 (10% 퍼센타일 적용)"""
-    random.seed(42)
-    
-    # 집중된 분포: 대부분이 0.8-0.95 범위에 몰림
-    data = []
-    for _ in range(1000):
-        if random.random() < 0.8:  # 80%는 고성능
-            data.append(random.uniform(0.85, 0.95))
-        else:  # 20%는 저성능
-            data.append(random.uniform(0.3, 0.6))
-    
-    return sorted(data)
+def generate_concentrated_array(n_queries=1000, seed=42):
+    """집중된 분포 데이터 생성 - NumPy float32 배열, 대규모 쿼리용"""
+    rng = np.random.default_rng(seed)
+    
+    # 80%는 고성능 (0.85-0.95), 20%는 저성능 (0.3-0.6)
+    high = rng.random(n_queries) < 0.8
+    data = np.where(high,
+                    rng.uniform(0.85, 0.95, n_queries),
+                    rng.uniform(0.3, 0.6, n_queries)).astype(np.float32)
+    data.sort()
+    
+    return data
 
-def generate_dispersed_data():
-    """분산된 분포 데이터 생성 (30% 퍼센타일 적용)"""
-    random.seed(123)
+def generate_dispersed_array(n_queries=1000, seed=123):
+    """분산된 분포 데이터 생성 - NumPy float32 배열, 대규모 쿼리용"""
+    rng = np.random.default_rng(seed)
     
-    # 분산된 분포: 0.2-0.95 범위에 고르게 분포
-    data = []
-    for _ in range(1000):
-        data.append(random.uniform(0.2, 0.95))
+    # 0.2-0.95 범위에 고르게 분포
+    data = rng.uniform(0.2, 0.95, n_queries).astype(np.float32)
+    data.sort()
     
-    return sorted(data)
+    return data
+
+def generate_balanced_array(n_queries=1000, seed=456):
+    """균형적인 분포 데이터 생성 - NumPy float32 배열, 대규모 쿼리용"""
+    rng = np.random.default_rng(seed)
+    
+    # 두 개의 피크: 50%는 중간 성능 (0.4-0.6), 50%는 고성능 (0.8-0.9)
+    middle = rng.random(n_queries) < 0.5
+    data = np.where(middle,
+                    rng.uniform(0.4, 0.6, n_queries),
+                    rng.uniform(0.8, 0.9, n_queries)).astype(np.float32)
+    data.sort()
+    
+    return data
+
+def generate_concentrated_data(n_queries=1000):
+    """집중된 분포 데이터 (정렬된 float 리스트) - generate_concentrated_array의 리스트 버전"""
+    return generate_concentrated_array(n_queries).tolist()
+
+def generate_dispersed_data(n_queries=1000):
+    """분산된 분포 데이터 (정렬된 float 리스트) - generate_dispersed_array의 리스트 버전"""
+    return generate_dispersed_array(n_queries).tolist()
 
-def generate_balanced_data():
-    """균형적인 분포 데이터 생성 (20% 퍼센타일 적용)"""
-    random.seed(456)
-    
-    # 균형적인 분포: 두 개의 피크 (0.4-0.6, 0.8-0.9)
-    data = []
-    for _ in range(1000):
-        if random.random() < 0.5:  # 50%는 중간 성능
-            data.append(random.uniform(0.4, 0.6))
-        else:  # 50%는 고성능
-            data.append(random.uniform(0.8, 0.9))
-    
-    return sorted(data)
+def generate_balanced_data(n_queries=1000):
+    """균형적인 분포 데이터 (정렬된 float 리스트) - generate_balanced_array의 리스트 버전"""
+    return generate_balanced_array(n_queries).tolist()
 
 def calculate_percentile_threshold(data, percentile):
-    """퍼센타일 임계값 계산"""
+    """퍼센타일 임계값 계산 (QuantizedScores면 센타일별 개수로 정확하게, KLLSketch면 스케치 근사,
+    RunningStats면 누적된 개수 또는 스케치로)"""
+    if isinstance(data, (QuantizedScores, KLLSketch, RunningStats)):
+        return data.percentile(percentile)
     return np.percentile(data, percentile)
 
-def plot_percentile_histograms():
+def _summary(values, weights=None):
+    """{'Mean', 'Std', 'Count'} (weights가 있으면 값별 개수로, 비어 있으면 0)"""
+    count = len(values) if weights is None else int(weights.sum())
+    if count == 0:
+        return {'Mean': 0.0, 'Std': 0.0, 'Count': 0}
+    if weights is None:
+        return {'Mean': float(values.mean()), 'Std': float(values.std()), 'Count': count}
+    mean = float(values @ weights) / count
+    return {'Mean': mean, 'Std': float(np.sqrt(np.square(values - mean) @ weights / count)), 'Count': count}
+
+def calculate_filter_statistics(data, threshold):
+    """threshold 이상으로 필터링한 전후 평균/표준편차/개수 (정렬 없이 O(n), 개수 형식이면 O(101))
+
+    threshold는 그림에 표시하는 임계값(datasets['thresholds'])을 그대로 받으므로
+    스케치 임계값이어도 filter_scores와 같은 쿼리를 남김.
+    RunningStats(파일 단일 패스 결과)면 원본은 Welford/Chan 누적값, 필터 후는 누적된 개수로 계산.
+    """
+    if isinstance(data, RunningStats):
+        return {
+            'Original': {'Mean': data.mean, 'Std': data.std(), 'Count': data.n},
+            'Filtered': data.filtered(threshold),
+        }
+    if isinstance(data, QuantizedScores):
+        values, counts = data.values.astype(np.float64), data.counts
+        return {'Original': _summary(values, counts),
+                'Filtered': _summary(values, np.where(values >= threshold, counts, 0))}
+    values = np.asarray(data, dtype=np.float64).reshape(-1)
+    return {'Original': _summary(values), 'Filtered': _summary(values[values >= threshold])}
+
+def plot_histogram(ax, data, bins=30, **style):
+    """ax.hist와 같은 막대 (QuantizedScores면 101개 값별 개수를 가중치로 - 개수만 있는 윈도우 상태도 가능)"""
+    if isinstance(data, QuantizedScores):
+        counts, edges = data.histogram(bins)
+        return ax.hist(edges[:-1], bins=edges, weights=counts, **style)
+    return ax.hist(data, bins=bins, **style)
+
+def filter_scores(data, threshold):
+    """threshold 이상인 점수만 남김 (QuantizedScores면 개수만 0으로)"""
+    if isinstance(data, QuantizedScores):
+        return QuantizedScores.from_counts(np.where(data.values >= threshold, data.counts, 0))
+    data = np.asarray(data)
+    return data[data >= threshold]
+
+# 분포별 적용 퍼센타일
+PERCENTILES = {'concentrated': 10, 'dispersed': 30, 'balanced': 20}
+# 분포별 생성기와 시드
+DATASET_GENERATORS = {
+    'concentrated': (generate_concentrated_array, 42),
+    'dispersed': (generate_dispersed_array, 123),
+    'balanced': (generate_balanced_array, 456),
+}
+# 임계값 계산 방식: exact(np.percentile) 또는 sketch(KLL 스트리밍 스케치, 메모리 고정)
+THRESHOLD_METHODS = ('exact', 'sketch')
+
+def load_threshold_sketch(name, data, sketch_k=DEFAULT_K, sketch_dir=None, source=None):
+    """분포별 스케치 (sketch_dir/<이름>.npz가 있으면 읽고, 없으면 데이터로 만들어 저장)
+
+    운영 환경에서는 워커가 quantile_sketch.py build/merge로 만든 스케치를 sketch_dir에 두면
+    원본 점수 없이 임계값만 계산할 수 있음.
+    source: 데이터 설명 (생성기 파라미터 dict) - 만든 스케치에 함께 저장하고, 읽은 스케치의
+    source나 k가 다르면 (n_queries/시드/sketch_k가 바뀐 경우) 다시 만들어 덮어씀.
+    source가 기록되지 않은 스케치(build/merge 결과)는 다시 만들 수 없으므로 k가 다르면 오류.
+    """
+    path = os.path.join(sketch_dir, f'{name}.npz') if sketch_dir else None
+    if path and os.path.exists(path):
+        sketch = KLLSketch.load(path)
+        if sketch.source is None:
+            if sketch.k != sketch_k:
+                raise ValueError(f'{path}: 스케치 k={sketch.k}가 --sketch-k {sketch_k}와 다릅니다')
+            return sketch
+        if sketch.k == sketch_k and sketch.source == source:
+            return sketch
+        print(f"{path}: 저장된 스케치의 파라미터가 달라 다시 만듦")
+    sketch = sketch_scores(data, sketch_k, seed=0)
+    sketch.source = source
+    if path:
+        os.makedirs(sketch_dir, exist_ok=True)
+        sketch.save(path)
+    return sketch
+
+def load_percentile_datasets(n_queries=1000, cache_dir=None, threshold_method='exact',
+                             sketch_k=DEFAULT_K, sketch_dir=None, score_files=None, stream_jobs=1):
+    """세 가지 분포와 퍼센타일 임계값을 실행당 한 번만 계산해 공유 (캐시 사용)
+
+    threshold_method='sketch'이면 임계값을 KLL 스케치로 계산
+    (정규화 순위 오차 normalized_rank_error(sketch_k) 이내, 데이터가 작으면 정확한 값과 같음).
+    score_files: {분포 이름: 점수 파일} - 생성 데이터 대신 메모리보다 큰 파일을 한 번씩 순차 스캔해
+    RunningStats로 요약 (통계 그림만 그릴 수 있음)
+    """
+    if threshold_method not in THRESHOLD_METHODS:
+        raise ValueError(f'알 수 없는 임계값 방식: {threshold_method} ({", ".join(THRESHOLD_METHODS)})')
+    if score_files:
+        datasets = {name: stream_stats(score_files[name], jobs=stream_jobs, k=sketch_k) for name in PERCENTILES}
+        with span('thresholds', cat='stats', method='stream'):
+            datasets['thresholds'] = {name: calculate_percentile_threshold(datasets[name], percentile)
+                                      for name, percentile in PERCENTILES.items()}
+        return datasets
+    datasets = {name: load_dataset(generate, n_queries, seed, cache_dir)
+                for name, (generate, seed) in DATASET_GENERATORS.items()}
+    with span('thresholds', cat='stats', method=threshold_method):
+        sources = {name: datasets[name] for name in PERCENTILES}
+        if threshold_method == 'sketch':
+            sources = {name: load_threshold_sketch(name, data, sketch_k, sketch_dir,
+                                                   {'n_queries': n_queries, 'seed': DATASET_GENERATORS[name][1]})
+                       for name, data in sources.items()}
+        datasets['thresholds'] = {name: calculate_percentile_threshold(sources[name], percentile)
+                                  for name, percentile in PERCENTILES.items()}
+    return datasets
+
+@traced
+def plot_percentile_histograms(datasets=None, output='percentile_histograms.png'):
     """퍼센타일 적용 상황별 히스토그램"""
     
-    # 데이터 생성
-    concentrated = generate_concentrated_data()
-    dispersed = generate_dispersed_data()
-    balanced = generate_balanced_data()
+    # 데이터 및 퍼센타일 임계값 (실행당 한 번만 계산된 값 공유)
+    if datasets is None:
+        datasets = load_percentile_datasets()
+    concentrated = datasets['concentrated']
+    dispersed = datasets['dispersed']
+    balanced = datasets['balanced']
     
-    # 퍼센타일 임계값 계산
-    conc_threshold = calculate_percentile_threshold(concentrated, 10)
-    disp_threshold = calculate_percentile_threshold(dispersed, 30)
-    bal_threshold = calculate_percentile_threshold(balanced, 20)
+    conc_threshold = datasets['thresholds']['concentrated']
+    disp_threshold = datasets['thresholds']['dispersed']
+    bal_threshold = datasets['thresholds']['balanced']
     
     # 3개 서브플롯 생성 (크기 축소)
     fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 8))
     
     # 1. 집중된 분포 (10% 퍼센타일)
-    ax1.hist(concentrated, bins=30, alpha=0.7, color='blue', edgecolor='black')
+    plot_histogram(ax1, concentrated, bins=30, alpha=0.7, color='blue', edgecolor='black')
     ax1.axvline(conc_threshold, color='red', linestyle='--', linewidth=2)
     ax1.set_title('Concentrated Distribution (10th Percentile)', 
                   fontsize=12, fontweight='bold')
@@ -78,7 +212,7 @@ def plot_percentile_histograms():
     ax1.grid(True, alpha=0.3)
     
     # 2. 분산된 분포 (30% 퍼센타일)
-    ax2.hist(dispersed, bins=30, alpha=0.7, color='green', edgecolor='black')
+    plot_histogram(ax2, dispersed, bins=30, alpha=0.7, color='green', edgecolor='black')
     ax2.axvline(disp_threshold, color='red', linestyle='--', linewidth=2)
     ax2.set_title('Dispersed Distribution (30th Percentile)', 
                   fontsize=12, fontweight='bold')
@@ -90,7 +224,7 @@ def plot_percentile_histograms():
     ax2.grid(True, alpha=0.3)
     
     # 3. 균형적인 분포 (20% 퍼센타일)
-    ax3.hist(balanced, bins=30, alpha=0.7, color='orange', edgecolor='black')
+    plot_histogram(ax3, balanced, bins=30, alpha=0.7, color='orange', edgecolor='black')
     ax3.axvline(bal_threshold, color='red', linestyle='--', linewidth=2)
     ax3.set_title('Balanced Distribution (20th Percentile)', 
                   fontsize=12, fontweight='bold')
@@ -101,9 +235,7 @@ def plot_percentile_histograms():
              bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
     ax3.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('percentile_histograms.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, output)
     
     # 통계 정보 출력
     print("=== 퍼센타일 적용 상황별 분석 ===")
@@ -113,32 +245,34 @@ def plot_percentile_histograms():
     
     return concentrated, dispersed, balanced, conc_threshold, disp_threshold, bal_threshold
 
-def plot_percentile_comparison():
+@traced
+def plot_percentile_comparison(datasets=None, output='percentile_comparison.png'):
     """퍼센타일 적용 전후 비교"""
     
-    # 데이터 생성
-    concentrated = generate_concentrated_data()
-    dispersed = generate_dispersed_data()
-    balanced = generate_balanced_data()
+    # 데이터 및 퍼센타일 임계값 (실행당 한 번만 계산된 값 공유)
+    if datasets is None:
+        datasets = load_percentile_datasets()
+    concentrated = datasets['concentrated']
+    dispersed = datasets['dispersed']
+    balanced = datasets['balanced']
     
-    # 퍼센타일 임계값 계산
-    conc_threshold = calculate_percentile_threshold(concentrated, 10)
-    disp_threshold = calculate_percentile_threshold(dispersed, 30)
-    bal_threshold = calculate_percentile_threshold(balanced, 20)
+    conc_threshold = datasets['thresholds']['concentrated']
+    disp_threshold = datasets['thresholds']['dispersed']
+    bal_threshold = datasets['thresholds']['balanced']
     
     # 2x2 서브플롯 생성 (크기 축소)
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 8))
     
     # 1. 집중된 분포 - 적용 전
-    ax1.hist(concentrated, bins=30, alpha=0.7, color='lightblue', edgecolor='black')
+    plot_histogram(ax1, concentrated, bins=30, alpha=0.7, color='lightblue', edgecolor='black')
     ax1.set_title('Concentrated Distribution\n(Before 10th Percentile)', fontweight='bold')
     ax1.set_xlabel('Similarity Score')
     ax1.set_ylabel('Frequency')
     ax1.grid(True, alpha=0.3)
     
     # 2. 집중된 분포 - 적용 후
-    filtered_conc = [x for x in concentrated if x >= conc_threshold]
-    ax2.hist(filtered_conc, bins=30, alpha=0.7, color='blue', edgecolor='black')
+    filtered_conc = filter_scores(concentrated, conc_threshold)
+    plot_histogram(ax2, filtered_conc, bins=30, alpha=0.7, color='blue', edgecolor='black')
     ax2.axvline(conc_threshold, color='red', linestyle='--', linewidth=2,
                 label=f'Threshold: {conc_threshold:.3f}')
     ax2.set_title('Concentrated Distribution\n(After 10th Percentile)', fontweight='bold')
@@ -148,15 +282,15 @@ def plot_percentile_comparison():
     ax2.grid(True, alpha=0.3)
     
     # 3. 분산된 분포 - 적용 전
-    ax3.hist(dispersed, bins=30, alpha=0.7, color='lightgreen', edgecolor='black')
+    plot_histogram(ax3, dispersed, bins=30, alpha=0.7, color='lightgreen', edgecolor='black')
     ax3.set_title('Dispersed Distribution\n(Before 30th Percentile)', fontweight='bold')
     ax3.set_xlabel('Similarity Score')
     ax3.set_ylabel('Frequency')
     ax3.grid(True, alpha=0.3)
     
     # 4. 분산된 분포 - 적용 후
-    filtered_disp = [x for x in dispersed if x >= disp_threshold]
-    ax4.hist(filtered_disp, bins=30, alpha=0.7, color='green', edgecolor='black')
+    filtered_disp = filter_scores(dispersed, disp_threshold)
+    plot_histogram(ax4, filtered_disp, bins=30, alpha=0.7, color='green', edgecolor='black')
     ax4.axvline(disp_threshold, color='red', linestyle='--', linewidth=2,
                 label=f'Threshold: {disp_threshold:.3f}')
     ax4.set_title('Dispersed Distribution\n(After 30th Percentile)', fontweight='bold')
@@ -165,42 +299,28 @@ def plot_percentile_comparison():
     ax4.legend()
     ax4.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('percentile_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, output)
 
-def plot_percentile_statistics():
+@traced
+def plot_percentile_statistics(datasets=None, output='percentile_statistics.png'):
     """퍼센타일 적용 통계 분석"""
     
-    # 데이터 생성
-    concentrated = generate_concentrated_data()
-    dispersed = generate_dispersed_data()
-    balanced = generate_balanced_data()
+    # 데이터 및 퍼센타일 임계값 (실행당 한 번만 계산된 값 공유)
+    if datasets is None:
+        datasets = load_percentile_datasets()
+    concentrated = datasets['concentrated']
+    dispersed = datasets['dispersed']
+    balanced = datasets['balanced']
     
-    # 퍼센타일 임계값 계산
-    conc_threshold = calculate_percentile_threshold(concentrated, 10)
-    disp_threshold = calculate_percentile_threshold(dispersed, 30)
-    bal_threshold = calculate_percentile_threshold(balanced, 20)
+    conc_threshold = datasets['thresholds']['concentrated']
+    disp_threshold = datasets['thresholds']['dispersed']
+    bal_threshold = datasets['thresholds']['balanced']
     
-    # 필터링된 데이터
-    filtered_conc = [x for x in concentrated if x >= conc_threshold]
-    filtered_disp = [x for x in dispersed if x >= disp_threshold]
-    filtered_bal = [x for x in balanced if x >= bal_threshold]
-    
-    # 통계 계산
+    # 필터링 전후 통계 (그림에 표시한 임계값 그대로 - 비교 그림의 filter_scores와 같은 쿼리)
     stats_data = {
-        'Concentrated (10%)': {
-            'Original': {'Mean': np.mean(concentrated), 'Std': np.std(concentrated), 'Count': len(concentrated)},
-            'Filtered': {'Mean': np.mean(filtered_conc), 'Std': np.std(filtered_conc), 'Count': len(filtered_conc)}
-        },
-        'Dispersed (30%)': {
-            'Original': {'Mean': np.mean(dispersed), 'Std': np.std(dispersed), 'Count': len(dispersed)},
-            'Filtered': {'Mean': np.mean(filtered_disp), 'Std': np.std(filtered_disp), 'Count': len(filtered_disp)}
-        },
-        'Balanced (20%)': {
-            'Original': {'Mean': np.mean(balanced), 'Std': np.std(balanced), 'Count': len(balanced)},
-            'Filtered': {'Mean': np.mean(filtered_bal), 'Std': np.std(filtered_bal), 'Count': len(filtered_bal)}
-        }
+        'Concentrated (10%)': calculate_filter_statistics(concentrated, conc_threshold),
+        'Dispersed (30%)': calculate_filter_statistics(dispersed, disp_threshold),
+        'Balanced (20%)': calculate_filter_statistics(balanced, bal_threshold)
     }
     
     # 막대그래프로 통계 비교 (크기 축소)
@@ -276,9 +396,7 @@ def plot_percentile_statistics():
     for i, v in enumerate(thresholds):
         ax4.text(i, v + 0.01, f'{v:.3f}', ha='center', va='bottom')
     
-    plt.tight_layout()
-    plt.savefig('percentile_statistics.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, output)
     
     # 통계 정보 출력
     print("\n=== 퍼센타일 적용 통계 분석 ===")
@@ -288,24 +406,150 @@ def plot_percentile_statistics():
         print(f"  Filtered - Mean: {data['Filtered']['Mean']:.3f}, Std: {data['Filtered']['Std']:.3f}, Count: {data['Filtered']['Count']}")
         print(f"  Retention Rate: {data['Filtered']['Count']/data['Original']['Count']*100:.1f}%")
 
-def main():
-    """퍼센타일 적용 상황별 히스토그램 생성"""
+@traced
+def plot_percentile_sweep(datasets=None, output='percentile_sweep.png'):
+    """1-99 퍼센타일 전체 스캔: 임계값, 유지 비율, 필터링 후 평균/표준편차"""
+    
+    if datasets is None:
+        datasets = load_percentile_datasets()
+    
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(15, 4))
+    
+    names = [('concentrated', 'Concentrated', 'blue'),
+             ('dispersed', 'Dispersed', 'green'),
+             ('balanced', 'Balanced', 'orange')]
+    
+    for name, label, color in names:
+        sweep = percentile_sweep(datasets[name])
+        p = sweep['percentiles']
+        chosen = PERCENTILES[name]
+        
+        # 1. 퍼센타일별 임계값
+        ax1.plot(p, sweep['thresholds'], color=color, linewidth=2, label=label)
+        ax1.axvline(chosen, color=color, linestyle='--', linewidth=1, alpha=0.6)
+        
+        # 2. 유지 비율
+        ax2.plot(p, sweep['retention'] * 100, color=color, linewidth=2, label=label)
+        
+        # 3. 필터링 후 평균 ± 표준편차
+        ax3.plot(p, sweep['means'], color=color, linewidth=2, label=label)
+        ax3.fill_between(p, sweep['means'] - sweep['stds'], sweep['means'] + sweep['stds'],
+                         color=color, alpha=0.15)
+    
+    ax1.set_xlabel('Percentile')
+    ax1.set_ylabel('Threshold')
+    ax1.set_title('Percentile Threshold', fontweight='bold')
+    ax2.set_xlabel('Percentile')
+    ax2.set_ylabel('Retention Rate (%)')
+    ax2.set_title('Retention Rate', fontweight='bold')
+    ax3.set_xlabel('Percentile')
+    ax3.set_ylabel('Filtered Mean Score (± Std)')
+    ax3.set_title('Filtered Mean / Std', fontweight='bold')
+    for ax in (ax1, ax2, ax3):
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+    
+    finish_figure(fig, output)
+
+# main()에서 렌더링하는 독립 그림 목록 (라벨, 플롯 함수, 출력 경로)
+FIGURES = [
+    ('1. 퍼센타일 적용 상황별 히스토그램', plot_percentile_histograms, 'percentile_histograms.png'),
+    ('2. 퍼센타일 적용 전후 비교', plot_percentile_comparison, 'percentile_comparison.png'),
+    ('3. 퍼센타일 적용 통계 분석', plot_percentile_statistics, 'percentile_statistics.png'),
+]
+
+# 점수 파일 단일 패스 요약(RunningStats)으로 그릴 수 있는 그림
+STREAM_FIGURES = [FIGURES[2]]
+
+# 선택 그림: 퍼센타일 전체 스캔
+SWEEP_FIGURES = [
+    ('4. 퍼센타일 전체 스캔', plot_percentile_sweep, 'percentile_sweep.png'),
+]
+
+@traced(cat='main')
+def main(n_queries=1000, cache_dir=None, jobs=1, incremental=False, sweep=False,
+         threshold_method='exact', sketch_k=DEFAULT_K, sketch_dir=None, score_files=None, stream_jobs=1):
+    """퍼센타일 적용 상황별 히스토그램 생성 (score_files가 있으면 파일 단일 패스 통계 그림만)"""
     print("퍼센타일 적용 상황별 히스토그램 생성 중...")
-    
-    print("1. 퍼센타일 적용 상황별 히스토그램 생성 중...")
-    plot_percentile_histograms()
-    
-    print("2. 퍼센타일 적용 전후 비교 생성 중...")
-    plot_percentile_comparison()
-    
-    print("3. 퍼센타일 적용 통계 분석 생성 중...")
-    plot_percentile_statistics()
+    if threshold_method == 'sketch':
+        print(f"임계값: KLL 스케치 (k={sketch_k}, 순위 오차 약 ±{normalized_rank_error(sketch_k):.2%})")
+    
+    # 데이터와 임계값은 한 번만 계산해 모든 플롯에서 공유
+    datasets = load_percentile_datasets(n_queries, cache_dir, threshold_method, sketch_k, sketch_dir,
+                                        score_files, stream_jobs)
+    
+    if score_files:
+        figures = STREAM_FIGURES
+    else:
+        figures = FIGURES + SWEEP_FIGURES if sweep else FIGURES
+    results = render_figures(figures, {'datasets': datasets}, jobs,
+                             manifest_path=DEFAULT_MANIFEST if incremental else None)
+    failed = [r['label'] for r in results if not r['ok']]
+    if failed:
+        print(f"실패한 시각화: {', '.join(failed)}")
+        return results
     
     print("모든 퍼센타일 히스토그램이 완료되었습니다!")
     print("생성된 파일들:")
+    if score_files:
+        print("- percentile_statistics.png (통계 분석, 점수 파일 단일 패스)")
+        return results
     print("- percentile_histograms.png (상황별 히스토그램)")
     print("- percentile_comparison.png (적용 전후 비교)")
     print("- percentile_statistics.png (통계 분석)")
+    if sweep:
+        print("- percentile_sweep.png (1-99 퍼센타일 스캔)")
+    return results
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='퍼센타일 적용 상황별 히스토그램')
+    parser.add_argument('--n-queries', type=int, default=1000, help='분포별 쿼리 수 (기본값: 1000)')
+    parser.add_argument('--cache-dir', default=None, help='생성 데이터 .npy 캐시 디렉터리')
+    parser.add_argument('--sweep', action='store_true',
+                        help='1-99 퍼센타일 전체 스캔 그림(percentile_sweep.png)도 생성')
+    parser.add_argument('--threshold-method', choices=THRESHOLD_METHODS, default='exact',
+                        help='퍼센타일 임계값 계산 방식 (sketch: 메모리 고정 KLL 스케치, 기본값: exact)')
+    parser.add_argument('--sketch-k', type=int, default=DEFAULT_K,
+                        help=f'스케치 정확도 파라미터 (기본값: {DEFAULT_K})')
+    parser.add_argument('--sketch-dir', default=None,
+                        help='분포별 스케치 .npz 디렉터리 (<분포 이름>.npz, 없으면 생성해 저장)')
+    parser.add_argument('--score-file', action='append', default=None, metavar='NAME=PATH',
+                        help=f"분포별 점수 파일 (.npy/.scores/텍스트 로그, 이름: {', '.join(PERCENTILES)}) - "
+                             "메모리보다 큰 파일을 한 번씩 순차 스캔해 통계 그림만 생성")
+    parser.add_argument('--stream-jobs', type=int, default=1,
+                        help='점수 파일 청크 집계 스레드 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='병렬 렌더링 프로세스 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'증분 빌드: 입력이 바뀐 그림만 다시 렌더링 ({DEFAULT_MANIFEST} 사용)')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='plot/단계별 span(벽시계/CPU 시간, 최대 RSS 증가량)을 Chrome trace JSON으로 저장')
+    parser.add_argument('--batch', action='store_true',
+                        help='배치 모드: 비대화형 백엔드 사용, plt.show() 생략, 최대 메모리 보고')
+    args = parser.parse_args(argv)
+    if args.score_file:
+        score_files = dict(spec.partition('=')[::2] for spec in args.score_file)
+        missing = [name for name in PERCENTILES if not score_files.get(name)]
+        if missing:
+            parser.error(f"--score-file에 빠진 분포: {', '.join(missing)} (NAME=PATH 형식)")
+        args.score_file = score_files
+    return args
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    if args.batch:
+        enable_batch_mode()
+    if args.trace:
+        enable_tracing()
+    results = main(args.n_queries, args.cache_dir, args.jobs, args.incremental, args.sweep,
+                   args.threshold_method, args.sketch_k, args.sketch_dir, args.score_file, args.stream_jobs)
+    if args.trace:
+        save_trace(args.trace)
+    if args.batch:
+        report_peak_memory()
+    return 0 if all(r['ok'] for r in results) else 1
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(run())
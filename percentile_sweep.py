@@ -0,0 +1,72 @@
+import numpy as np
+
+from quantized_scores import QuantizedScores
+from tracing import traced
+
+@traced(cat='stats')
+def percentile_sweep(data, percentiles=None, assume_sorted=False):
+    """모든 퍼센타일 임계값에 대한 필터링 결과를 한 번에 계산 (정렬 1회 + 누적합)
+
+    임계값은 np.percentile(선형 보간)과 같고, 필터링은 (x >= 임계값)과 같음.
+    반환값: 퍼센타일별 배열 dict
+        'percentiles', 'thresholds', 'counts', 'retention', 'means', 'stds'
+        + 원본 통계 'original_count', 'original_mean', 'original_std'
+    전체 비용은 O(n log n) 정렬 + O(n) 누적합 + 퍼센타일당 O(log n).
+    QuantizedScores는 점수를 펼치지 않고 101칸 개수의 누적합만으로 계산 (O(101)).
+    """
+    if percentiles is None:
+        percentiles = np.arange(1, 100)
+    percentiles = np.asarray(percentiles, dtype=np.float64)
+
+    if isinstance(data, QuantizedScores):
+        # 값 하나당 가중치(개수)가 있는 정렬된 배열로 보고 같은 계산
+        values = data.values.astype(np.float64)
+        weights = data.counts.astype(np.float64)
+        cumulative = np.cumsum(data.counts)
+    else:
+        values = np.asarray(data, dtype=np.float64).reshape(-1)
+        if not assume_sorted:
+            values = np.sort(values)
+        weights = cumulative = None
+    n = int(cumulative[-1]) if cumulative is not None else len(values)
+    if n == 0:
+        raise ValueError('빈 데이터로는 퍼센타일을 계산할 수 없습니다')
+
+    # np.percentile 기본(linear) 방식과 같은 보간
+    pos = percentiles / 100 * (n - 1)
+    lower = np.floor(pos).astype(np.int64)
+    upper = np.minimum(lower + 1, n - 1)
+    if cumulative is not None:
+        # 정렬된 데이터의 k번째 값 = 누적 개수가 k를 넘는 첫 칸의 값
+        lower = np.searchsorted(cumulative, lower, side='right')
+        upper = np.searchsorted(cumulative, upper, side='right')
+    thresholds = values[lower] + (values[upper] - values[lower]) * (pos - np.floor(pos))
+
+    # 임계값 이상인 구간의 시작 위치 (개수 형식이면 칸 번호)
+    starts = np.searchsorted(values, thresholds, side='left')
+
+    # 수치 안정성을 위해 평균을 뺀 값으로 누적합
+    mean = values.mean() if weights is None else values @ weights / n
+    centered = values - mean
+    terms1 = centered if weights is None else centered * weights
+    terms2 = centered * terms1
+    sum1 = np.concatenate([[0.0], np.cumsum(terms1)])
+    sum2 = np.concatenate([[0.0], np.cumsum(terms2)])
+    before = starts if cumulative is None else np.concatenate([[0], cumulative])[starts]
+    counts = n - before
+    tail1 = sum1[-1] - sum1[starts]
+    tail2 = sum2[-1] - sum2[starts]
+    offset = tail1 / counts
+    variances = np.maximum(tail2 / counts - offset * offset, 0.0)
+
+    return {
+        'percentiles': percentiles,
+        'thresholds': thresholds,
+        'counts': counts,
+        'retention': counts / n,
+        'means': mean + offset,
+        'stds': np.sqrt(variances),
+        'original_count': n,
+        'original_mean': mean,
+        'original_std': np.sqrt(sum2[-1] / n - (sum1[-1] / n) ** 2),
+    }
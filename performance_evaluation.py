@@ -1,13 +1,37 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
+import argparse
+
+from batch_mode import enable_batch_mode, finish_figure, report_peak_memory
+from build_manifest import DEFAULT_MANIFEST
+from metrics_table import MetricsTable
+from render_pool import render_figures
+from significance_tests import DEFAULT_PERMUTATIONS, pairwise_tests, print_table, write_table
+from tracing import enable_tracing, save_trace, traced
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['axes.unicode_minus'] = False
 
-def create_performance_data():
-    """성능평가 데이터 생성 (MTEB FiQA dataset) - Drop 지표만"""
+def create_performance_data(drop_metrics=None):
+    """성능평가 데이터 생성 (MTEB FiQA dataset) - Drop 지표만
+
+    drop_metrics: drop_evaluation.evaluate_methods()의 {방법: {지표: 백분율}} 결과.
+    지정하면 그 값으로 표를 만들고(소수 첫째 자리 반올림), 개선도는 마지막 - 첫 번째 방법.
+    """
+    # pandas는 import 비용이 커서 표가 필요할 때만 로드
+    import pandas as pd
+    
+    if drop_metrics is not None:
+        methods = list(drop_metrics)
+        metric_names = list(drop_metrics[methods[0]])
+        data = {'Metric': metric_names}
+        for method in methods:
+            data[method] = [round(drop_metrics[method][name], 1) for name in metric_names]
+        data['Improvement (%p)'] = [round(last - first, 1)
+                                    for first, last in zip(data[methods[0]], data[methods[-1]])]
+        return pd.DataFrame(data)
+    
     data = {
         'Metric': ['Drop Precision', 'Drop Recall', 'Drop F1'],
         'SBERT+CE (Baseline)': [0.0, 0.0, 0.0],
@@ -18,29 +42,110 @@ def create_performance_data():
     }
     return pd.DataFrame(data)
 
-def plot_performance_comparison():
+# 기본 4개 방법 (Baseline -> Proposed) 과 그림별 색상
+BASELINE = 'SBERT+CE (Baseline)'
+PROPOSED = 'SBERT+CE+SDE+CBC (Proposed)'
+METHOD_LABELS = {BASELINE: 'Baseline', 'SBERT+CE+SDE': 'SDE', 'SBERT+CE+CBC': 'CBC', PROPOSED: 'Proposed'}
+DEFAULT_BAR_COLORS = ['#2ca02c', '#1f77b4', '#ff7f0e', '#8c8c8c']  # Baseline 초록, Proposed 회색
+DEFAULT_FOCUS_COLORS = ['lightblue', 'lightgreen', 'lightcoral', 'gold']
+# 범례에 표시하는 최대 방법 수 (넘으면 겹쳐서 읽을 수 없으므로 생략)
+MAX_LEGEND_ENTRIES = 12
+# 큰 행렬에서 그림 크기(인치)와 축 눈금 라벨 수 상한 (300 DPI 저장 시 메모리 폭증 방지)
+MAX_FIGURE_INCHES = 12
+MAX_TICK_LABELS = 40
+# 막대 수가 이보다 많으면 Rectangle 대신 PolyCollection 하나로 그림 (아티스트 생성/그리기 비용 절감)
+MAX_BAR_ARTISTS = 64
+
+def performance_methods(df):
+    """성능 표의 방법 열 (지표 이름, 개선도 열 제외, 표 순서 유지)"""
+    return [c for c in df.columns if c not in ('Metric', 'Improvement (%p)')]
+
+def method_label(method):
+    """범례용 짧은 방법 이름"""
+    return METHOD_LABELS.get(method, method)
+
+def method_colors(methods, default_colors):
+    """기본 4개 방법이면 기존 색상, 아니면 방법 수만큼 컬러맵에서 선택"""
+    if len(methods) == len(default_colors):
+        return list(default_colors)
+    cmap = plt.get_cmap('tab20')
+    return [cmap(i % cmap.N) for i in range(len(methods))]
+
+def set_category_ticks(ax, axis, labels, rotation=0, fontsize=10):
+    """범주 축 눈금 - 라벨이 많으면 MAX_TICK_LABELS개 이하가 되도록 건너뛰며 표시"""
+    step = max(1, int(np.ceil(len(labels) / MAX_TICK_LABELS)))
+    positions = np.arange(0, len(labels), step)
+    shown = [labels[i] for i in positions]
+    if axis == 'x':
+        ax.set_xticks(positions)
+        ax.set_xticklabels(shown, rotation=rotation, fontsize=fontsize)
+    else:
+        ax.set_yticks(positions)
+        ax.set_yticklabels(shown, rotation=rotation, fontsize=fontsize)
+
+def bar_collection(ax, x, heights, width, colors, **kwargs):
+    """막대들을 PolyCollection 하나로 그리기 (ax.bar와 같은 가운데 정렬, 꼭짓점은 배열 연산으로 생성)"""
+    from matplotlib.collections import PolyCollection
+    
+    x = np.asarray(x, dtype=float).reshape(-1)
+    heights = np.asarray(heights, dtype=float).reshape(-1)
+    left, right = x - width / 2, x + width / 2
+    zeros = np.zeros_like(heights)
+    verts = np.stack([np.column_stack([left, zeros]), np.column_stack([left, heights]),
+                      np.column_stack([right, heights]), np.column_stack([right, zeros])], axis=1)
+    collection = PolyCollection(verts, facecolors=colors, **kwargs)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    return collection
+
+def load_performance_data(path, dataset=None, baseline=None, proposed=None):
+    """JSONL/CSV 실험 결과를 create_performance_data()와 같은 형식(지표 행 x 방법 열)으로 피벗
+
+    dataset 미지정 시 데이터셋 평균. 개선도 열은 proposed - baseline
+    (미지정 시 파일에 처음/마지막으로 나온 방법).
+    """
+    import pandas as pd
+    
+    table = MetricsTable.from_file(path).select(dataset=dataset)
+    metrics, methods, matrix = table.pivot(index='metric', columns='method')
+    # 선택한 데이터셋에 없는 지표/방법은 제외
+    rows = ~np.isnan(matrix).all(axis=1)
+    cols = ~np.isnan(matrix).all(axis=0)
+    metrics = [m for m, keep in zip(metrics, rows) if keep]
+    methods = [m for m, keep in zip(methods, cols) if keep]
+    matrix = matrix[rows][:, cols]
+    
+    baseline = baseline or methods[0]
+    proposed = proposed or methods[-1]
+    df = pd.DataFrame(matrix, columns=methods)
+    df.insert(0, 'Metric', metrics)
+    df['Improvement (%p)'] = df[proposed] - df[baseline]
+    return df
+
+@traced
+def plot_performance_comparison(df=None):
     """성능평가 결과 시각화 (방법별 비교)"""
-    df = create_performance_data()
+    if df is None:
+        df = create_performance_data()
     
     # 첫 번째 그래프만 유지
     fig, ax = plt.subplots(1, 1, figsize=(6, 4))
     
-    methods = ['SBERT+CE (Baseline)', 'SBERT+CE+SDE', 'SBERT+CE+CBC', 'SBERT+CE+SDE+CBC (Proposed)']
-    method_labels = ['Baseline', 'SDE', 'CBC', 'Proposed']
-    colors = ['#2ca02c', '#1f77b4', '#ff7f0e', '#8c8c8c']  # Baseline 초록, Proposed 회색
+    methods = performance_methods(df)
+    colors = method_colors(methods, DEFAULT_BAR_COLORS)  # Baseline 초록, Proposed 회색
     line_styles = ['-', '--', '-.', ':']
-    line_widths = [2.5, 2.5, 2.5, 2.5]
+    line_width = 2.5
     metrics = df['Metric'].tolist()
     
     # 지표별 선형 그래프 (방법별 비교)
     x = np.arange(len(metrics))  # x축은 지표들
     
     for i, method in enumerate(methods):
-        values = [df.iloc[j][method] for j in range(len(metrics))]
+        values = df[method].to_numpy(dtype=float)
         
         # 선형 그래프로 표시 (색상 추가, 학술적 스타일)
-        ax.plot(x, values, color=colors[i], linestyle=line_styles[i], 
-                linewidth=line_widths[i], label=method_labels[i], alpha=0.9)
+        ax.plot(x, values, color=colors[i], linestyle=line_styles[i % len(line_styles)], 
+                linewidth=line_width, label=method_label(method), alpha=0.9)
     
     ax.set_ylabel('Percentage (%)', fontsize=10)
     ax.set_xticks(x)
@@ -50,183 +155,276 @@ def plot_performance_comparison():
     ax.set_ylim(-5, 100)
     ax.tick_params(axis='both', which='major', labelsize=8)
     
-    plt.tight_layout()
-    plt.savefig('performance_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, 'performance_comparison.png')
 
-def plot_relative_improvement():
-    """성능 점수 막대 그래프"""
-    df = create_performance_data()
+@traced
+def plot_relative_improvement(df=None):
+    """성능 점수 막대 그래프 (지표별로 방법 막대를 나란히 - 방법 수에 맞춰 막대 폭 조정)"""
+    if df is None:
+        df = create_performance_data()
     
-    # 성능 점수 데이터
-    baseline_values = [df.iloc[i]['SBERT+CE (Baseline)'] for i in range(len(df))]
-    sde_values = [df.iloc[i]['SBERT+CE+SDE'] for i in range(len(df))]
-    cbc_values = [df.iloc[i]['SBERT+CE+CBC'] for i in range(len(df))]
-    proposed_values = [df.iloc[i]['SBERT+CE+SDE+CBC (Proposed)'] for i in range(len(df))]
+    # 성능 점수 행렬 (지표 x 방법)
+    methods = performance_methods(df)
+    values = df[methods].to_numpy(dtype=float)
     
     metrics = df['Metric'].tolist()
     x = np.arange(len(metrics))
-    width = 0.15
+    width = 0.15 if len(methods) <= 4 else 0.8 / len(methods)
+    offsets = (np.arange(len(methods)) - (len(methods) - 1) / 2) * width
+    colors = method_colors(methods, DEFAULT_BAR_COLORS)
     
     fig, ax = plt.subplots(1, 1, figsize=(6, 4))
     
-    # 막대 그래프 생성 (Baseline 포함) - Baseline 초록, Proposed 회색
-    bars0 = ax.bar(x - 1.5*width, baseline_values, width, label='Baseline', 
-                   color='#2ca02c', alpha=0.8, edgecolor='black', linewidth=0.5)
-    bars1 = ax.bar(x - 0.5*width, sde_values, width, label='SDE', 
-                   color='#1f77b4', alpha=0.8, edgecolor='black', linewidth=0.5)
-    bars2 = ax.bar(x + 0.5*width, cbc_values, width, label='CBC', 
-                   color='#ff7f0e', alpha=0.8, edgecolor='black', linewidth=0.5)
-    bars3 = ax.bar(x + 1.5*width, proposed_values, width, label='Proposed', 
-                   color='#8c8c8c', alpha=0.8, edgecolor='black', linewidth=0.5, hatch='///', hatch_linewidth=0.3)
-    
-    # 수치 라벨 추가 (Baseline 포함)
-    all_bars = [bars0, bars1, bars2, bars3]
-    all_values = [baseline_values, sde_values, cbc_values, proposed_values]
-    
-    for bars, values in zip(all_bars, all_values):
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            # 모든 값 표시
-            ax.text(bar.get_x() + bar.get_width()/2., height + 1,
-                   f'{value:.1f}%', ha='center', va='bottom', 
-                   fontsize=6, fontweight='normal')
+    if values.size > MAX_BAR_ARTISTS:
+        # 막대가 많으면 전체를 컬렉션 하나로 (범례는 대리 패치, 수치 라벨 생략)
+        from matplotlib.patches import Patch
+        
+        bar_collection(ax, x[:, None] + offsets[None, :], values, width,
+                       [color for _ in metrics for color in colors], alpha=0.8)
+        handles = [Patch(facecolor=color, alpha=0.8, label=method_label(method))
+                   for method, color in zip(methods, colors)]
+    else:
+        # 막대 그래프 생성 (Baseline 포함) - Baseline 초록, Proposed 회색
+        handles = []
+        for k, method in enumerate(methods):
+            style = {'hatch': '///', 'hatch_linewidth': 0.3} if method == PROPOSED else {}
+            bars = ax.bar(x + offsets[k], values[:, k], width, label=method_label(method),
+                          color=colors[k], alpha=0.8, edgecolor='black', linewidth=0.5, **style)
+            handles.append(bars)
+            
+            # 수치 라벨 추가 (Baseline 포함)
+            for bar, value in zip(bars, values[:, k]):
+                height = bar.get_height()
+                # 모든 값 표시
+                ax.text(bar.get_x() + bar.get_width()/2., height + 1,
+                       f'{value:.1f}%', ha='center', va='bottom', 
+                       fontsize=6, fontweight='normal')
     
     ax.set_ylabel('Performance (%)', fontsize=10)
-    ax.set_xticks(x)
-    ax.set_xticklabels(metrics, rotation=0, fontsize=9)
-    ax.legend(fontsize=8, loc='upper right', labelspacing=0.5)
+    set_category_ticks(ax, 'x', metrics, rotation=0 if len(metrics) <= 10 else 90, fontsize=9)
+    if len(methods) <= MAX_LEGEND_ENTRIES:
+        ax.legend(handles=handles, fontsize=8, loc='upper right', labelspacing=0.5)
     ax.grid(True, alpha=0.3, axis='y')
     ax.set_ylim(-5, 100)
     ax.tick_params(axis='both', which='major', labelsize=8)
     
-    plt.tight_layout()
-    plt.savefig('relative_improvement.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, 'relative_improvement.png')
 
-def plot_improvement_analysis():
-    """개선도 분석 (단계별 비교)"""
-    df = create_performance_data()
+@traced
+def plot_improvement_analysis(df=None):
+    """개선도 분석 (지표별 개선도 + 첫 번째/마지막 방법 비교 - 방법/지표 수와 무관)"""
+    if df is None:
+        df = create_performance_data()
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(8, 3))
     
     metrics = df['Metric'].tolist()
-    improvements = df['Improvement (%p)'].tolist()
+    improvements = df['Improvement (%p)'].to_numpy(dtype=float)
+    x = np.arange(len(metrics))
+    rotation = 0 if len(metrics) <= 4 else 90
     
     # 개선도 막대그래프
-    colors = ['green' if x > 0 else 'red' for x in improvements]
-    bars = ax1.bar(metrics, improvements, color=colors, alpha=0.7)
+    colors = np.where(improvements > 0, 'green', 'red')
+    ax1.bar(x, improvements, color=colors, alpha=0.7)
     ax1.set_ylabel('Improvement (%p)', fontsize=12)
-    ax1.set_xticks(np.arange(len(metrics)))
-    ax1.set_xticklabels(metrics, rotation=0, fontsize=11)
+    set_category_ticks(ax1, 'x', metrics, rotation=rotation, fontsize=11)
     ax1.grid(True, alpha=0.3)
     ax1.axhline(y=0, color='black', linestyle='-', alpha=0.5)
     ax1.tick_params(axis='y', labelsize=10)
     
     
-    # Baseline vs Proposed 비교
-    baseline_values = [df.iloc[i]['SBERT+CE (Baseline)'] for i in range(len(df))]
-    proposed_values = [df.iloc[i]['SBERT+CE+SDE+CBC (Proposed)'] for i in range(len(df))]
-    
-    x = np.arange(len(metrics))
+    # Baseline(첫 번째 방법) vs Proposed(마지막 방법) 비교 (지표 x 2 행렬)
+    methods = performance_methods(df)
+    baseline, proposed = methods[0], methods[-1]
+    values = df[[baseline, proposed]].to_numpy(dtype=float)
     width = 0.35
     
-    bars1 = ax2.bar(x - width/2, baseline_values, width, label='Baseline', alpha=0.7, color='lightblue')
-    bars2 = ax2.bar(x + width/2, proposed_values, width, label='Proposed', alpha=0.7, color='gold')
+    ax2.bar(x - width/2, values[:, 0], width, label=method_label(baseline), alpha=0.7, color='lightblue')
+    ax2.bar(x + width/2, values[:, 1], width, label=method_label(proposed), alpha=0.7, color='gold')
     
     ax2.set_ylabel('Percentage (%)', fontsize=12)
-    ax2.set_xticks(x)
-    ax2.set_xticklabels(metrics, rotation=0, fontsize=11)
+    set_category_ticks(ax2, 'x', metrics, rotation=rotation, fontsize=11)
     ax2.legend(fontsize=6, loc='upper right')
     ax2.grid(True, alpha=0.3)
     ax2.tick_params(axis='y', labelsize=10)
     
-    plt.tight_layout()
-    plt.savefig('improvement_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, 'improvement_analysis.png')
 
-def plot_metric_focus():
-    """메트릭별 집중 분석 (단계별)"""
-    df = create_performance_data()
-    
-    fig, axes = plt.subplots(2, 2, figsize=(8, 5))
+@traced
+def plot_metric_focus(df=None):
+    """메트릭별 집중 분석 (단계별) - 지표 수에 맞춰 2열 격자로 배치"""
+    if df is None:
+        df = create_performance_data()
+    
+    methods = performance_methods(df)
+    values = df[methods].to_numpy(dtype=float)
+    n_metrics = len(df)
+    # 지표별 패널 + 마지막 개선도 요약 패널
+    n_rows = int(np.ceil((n_metrics + 1) / 2))
+    fig, axes = plt.subplots(n_rows, 2, figsize=(8, min(2.5 * n_rows, MAX_FIGURE_INCHES)))
     axes = axes.flatten()
     
-    methods = ['SBERT+CE (Baseline)', 'SBERT+CE+SDE', 'SBERT+CE+CBC', 'SBERT+CE+SDE+CBC (Proposed)']
-    colors = ['lightblue', 'lightgreen', 'lightcoral', 'gold']
+    colors = method_colors(methods, DEFAULT_FOCUS_COLORS)
     
     for i, metric in enumerate(df['Metric']):
-        values = [df.iloc[i][method] for method in methods]
-        
-        bars = axes[i].bar(methods, values, color=colors, alpha=0.8)
+        if len(methods) > MAX_BAR_ARTISTS:
+            bar_collection(axes[i], np.arange(len(methods)), values[i], 0.8, colors, alpha=0.8)
+        else:
+            axes[i].bar(methods, values[i], color=colors, alpha=0.8)
         axes[i].set_ylabel('Percentage (%)', fontsize=11)
-        axes[i].set_xticks(np.arange(len(methods)))
-        axes[i].set_xticklabels(methods, rotation=0, fontsize=10)
+        set_category_ticks(axes[i], 'x', methods, rotation=0 if len(methods) <= 4 else 90)
         axes[i].grid(True, alpha=0.3)
         axes[i].tick_params(axis='y', labelsize=10)
     
     # 마지막 subplot은 개선도 요약
-    improvements = df['Improvement (%p)'].tolist()
-    colors_imp = ['green' if x > 0 else 'red' for x in improvements]
-    bars = axes[3].bar(df['Metric'], improvements, color=colors_imp, alpha=0.7)
-    axes[3].set_ylabel('Improvement (%p)', fontsize=11)
-    axes[3].set_xticks(np.arange(len(df['Metric'])))
-    axes[3].set_xticklabels(df['Metric'], rotation=0, fontsize=10)
-    axes[3].grid(True, alpha=0.3)
-    axes[3].axhline(y=0, color='black', linestyle='-', alpha=0.5)
-    axes[3].tick_params(axis='y', labelsize=10)
-    
-    
-    plt.tight_layout()
-    plt.savefig('metric_focus_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    improvements = df['Improvement (%p)'].to_numpy(dtype=float)
+    colors_imp = np.where(improvements > 0, 'green', 'red')
+    summary_ax = axes[n_metrics]
+    if n_metrics > MAX_BAR_ARTISTS:
+        bar_collection(summary_ax, np.arange(n_metrics), improvements, 0.8, colors_imp, alpha=0.7)
+    else:
+        summary_ax.bar(df['Metric'], improvements, color=colors_imp, alpha=0.7)
+    summary_ax.set_ylabel('Improvement (%p)', fontsize=11)
+    set_category_ticks(summary_ax, 'x', df['Metric'].tolist(), rotation=0 if n_metrics <= 4 else 90)
+    summary_ax.grid(True, alpha=0.3)
+    summary_ax.axhline(y=0, color='black', linestyle='-', alpha=0.5)
+    summary_ax.tick_params(axis='y', labelsize=10)
+    
+    # 남는 칸은 숨김
+    for ax in axes[n_metrics + 1:]:
+        ax.set_visible(False)
+    
+    finish_figure(fig, 'metric_focus_analysis.png')
 
-def plot_performance_heatmap():
-    """성능평가 히트맵"""
-    df = create_performance_data()
+@traced
+def plot_performance_heatmap(df=None):
+    """성능평가 히트맵 (지표 x 방법 행렬을 그대로 이미지로)"""
+    if df is None:
+        df = create_performance_data()
     
     # 히트맵용 데이터 준비
-    methods = ['SBERT+CE (Baseline)', 'SBERT+CE+SDE', 'SBERT+CE+CBC', 'SBERT+CE+SDE+CBC (Proposed)']
+    methods = performance_methods(df)
     metrics = df['Metric'].tolist()
     
-    # 데이터 매트릭스 생성
-    data_matrix = []
-    for i, metric in enumerate(metrics):
-        row = []
-        for method in methods:
-            row.append(df.iloc[i][method])
-        data_matrix.append(row)
+    # 데이터 매트릭스 (지표 x 방법)
+    data_matrix = df[methods].to_numpy(dtype=float)
     
-    # 히트맵 생성
-    fig, ax = plt.subplots(figsize=(5, 3))
+    # 히트맵 생성 (행/열이 많으면 그림 크기도 키움)
+    fig, ax = plt.subplots(figsize=(min(max(5, 1.2 * len(methods)), MAX_FIGURE_INCHES),
+                                    min(max(3, 0.6 * len(metrics)), MAX_FIGURE_INCHES)))
     im = ax.imshow(data_matrix, cmap='YlOrRd', aspect='auto')
     
     # 축 레이블 설정
-    ax.set_xticks(np.arange(len(methods)))
-    ax.set_yticks(np.arange(len(metrics)))
-    ax.set_xticklabels(methods, rotation=0, fontsize=11)
-    ax.set_yticklabels(metrics, fontsize=12)
+    set_category_ticks(ax, 'x', methods, rotation=0 if len(methods) <= 4 else 90, fontsize=11)
+    set_category_ticks(ax, 'y', metrics, fontsize=12)
     ax.tick_params(axis='both', which='major', labelsize=10)
     
     plt.colorbar(im, ax=ax, label='Percentage (%)')
-    plt.tight_layout()
-    plt.savefig('performance_heatmap.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    finish_figure(fig, 'performance_heatmap.png')
+
+# main()에서 렌더링하는 독립 그림 목록 (라벨, 플롯 함수, 출력 경로)
+FIGURES = [
+    ('1. 성능평가 비교 선형그래프', plot_performance_comparison, 'performance_comparison.png'),
+    ('2. 성능 점수 막대그래프', plot_relative_improvement, 'relative_improvement.png'),
+]
+
+# 실험 결과 파일(--metrics)을 지정했을 때 렌더링하는 그림 (지표/방법 수에 맞춰 크기 조정)
+METRICS_FIGURES = [
+    ('1. 성능 점수 막대그래프', plot_relative_improvement, 'relative_improvement.png'),
+    ('2. 메트릭별 집중 분석', plot_metric_focus, 'metric_focus_analysis.png'),
+    ('3. 성능평가 히트맵', plot_performance_heatmap, 'performance_heatmap.png'),
+]
+
+@traced(cat='main')
+def main(jobs=1, incremental=False, metrics=None, dataset=None, drop_metrics=None):
+    """성능평가 시각화 실행
 
-def main():
-    """성능평가 시각화 실행"""
+    metrics: JSONL/CSV 실험 결과 파일 (지정 시 내장 표 대신 피벗해서 사용)
+    dataset: 파일에서 사용할 데이터셋 (미지정 시 데이터셋 평균)
+    drop_metrics: drop_evaluation으로 계산한 {방법: {지표: 백분율}} (지정 시 내장 표 대신 사용)
+    """
     print("성능평가 결과 시각화 생성 중...")
     
-    print("1. 성능평가 비교 선형그래프 생성 중...")
-    plot_performance_comparison()
-    
-    print("2. 성능 점수 막대그래프 생성 중...")
-    plot_relative_improvement()
+    # 성능 데이터는 한 번만 만들어 모든 플롯에서 공유
+    if metrics:
+        df = load_performance_data(metrics, dataset)
+        figures = METRICS_FIGURES
+        print(f"실험 결과: {metrics} (지표 {len(df)}개 x 방법 {len(performance_methods(df))}개)")
+    else:
+        df = create_performance_data(drop_metrics)
+        figures = FIGURES
+    
+    results = render_figures(figures, {'df': df}, jobs,
+                             manifest_path=DEFAULT_MANIFEST if incremental else None)
+    failed = [r['label'] for r in results if not r['ok']]
+    if failed:
+        print(f"실패한 시각화: {', '.join(failed)}")
+        return results
     
     print("성능평가 시각화가 완료되었습니다!")
     print("생성된 파일들:")
-    print("- performance_comparison.png (성능평가 비교)")
-    print("- relative_improvement.png (성능 점수 비교)")
+    for _, _, output in figures:
+        print(f"- {output}")
+    return results
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='성능평가 결과 시각화')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='병렬 렌더링 프로세스 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'증분 빌드: 입력이 바뀐 그림만 다시 렌더링 ({DEFAULT_MANIFEST} 사용)')
+    parser.add_argument('--metrics', metavar='PATH', default=None,
+                        help='실험 결과 JSONL/CSV (long: dataset,method,metric,value 또는 wide: dataset,method,<지표>...)')
+    parser.add_argument('--dataset', default=None,
+                        help='--metrics 파일에서 사용할 데이터셋 (기본값: 데이터셋 평균)')
+    parser.add_argument('--labels', default=None,
+                        help='드롭 정답 라벨 .npy - --scores와 함께 지정하면 Drop 지표를 직접 계산')
+    parser.add_argument('--scores', action='append', default=None, metavar='NAME=PATH',
+                        help='방법 이름과 쿼리별 점수 파일 (여러 번 지정, 첫 번째가 기준 방법)')
+    parser.add_argument('--drop-percentile', type=float, default=None,
+                        help='방법별 점수의 percentile을 드롭 임계값으로 사용 (기본값: 방법별 F1 최대 임계값)')
+    parser.add_argument('--significance', metavar='PATH', default=None,
+                        help='--scores의 모든 방법 쌍에 대한 KS/Mann-Whitney/순열 검정 표를 CSV로 저장')
+    parser.add_argument('--permutations', type=int, default=DEFAULT_PERMUTATIONS,
+                        help=f'쌍별 평균 차이 순열 검정의 순열 수 (0이면 생략, 기본값: {DEFAULT_PERMUTATIONS})')
+    parser.add_argument('--stats-jobs', type=int, default=1,
+                        help='순열 검정 배치를 나눠 실행할 프로세스 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='plot/단계별 span(벽시계/CPU 시간, 최대 RSS 증가량)을 Chrome trace JSON으로 저장')
+    parser.add_argument('--batch', action='store_true',
+                        help='배치 모드: 비대화형 백엔드 사용, plt.show() 생략, 최대 메모리 보고')
+    args = parser.parse_args(argv)
+    if args.significance and not args.scores:
+        parser.error('--significance에는 --scores가 필요합니다')
+    return args
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    if args.batch:
+        enable_batch_mode()
+    if args.trace:
+        enable_tracing()
+    drop_metrics = None
+    if args.scores:
+        from drop_evaluation import evaluate_methods, load_labels, parse_method_scores, print_metrics
+        method_scores = parse_method_scores(args.scores)
+    if args.labels and args.scores:
+        drop_metrics, thresholds = evaluate_methods(method_scores, load_labels(args.labels),
+                                                    percentile=args.drop_percentile)
+        print_metrics(drop_metrics, thresholds)
+    if args.significance:
+        rows = pairwise_tests(method_scores, args.permutations, jobs=args.stats_jobs)
+        print_table(rows)
+        write_table(args.significance, rows)
+        print(f"검정 결과 저장: {args.significance}")
+    results = main(args.jobs, args.incremental, args.metrics, args.dataset, drop_metrics)
+    if args.trace:
+        save_trace(args.trace)
+    if args.batch:
+        report_peak_memory()
+    return 0 if all(r['ok'] for r in results) else 1
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(run())
@@ -0,0 +1,253 @@
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+
+from tracing import traced
+
+# 기본 정확도 파라미터 (클수록 정확, 메모리는 약 3k개 값)
+DEFAULT_K = 200
+# 레벨이 하나 내려갈 때마다 용량을 줄이는 비율 (KLL 논문/Apache DataSketches 기본값)
+CAPACITY_RATIO = 2 / 3
+# 스트림을 나눠 넣는 단위 (원소 수)
+CHUNK_SIZE = 1 << 20
+
+def normalized_rank_error(k=DEFAULT_K):
+    """k에 따른 정규화 순위 오차 (99% 신뢰, 단일 퀀타일) - DataSketches KLL 경험식 2.296 / k^0.9723
+
+    예: k=200이면 약 1.33% -> 10번째 퍼센타일 질의 결과의 실제 순위는 8.67-11.33% 사이.
+    """
+    return 2.296 / k ** 0.9723
+
+class KLLSketch:
+    """병합 가능한 스트리밍 퀀타일 스케치 (KLL)
+
+    레벨 h의 값은 가중치 2^h를 가짐. 레벨이 용량을 넘으면 정렬 후 하나 건너 하나를
+    (시작 위치는 무작위) 다음 레벨로 올리고 나머지는 버림 -> 메모리는 n과 무관하게 O(k + log(n/k)).
+    첫 압축 전(n이 약 k 이하)에는 모든 값을 그대로 갖고 있어 np.percentile과 같은 결과.
+    min/max/개수는 항상 정확. 다른 워커의 스케치와 merge()로 합칠 수 있고 save()/load()로 저장.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        if k < 8:
+            raise ValueError('k는 8 이상이어야 합니다')
+        self.k = int(k)
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._rng = np.random.default_rng(seed)
+        self._sorted = None
+        # 스케치를 만든 데이터 설명 (JSON으로 저장되는 dict, 예: 생성기 파라미터) - 병합하면 None
+        self.source = None
+
+    def _capacity(self, level):
+        """레벨별 용량 (가장 높은 레벨이 k, 아래로 갈수록 2/3씩 감소, 최소 2)"""
+        depth = len(self.levels) - 1 - level
+        return max(2, int(math.ceil(self.k * CAPACITY_RATIO ** depth)))
+
+    @property
+    def retained(self):
+        """보관 중인 값 수 (메모리 사용량)"""
+        return sum(len(level) for level in self.levels)
+
+    def _total_capacity(self):
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self):
+        """전체 크기가 용량 합을 넘는 동안 용량을 넘은 가장 낮은 레벨을 압축"""
+        while self.retained > self._total_capacity():
+            for h, items in enumerate(self.levels):
+                if len(items) >= self._capacity(h):
+                    break
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            items = np.sort(items)
+            # 홀수 개면 하나는 현재 레벨에 남김
+            keep = items[:len(items) % 2]
+            pairs = items[len(keep):]
+            promoted = pairs[self._rng.integers(2)::2]
+            self.levels[h] = keep
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def update(self, values):
+        """값 배열 추가 (청크 단위로 넣으면 큰 스트림도 메모리 한도 안에서 처리)"""
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if len(values) == 0:
+            return self
+        for start in range(0, len(values), CHUNK_SIZE):
+            chunk = values[start:start + CHUNK_SIZE]
+            self.n += len(chunk)
+            self.min = min(self.min, float(chunk.min()))
+            self.max = max(self.max, float(chunk.max()))
+            self.levels[0] = np.concatenate([self.levels[0], chunk])
+            self._compress()
+        self._sorted = None
+        return self
+
+    def merge(self, other):
+        """다른 스케치를 합침 (같은 k 필요) - 레벨별로 이어 붙인 뒤 압축"""
+        if other.k != self.k:
+            raise ValueError(f'k가 다른 스케치는 합칠 수 없습니다 ({self.k} != {other.k})')
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        self._sorted = None
+        self.source = None
+        return self
+
+    @classmethod
+    def from_counts(cls, values, counts, k=DEFAULT_K, seed=None):
+        """값별 개수로 스케치 생성 (개수를 2진수로 나눠 가중치 2^h 레벨에 바로 넣음, 비용은 개수와 무관)"""
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        counts = np.asarray(counts, dtype=np.int64).reshape(-1)
+        sketch = cls(k, seed)
+        present = counts > 0
+        if not present.any():
+            return sketch
+        sketch.levels = [values[(counts >> h) & 1 == 1] for h in range(int(counts.max()).bit_length())]
+        sketch.n = int(counts.sum())
+        sketch.min, sketch.max = float(values[present].min()), float(values[present].max())
+        sketch._compress()
+        return sketch
+
+    def fingerprint(self):
+        """증분 빌드 입력 해시용 상태 (보관 값과 개수/범위)"""
+        return {'k': self.k, 'n': self.n, 'min': self.min, 'max': self.max, 'levels': self.levels}
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def is_exact(self):
+        """아직 압축되지 않아 모든 값을 갖고 있는지"""
+        return all(len(level) == 0 for level in self.levels[1:])
+
+    def _weighted(self):
+        """(정렬된 값, 누적 가중치) - 질의마다 다시 정렬하지 않도록 캐시"""
+        if self._sorted is None:
+            values = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(items), 1 << h, dtype=np.int64)
+                                      for h, items in enumerate(self.levels)])
+            order = np.argsort(values, kind='stable')
+            self._sorted = (values[order], np.cumsum(weights[order]))
+        return self._sorted
+
+    def percentile(self, q):
+        """퍼센타일 (0-100, 스칼라 또는 배열)
+
+        압축 전에는 np.percentile(선형 보간)과 같고,
+        이후에는 누적 가중치가 q% 순위를 처음 넘는 값 (오차는 normalized_rank_error(k) 이내).
+        """
+        if self.n == 0:
+            raise ValueError('빈 스케치로는 퍼센타일을 계산할 수 없습니다')
+        q = np.asarray(q, dtype=np.float64)
+        if self.is_exact:
+            return np.percentile(self.levels[0], q)
+        values, cumulative = self._weighted()
+        ranks = q / 100 * self.n
+        index = np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(values) - 1)
+        result = np.clip(values[index], self.min, self.max)
+        # 양 끝은 정확한 최솟값/최댓값
+        result = np.where(q <= 0, self.min, np.where(q >= 100, self.max, result))
+        return result if result.ndim else float(result)
+
+    def quantile(self, q):
+        """퀀타일 (0-1)"""
+        return self.percentile(np.asarray(q, dtype=np.float64) * 100)
+
+    def rank(self, x):
+        """x 미만 값의 비율 추정 (0-1)"""
+        if self.n == 0:
+            return 0.0
+        values, cumulative = self._weighted()
+        index = np.searchsorted(values, x, side='left')
+        below = np.where(index > 0, cumulative[np.maximum(index - 1, 0)], 0)
+        return below / self.n
+
+    def save(self, path):
+        """.npz로 저장 (쓰는 도중 중단되어도 깨진 파일이 남지 않도록 임시 파일 후 교체)"""
+        arrays = {f'level{h}': items for h, items in enumerate(self.levels)}
+        header = np.array([self.k, self.n, len(self.levels)], dtype=np.int64)
+        if self.source is not None:
+            arrays['source'] = np.array(json.dumps(self.source, sort_keys=True))
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, header=header, bounds=np.array([self.min, self.max]), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, seed=None):
+        """save()로 저장한 스케치 읽기"""
+        with np.load(path) as data:
+            k, n, n_levels = (int(v) for v in data['header'])
+            sketch = cls(k, seed)
+            sketch.levels = [data[f'level{h}'].astype(np.float64) for h in range(n_levels)]
+            sketch.n = n
+            sketch.min, sketch.max = (float(v) for v in data['bounds'])
+            if 'source' in data.files:
+                sketch.source = json.loads(str(data['source']))
+        return sketch
+
+@traced(name='sketch_build', cat='stats')
+def sketch_scores(scores, k=DEFAULT_K, seed=None, chunk_size=CHUNK_SIZE):
+    """점수 배열(메모리 매핑 가능)을 청크 단위로 읽어 스케치 생성"""
+    scores = np.asarray(scores).reshape(-1)
+    sketch = KLLSketch(k, seed)
+    for start in range(0, len(scores), chunk_size):
+        sketch.update(scores[start:start + chunk_size])
+    return sketch
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='스트리밍 퀀타일 스케치 (KLL) 생성/병합/질의')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='점수 파일(.npy/.scores)에서 스케치 생성')
+    build.add_argument('inputs', nargs='+', help='점수 파일 (여러 개면 하나의 스트림으로 합침)')
+    build.add_argument('-o', '--output', required=True, help='스케치 .npz 경로')
+    build.add_argument('-k', type=int, default=DEFAULT_K,
+                       help=f'정확도 파라미터 (기본값: {DEFAULT_K}, 오차 약 {normalized_rank_error():.2%})')
+
+    merge = commands.add_parser('merge', help='여러 워커의 스케치 병합')
+    merge.add_argument('inputs', nargs='+', help='스케치 .npz 파일')
+    merge.add_argument('-o', '--output', required=True, help='병합 결과 .npz 경로')
+
+    query = commands.add_parser('query', help='퍼센타일 질의')
+    query.add_argument('sketch', help='스케치 .npz 파일')
+    query.add_argument('--percentiles', default='10,20,30', help='쉼표 구분 퍼센타일 (기본값: 10,20,30)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'build':
+        from score_io import load_scores
+        sketch = KLLSketch(args.k)
+        for path in args.inputs:
+            sketch.merge(sketch_scores(load_scores(path)[1], args.k))
+        sketch.save(args.output)
+        print(f"스케치 저장: {args.output} (n={sketch.n}, 보관 값 {sketch.retained}개)")
+    elif args.command == 'merge':
+        sketch = KLLSketch.load(args.inputs[0])
+        for path in args.inputs[1:]:
+            sketch.merge(KLLSketch.load(path))
+        sketch.save(args.output)
+        print(f"병합 저장: {args.output} (스케치 {len(args.inputs)}개, n={sketch.n})")
+    else:
+        sketch = KLLSketch.load(args.sketch)
+        percentiles = [float(p) for p in args.percentiles.split(',')]
+        error = 0.0 if sketch.is_exact else normalized_rank_error(sketch.k)
+        print(f"n={sketch.n}, k={sketch.k}, 순위 오차 ±{error:.2%}, min={sketch.min:.4f}, max={sketch.max:.4f}")
+        for p, value in zip(percentiles, np.atleast_1d(sketch.percentile(percentiles))):
+            print(f"  {p:g}th percentile: {value:.4f}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
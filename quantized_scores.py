@@ -0,0 +1,176 @@
+import numpy as np
+
+# 소수점 둘째 자리 점수 0.00-1.00 -> 센타일 코드 0-100
+NUM_LEVELS = 101
+# 코드별 점수 값 (np.round(x, 2)로 만든 float32 점수와 같은 값)
+LEVEL_VALUES = np.arange(NUM_LEVELS, dtype=np.float32) / np.float32(100)
+
+# 한 번에 변환/집계할 원소 수
+CHUNK_SIZE = 1 << 22
+# 소수점 둘째 자리 점수로 볼 허용 오차 (float32로 저장된 점수 포함)
+QUANTIZE_TOLERANCE = 1e-6
+
+class QuantizedScores:
+    """소수점 둘째 자리 유사도 점수를 uint8 센타일 코드로 저장하는 컨테이너 (쿼리당 1바이트)
+
+    통계(히스토그램, 퍼센타일, 평균/표준편차, 최솟값/최댓값, 박스플롯)는 모두
+    101칸 bincount로부터 계산하므로 O(n) 한 번 집계 후에는 데이터 크기와 무관.
+    codes 없이 개수만으로 만들 수도 있음 (from_counts) - 이때는 순서 정보가 없음.
+    """
+
+    def __init__(self, codes=None, counts=None):
+        if codes is None and counts is None:
+            raise ValueError('codes 또는 counts가 필요합니다')
+        self.codes = None if codes is None else np.asarray(codes, dtype=np.uint8)
+        self._counts = None if counts is None else np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def from_scores(cls, scores, chunk_size=CHUNK_SIZE, rounding=False):
+        """실수 점수 배열을 센타일 코드로 변환 (청크 단위, 0-1 범위 밖이면 오류)
+
+        rounding=False면 소수점 둘째 자리가 아닌 값(QUANTIZE_TOLERANCE 초과)이 있을 때 오류,
+        True면 가장 가까운 0.01로 반올림해 저장.
+        """
+        scores = np.asarray(scores).reshape(-1)
+        codes = np.empty(len(scores), dtype=np.uint8)
+        for start in range(0, len(scores), chunk_size):
+            chunk = np.asarray(scores[start:start + chunk_size], dtype=np.float64)
+            rounded = np.rint(chunk * 100)
+            if len(chunk) and (rounded.min() < 0 or rounded.max() > NUM_LEVELS - 1):
+                raise ValueError('점수는 0.00-1.00 범위여야 합니다')
+            if (not rounding and len(chunk)
+                    and np.abs(rounded / 100 - chunk).max() > QUANTIZE_TOLERANCE):
+                raise ValueError('소수점 둘째 자리가 아닌 점수입니다 (반올림하려면 rounding=True)')
+            codes[start:start + len(chunk)] = rounded
+        return cls(codes)
+
+    @classmethod
+    def from_counts(cls, counts):
+        """센타일별 개수(길이 101)로 생성"""
+        counts = np.asarray(counts, dtype=np.int64)
+        if counts.shape != (NUM_LEVELS,):
+            raise ValueError(f'counts 길이는 {NUM_LEVELS}이어야 합니다')
+        return cls(counts=counts)
+
+    @property
+    def counts(self):
+        """센타일별 개수 (길이 101, 처음 한 번만 집계)"""
+        if self._counts is None:
+            counts = np.zeros(NUM_LEVELS, dtype=np.int64)
+            for start in range(0, len(self.codes), CHUNK_SIZE):
+                counts += np.bincount(self.codes[start:start + CHUNK_SIZE], minlength=NUM_LEVELS)
+            self._counts = counts
+        return self._counts
+
+    def fingerprint(self):
+        """증분 빌드 입력 해시용 상태 (코드가 있으면 순서까지, 없으면 개수)"""
+        return {'codes': self.codes} if self.codes is not None else {'counts': self.counts}
+
+    def __len__(self):
+        if self.codes is not None:
+            return len(self.codes)
+        return int(self._counts.sum())
+
+    def __getitem__(self, index):
+        """코드를 float32 점수로 복원 (슬라이스 단위로 읽으면 청크 처리 가능)"""
+        if self.codes is None:
+            raise TypeError('개수만 있는 QuantizedScores는 순서대로 읽을 수 없습니다')
+        return LEVEL_VALUES[self.codes[index]]
+
+    @property
+    def values(self):
+        """코드별 점수 값 (float32, 길이 101)"""
+        return LEVEL_VALUES
+
+    def to_array(self):
+        """전체 점수를 float32 배열로 복원"""
+        return self[:]
+
+    def _nonzero(self):
+        """개수가 있는 코드 범위 (최소, 최대 코드)"""
+        nonzero = np.flatnonzero(self.counts)
+        if len(nonzero) == 0:
+            raise ValueError('빈 데이터입니다')
+        return nonzero[0], nonzero[-1]
+
+    def min(self):
+        return float(LEVEL_VALUES[self._nonzero()[0]])
+
+    def max(self):
+        return float(LEVEL_VALUES[self._nonzero()[1]])
+
+    def mean(self):
+        return float(LEVEL_VALUES.astype(np.float64) @ self.counts) / len(self)
+
+    def std(self, ddof=0):
+        values = LEVEL_VALUES.astype(np.float64)
+        mean = self.mean()
+        return float(np.sqrt(np.square(values - mean) @ self.counts / (len(self) - ddof)))
+
+    def percentile(self, q):
+        """퍼센타일 (np.percentile 기본 linear 보간과 같은 결과)"""
+        q = np.asarray(q, dtype=np.float64)
+        n = len(self)
+        if n == 0:
+            raise ValueError('빈 데이터입니다')
+        cumulative = np.cumsum(self.counts)
+        pos = q / 100 * (n - 1)
+        lower = np.floor(pos).astype(np.int64)
+        upper = np.minimum(lower + 1, n - 1)
+        # 정렬된 데이터의 k번째 값 = 누적 개수가 k를 넘는 첫 코드의 값
+        values = LEVEL_VALUES.astype(np.float64)
+        lower_value = values[np.searchsorted(cumulative, lower, side='right')]
+        upper_value = values[np.searchsorted(cumulative, upper, side='right')]
+        result = lower_value + (upper_value - lower_value) * (pos - lower)
+        return float(result) if result.ndim == 0 else result
+
+    def median(self):
+        return self.percentile(50)
+
+    def histogram(self, bins=10, range=None):
+        """히스토그램 (np.histogram(점수, bins, range)와 같은 결과, 101개 값에 가중치만 적용)"""
+        if range is None:
+            range = (self.min(), self.max())
+        return np.histogram(LEVEL_VALUES, bins=bins, range=range, weights=self.counts)
+
+    def boxplot_stats(self, label=None, whis=1.5):
+        """matplotlib bxp()용 박스플롯 통계 (cbook.boxplot_stats와 같은 키)
+
+        이상치(fliers)는 점마다가 아닌 값별로 하나씩만 포함 (같은 위치에 겹쳐 그려지므로 그림은 동일).
+        """
+        q1, med, q3 = self.percentile([25, 50, 75])
+        iqr = q3 - q1
+        n = len(self)
+        present = self.counts > 0
+        values = LEVEL_VALUES.astype(np.float64)
+
+        loval = q1 - whis * iqr
+        hival = q3 + whis * iqr
+        # cbook.boxplot_stats와 같은 수염 규칙
+        below_hi = values[present & (values <= hival)]
+        whishi = q3 if len(below_hi) == 0 or below_hi.max() < q3 else below_hi.max()
+        above_lo = values[present & (values >= loval)]
+        whislo = q1 if len(above_lo) == 0 or above_lo.min() > q1 else above_lo.min()
+        fliers = values[present & ((values < whislo) | (values > whishi))]
+
+        stats = {
+            'mean': self.mean(),
+            'iqr': iqr,
+            'cilo': med - 1.57 * iqr / np.sqrt(n),
+            'cihi': med + 1.57 * iqr / np.sqrt(n),
+            'whislo': whislo,
+            'whishi': whishi,
+            'fliers': fliers,
+            'q1': q1,
+            'med': med,
+            'q3': q3,
+        }
+        if label is not None:
+            stats['label'] = label
+        return stats
+
+def as_quantized(scores, rounding=False):
+    """QuantizedScores가 아니면 센타일 코드로 변환 (소수점 둘째 자리가 아니면 rounding=True일 때만 반올림)"""
+    if isinstance(scores, QuantizedScores):
+        return scores
+    return QuantizedScores.from_scores(scores, rounding=rounding)
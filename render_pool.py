@@ -0,0 +1,132 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from batch_mode import enable_batch_mode
+from build_manifest import (figure_fingerprint, hash_inputs, is_up_to_date,
+                            load_manifest, record_output, save_manifest)
+from tracing import add_trace_events, enable_tracing, pop_trace_events, trace_origin
+
+# 워커 프로세스별 공유 데이터 (initializer에서 한 번만 전달)
+_SHARED_KWARGS = {}
+
+def _init_worker(shared_kwargs, origin=None):
+    """워커 초기화: 배치 모드(Agg 백엔드, show 생략) 후 공유 데이터 보관
+
+    origin: 부모가 추적 중이면 그 시각 기준점 (워커도 같은 시간축으로 추적)
+    """
+    enable_batch_mode()
+    if origin is not None:
+        enable_tracing(origin)
+    _SHARED_KWARGS.clear()
+    _SHARED_KWARGS.update(shared_kwargs)
+
+def _render_one(label, func, shared_kwargs):
+    """그림 하나 렌더링 후 결과(성공 여부, 소요 시간, 오류) 반환"""
+    import matplotlib.pyplot as plt
+    start = time.perf_counter()
+    try:
+        func(**shared_kwargs)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        plt.close('all')
+    return {'label': label, 'ok': error is None, 'skipped': False,
+            'seconds': time.perf_counter() - start, 'error': error}
+
+def _render_task(label, func):
+    """워커에서 실행되는 작업 (공유 데이터는 initializer에서 받은 것 사용)"""
+    result = _render_one(label, func, _SHARED_KWARGS)
+    # 워커에서 기록한 span은 결과와 함께 부모로 전달
+    result['trace_events'] = pop_trace_events()
+    return result
+
+def _report(result):
+    """그림별 완료/오류 보고"""
+    if result['ok']:
+        print(f"{result['label']} 완료 ({result['seconds']:.2f}s)")
+    else:
+        print(f"{result['label']} 실패 ({result['seconds']:.2f}s)")
+        print(result['error'])
+
+def figures_in(figures, directory):
+    """그림 목록의 출력 경로를 directory 아래로 옮긴 목록 (각 플롯 함수는 output 키워드로 저장 경로를 받음)
+
+    현재 디렉터리를 바꾸지 않으므로 호출한 쪽의 작업 디렉터리와 상대 경로 입력은 그대로 유지됨
+    """
+    moved = []
+    for label, func, output in figures:
+        path = os.path.join(directory, output)
+        moved.append((label, partial(func, output=path), path))
+    return moved
+
+def all_up_to_date(figures, data_digest, manifest_path):
+    """모든 출력이 최신 상태인지 (공유 데이터를 계산하기 전에 입력 해시만으로 확인)"""
+    manifest = load_manifest(manifest_path)
+    return all(is_up_to_date(manifest, output, figure_fingerprint(func, data_digest))
+               for _, func, output in figures)
+
+def render_figures(figures, shared_kwargs, jobs=1, manifest_path=None, data_digest=None):
+    """독립적인 그림들을 렌더링 (jobs > 1이면 프로세스 풀에서 병렬 렌더링)
+
+    figures: (라벨, 플롯 함수, 출력 경로) 목록. 각 함수는 shared_kwargs를 키워드 인자로 받음.
+    manifest_path: 지정 시 증분 빌드 - 입력/파라미터/함수와 도우미 모듈 소스가 그대로인 출력은 건너뜀
+    data_digest: 증분 빌드 입력 해시 (기본값 None이면 shared_kwargs 해시, shared_kwargs를 결정하는
+                 원본 입력의 해시를 넘기면 all_up_to_date와 같은 지문 사용)
+    반환값: 그림별 결과 dict 목록 (figures 순서 유지)
+    """
+    results = {}
+    pending = list(figures)
+    manifest = None
+    if manifest_path:
+        manifest = load_manifest(manifest_path)
+        if data_digest is None:
+            data_digest = hash_inputs(shared_kwargs)
+        fingerprints = {label: figure_fingerprint(func, data_digest)
+                        for label, func, _ in figures}
+        pending = []
+        for label, func, output in figures:
+            if is_up_to_date(manifest, output, fingerprints[label]):
+                results[label] = {'label': label, 'ok': True, 'skipped': True,
+                                  'seconds': 0.0, 'error': None}
+                print(f"{label} 최신 상태 - 건너뜀 ({output})")
+            else:
+                pending.append((label, func, output))
+
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(pending))
+
+    if jobs <= 1:
+        for label, func, _ in pending:
+            print(f"{label} 생성 중...")
+            results[label] = _render_one(label, func, shared_kwargs)
+            _report(results[label])
+    else:
+        print(f"{len(pending)}개 그림을 {jobs}개 프로세스로 병렬 렌더링 중...")
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(shared_kwargs, trace_origin())) as executor:
+            futures = {executor.submit(_render_task, label, func): label
+                       for label, func, _ in pending}
+            for future in as_completed(futures):
+                label = futures[future]
+                try:
+                    result = future.result()
+                except Exception:
+                    # 워커 프로세스 자체가 죽은 경우
+                    result = {'label': label, 'ok': False, 'skipped': False,
+                              'seconds': 0.0, 'error': traceback.format_exc()}
+                add_trace_events(result.pop('trace_events', []))
+                results[label] = result
+                _report(result)
+
+    if manifest is not None:
+        for label, _, output in pending:
+            if results[label]['ok']:
+                record_output(manifest, output, fingerprints[label])
+        save_manifest(manifest, manifest_path)
+
+    return [results[label] for label, _, _ in figures]
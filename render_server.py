@@ -0,0 +1,382 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.request
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# 워커별 분석 결과 캐시 크기 (데이터 크기/테마 조합 수)
+ANALYSIS_CACHE_SIZE = 8
+# 상태 조회용으로 보관하는 최근 작업 수
+MAX_JOBS = 1000
+# POST /render가 받는 요청 본문 형식 (다른 형식은 브라우저가 preflight 없이 보낼 수 있으므로 거부)
+REQUEST_CONTENT_TYPE = 'application/json'
+
+def _figure_registry():
+    """그림 이름 -> (데이터 종류, 플롯 함수) (워커에서 플롯 모듈을 import한 뒤 호출)"""
+    import main as query_scatter
+    import paper_visualization as pv
+    import percentile_histogram as ph
+    import performance_evaluation as pe
+
+    registry = {f'paper.{stem}': ('paper', func) for _, func, stem in pv.FIGURE_KINDS}
+    registry.update({f"percentile.{output[:-len('.png')]}": ('percentile', func)
+                     for _, func, output in ph.FIGURES + ph.SWEEP_FIGURES})
+    registry.update({f'performance.{func.__name__[len("plot_"):]}': ('performance', func)
+                     for func in (pe.plot_performance_comparison, pe.plot_relative_improvement,
+                                  pe.plot_improvement_analysis, pe.plot_metric_focus,
+                                  pe.plot_performance_heatmap)})
+    registry['scatter'] = ('scatter', query_scatter.main)
+    return registry
+
+# 워커 프로세스 상태 (initializer에서 준비)
+_REGISTRY = {}
+_ANALYSIS_CACHE = OrderedDict()
+_SCRATCH_DIR = None
+
+def _init_worker():
+    """워커 초기화: 배치 모드, 플롯 모듈 import, 글꼴 캐시 예열"""
+    global _SCRATCH_DIR
+    from batch_mode import enable_batch_mode
+    enable_batch_mode()
+    import matplotlib.pyplot as plt
+
+    _REGISTRY.update(_figure_registry())
+    # 글꼴 로드/글리프 캐시를 미리 채워 첫 작업의 지연을 줄임
+    fig = plt.figure(figsize=(2, 1))
+    fig.text(0.5, 0.5, 'Similarity Score 0.123', fontweight='bold')
+    fig.canvas.draw()
+    plt.close(fig)
+    _SCRATCH_DIR = tempfile.mkdtemp(prefix='ol-lab-render-')
+
+def _shared_inputs(kind, params):
+    """데이터 종류별 공유 입력 (데이터 생성/분석은 워커 안에서 캐시)"""
+    if kind == 'scatter':
+        return {key: params[key] for key in ('baseline', 'proposed', 'reduce', 'cell_px') if key in params}
+    if kind == 'performance':
+        key = ('performance',)
+    elif kind == 'paper':
+        key = ('paper', params.get('n_queries', 6600), params.get('density', 'hexbin'))
+    else:
+        key = ('percentile', params.get('n_queries', 1000), params.get('threshold_method', 'exact'))
+
+    if key in _ANALYSIS_CACHE:
+        _ANALYSIS_CACHE.move_to_end(key)
+        return _ANALYSIS_CACHE[key]
+
+    if kind == 'performance':
+        from performance_evaluation import create_performance_data
+        shared = {'df': create_performance_data()}
+    elif kind == 'paper':
+        from paper_visualization import compute_paper_analysis, load_paper_datasets
+        shared = {'analysis': compute_paper_analysis(*load_paper_datasets(key[1]), density=key[2])}
+    else:
+        from percentile_histogram import load_percentile_datasets
+        shared = {'datasets': load_percentile_datasets(key[1], threshold_method=key[2])}
+
+    _ANALYSIS_CACHE[key] = shared
+    if len(_ANALYSIS_CACHE) > ANALYSIS_CACHE_SIZE:
+        _ANALYSIS_CACHE.popitem(last=False)
+    return shared
+
+def render_job(figure, params, output):
+    """워커에서 그림 하나 렌더링 후 output으로 이동 -> 결과 dict
+
+    플롯 함수는 고정된 파일 이름으로 현재 디렉터리에 저장하므로
+    워커 전용 작업 디렉터리에서 실행한 뒤 만들어진 파일을 output으로 옮김.
+    """
+    import matplotlib.pyplot as plt
+    start = time.perf_counter()
+    try:
+        if figure not in _REGISTRY:
+            raise KeyError(f'알 수 없는 그림: {figure}')
+        kind, func = _REGISTRY[figure]
+        kwargs = dict(_shared_inputs(kind, params))
+        if kind == 'paper':
+            kwargs['theme'] = params.get('theme', 'color')
+        if kind == 'scatter':
+            kwargs['output'] = 'query_scatter.png'
+
+        cwd = os.getcwd()
+        os.chdir(_SCRATCH_DIR)
+        try:
+            for name in os.listdir('.'):
+                os.remove(name)
+            func(**kwargs)
+            produced = os.listdir('.')
+            if len(produced) != 1:
+                raise RuntimeError(f'출력 파일이 하나가 아닙니다: {produced}')
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+            shutil.move(os.path.join(_SCRATCH_DIR, produced[0]), output)
+        finally:
+            os.chdir(cwd)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        plt.close('all')
+    return {'ok': error is None, 'output': output, 'seconds': time.perf_counter() - start,
+            'error': error, 'pid': os.getpid()}
+
+def _result_key(figure, params):
+    """같은 그림/파라미터면 같은 결과 (입력 파일은 크기/수정 시각까지 포함)"""
+    inputs = {}
+    for key in ('baseline', 'proposed'):
+        if key in params and os.path.exists(params[key]):
+            stat = os.stat(params[key])
+            inputs[key] = (stat.st_size, stat.st_mtime_ns)
+    payload = json.dumps({'figure': figure, 'params': params, 'inputs': inputs}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def resolve_output(output, output_root):
+    """출력 경로를 output_root 아래 실제 경로로 변환 (상대 경로는 output_root 기준)
+
+    심볼릭 링크나 '..'로 output_root 밖을 가리키면 ValueError.
+    """
+    root = os.path.realpath(output_root)
+    path = os.path.realpath(os.path.join(root, output))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f'출력 경로는 {root} 아래여야 합니다: {output}')
+    return path
+
+class RenderService:
+    """작업 큐(프로세스 풀) + 렌더링 결과 캐시
+
+    같은 그림/파라미터 요청이 반복되면 이전에 렌더링한 PNG를 복사해 반환.
+    데이터 생성기는 시드가 고정이고 서버가 떠 있는 동안 코드도 바뀌지 않으므로 결과는 같음.
+    출력은 output_root(기본값: 서버를 시작한 디렉터리) 아래에만 씀.
+    jobs는 HTTP 처리 스레드와 완료 콜백이 함께 쓰므로 항상 lock을 잡고 접근.
+    """
+
+    def __init__(self, workers=2, result_cache=True, output_root=None):
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self.cache_dir = tempfile.mkdtemp(prefix='ol-lab-render-cache-') if result_cache else None
+        self.output_root = os.path.realpath(output_root or os.getcwd())
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, figure, params, output):
+        """작업 등록 -> 작업 ID (output이 output_root 밖이면 ValueError)"""
+        output = resolve_output(output, self.output_root)
+        job_id = uuid.uuid4().hex[:12]
+        key = _result_key(figure, params)
+        cached = os.path.join(self.cache_dir, f'{key}.png') if self.cache_dir else None
+        job = {'id': job_id, 'figure': figure, 'params': params, 'output': output,
+               'status': 'queued', 'submitted': time.time(), 'result': None, 'done': threading.Event()}
+        with self.lock:
+            self.jobs[job_id] = job
+            # 오래된 완료 작업부터 정리
+            finished = [jid for jid, j in self.jobs.items() if j['done'].is_set()]
+            for jid in finished[:max(0, len(self.jobs) - MAX_JOBS)]:
+                del self.jobs[jid]
+
+        if cached and os.path.exists(cached):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            shutil.copyfile(cached, output)
+            self._finish(job, {'ok': True, 'output': output, 'seconds': 0.0, 'error': None,
+                               'pid': os.getpid(), 'cached': True})
+            return job_id
+
+        future = self.executor.submit(render_job, figure, params, output)
+
+        def done(f):
+            try:
+                result = f.result()
+            except Exception:
+                result = {'ok': False, 'output': output, 'seconds': 0.0,
+                          'error': traceback.format_exc(), 'pid': None}
+            if result['ok'] and cached:
+                shutil.copyfile(output, cached)
+            result['cached'] = False
+            self._finish(job, result)
+        future.add_done_callback(done)
+        return job_id
+
+    def _finish(self, job, result):
+        with self.lock:
+            job['result'] = result
+            job['status'] = 'done' if result['ok'] else 'failed'
+        job['done'].set()
+
+    def wait(self, job_id, timeout=None):
+        with self.lock:
+            job = self.jobs[job_id]
+        job['done'].wait(timeout)
+        with self.lock:
+            return self._snapshot(job)
+
+    def describe(self, job_id):
+        """작업 상태 사본 (없으면 None)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return None if job is None else self._snapshot(job)
+
+    @staticmethod
+    def _snapshot(job):
+        return {key: value for key, value in job.items() if key != 'done'}
+
+    def job_count(self):
+        with self.lock:
+            return len(self.jobs)
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+        if self.cache_dir:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+def _make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        """POST /render, GET /jobs/<id>, GET /figures, GET /health"""
+
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, {'ok': True, 'jobs': service.job_count()})
+            elif self.path == '/figures':
+                self._send(200, {'figures': FIGURE_NAMES})
+            elif self.path.startswith('/jobs/'):
+                job_id = self.path[len('/jobs/'):]
+                job = service.describe(job_id)
+                if job is not None:
+                    self._send(200, job)
+                else:
+                    self._send(404, {'error': f'작업 없음: {job_id}'})
+            else:
+                self._send(404, {'error': f'알 수 없는 경로: {self.path}'})
+
+        def do_POST(self):
+            if self.path != '/render':
+                self._send(404, {'error': f'알 수 없는 경로: {self.path}'})
+                return
+            if self.headers.get_content_type() != REQUEST_CONTENT_TYPE:
+                self._send(415, {'error': f'Content-Type은 {REQUEST_CONTENT_TYPE}이어야 합니다'})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                figure, output = request['figure'], request['output']
+                if not isinstance(output, str):
+                    raise ValueError('output은 문자열이어야 합니다')
+            except (ValueError, KeyError, TypeError) as exc:
+                self._send(400, {'error': f'잘못된 요청: {exc!r} (figure, output 필요)'})
+                return
+            if figure not in FIGURE_NAMES:
+                self._send(400, {'error': f'알 수 없는 그림: {figure}'})
+                return
+            try:
+                job_id = service.submit(figure, request.get('params', {}), output)
+            except ValueError as exc:
+                self._send(400, {'error': str(exc)})
+                return
+            if request.get('wait', True):
+                job = service.wait(job_id)
+                self._send(200 if job['status'] == 'done' else 500, job)
+            else:
+                self._send(202, service.describe(job_id))
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+# 서버가 받는 그림 이름 (부모 프로세스에서는 플롯 모듈을 import하지 않도록 고정 목록 사용)
+FIGURE_NAMES = [
+    'paper.kde_comparison', 'paper.histogram_comparison', 'paper.boxplot_comparison',
+    'paper.violin_comparison', 'paper.hexbin_comparison', 'paper.statistical_summary',
+    'percentile.percentile_histograms', 'percentile.percentile_comparison',
+    'percentile.percentile_statistics', 'percentile.percentile_sweep',
+    'performance.performance_comparison', 'performance.relative_improvement',
+    'performance.improvement_analysis', 'performance.metric_focus', 'performance.performance_heatmap',
+    'scatter',
+]
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=2, result_cache=True, output_root=None):
+    """렌더링 서버 실행 (Ctrl+C로 종료)"""
+    service = RenderService(workers, result_cache, output_root)
+    # 워커를 미리 띄워 첫 요청부터 예열된 상태로 처리
+    for _ in range(workers):
+        service.executor.submit(os.getpid)
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    print(f"렌더링 서버 시작: http://{host}:{port} (워커 {workers}개, 출력 루트 {service.output_root})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        print("렌더링 서버 종료")
+
+def request_render(figure, output, params=None, host=DEFAULT_HOST, port=DEFAULT_PORT, wait=True):
+    """서버에 렌더링 요청 -> 작업 정보 dict"""
+    body = json.dumps({'figure': figure, 'output': os.path.abspath(output),
+                       'params': params or {}, 'wait': wait}).encode('utf-8')
+    req = urllib.request.Request(f'http://{host}:{port}/render', data=body,
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as exc:
+        return json.load(exc)
+
+def _parse_param(text):
+    """key=value 파라미터 (값은 JSON으로 해석, 실패하면 문자열)"""
+    key, _, value = text.partition('=')
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='상주 렌더링 서버 (localhost HTTP)')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'주소 (기본값: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'포트 (기본값: {DEFAULT_PORT})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='서버 실행')
+    serve_parser.add_argument('-j', '--workers', type=int, default=2, help='렌더링 워커 프로세스 수 (기본값: 2)')
+    serve_parser.add_argument('--no-result-cache', action='store_true',
+                              help='같은 요청이어도 항상 다시 렌더링')
+    serve_parser.add_argument('--output-root', default=None,
+                              help='요청한 출력 경로가 있어야 하는 디렉터리 (기본값: 현재 디렉터리)')
+
+    request_parser = commands.add_parser('request', help='렌더링 요청')
+    request_parser.add_argument('figure', choices=FIGURE_NAMES, metavar='FIGURE',
+                                help=f"그림 이름 ({', '.join(FIGURE_NAMES)})")
+    request_parser.add_argument('output', help='저장할 이미지 경로')
+    request_parser.add_argument('--param', action='append', default=[], type=_parse_param,
+                                metavar='KEY=VALUE',
+                                help='그림 파라미터 (예: n_queries=100000, theme=bw, reduce=true)')
+    request_parser.add_argument('--no-wait', action='store_true', help='완료를 기다리지 않고 작업 ID만 받음')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'serve':
+        serve(args.host, args.port, args.workers, not args.no_result_cache, args.output_root)
+        return 0
+    job = request_render(args.figure, args.output, dict(args.param), args.host, args.port,
+                         wait=not args.no_wait)
+    print(json.dumps(job, ensure_ascii=False, indent=2))
+    return 0 if job.get('status') in ('done', 'queued') else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+
+from tracing import traced
+
+# 열(column) 형식 점수 디렉터리: 열마다 .npy 파일 하나
+# (예: baseline.scores/query_id.npy, baseline.scores/score.npy)
+COLUMNAR_SUFFIX = '.scores'
+QUERY_ID_COLUMN = 'query_id'
+SCORE_COLUMN = 'score'
+
+def _save_npy(path, array):
+    """.npy 저장 (쓰는 도중 중단되어도 깨진 파일이 남지 않도록 임시 파일 후 교체)"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+def save_scores(path, scores, query_ids=None):
+    """점수 저장
+
+    path가 .npy면 점수 배열만 저장 (쿼리 번호는 1부터 순서대로).
+    그 외(.scores 디렉터리)는 열 형식으로 저장하며 query_ids를 함께 기록.
+    """
+    scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+    if str(path).endswith('.npy'):
+        if query_ids is not None:
+            raise ValueError('.npy 형식에는 쿼리 ID를 저장할 수 없습니다 (.scores 디렉터리 사용)')
+        _save_npy(path, scores)
+        return
+
+    if query_ids is None:
+        query_ids = np.arange(1, len(scores) + 1, dtype=np.int64)
+    query_ids = np.asarray(query_ids, dtype=np.int64).reshape(-1)
+    if len(query_ids) != len(scores):
+        raise ValueError(f'쿼리 ID({len(query_ids)})와 점수({len(scores)}) 개수가 다릅니다')
+    os.makedirs(path, exist_ok=True)
+    _save_npy(os.path.join(path, f'{QUERY_ID_COLUMN}.npy'), query_ids)
+    _save_npy(os.path.join(path, f'{SCORE_COLUMN}.npy'), scores)
+
+def _load_column(path, column):
+    """열 형식 디렉터리의 열 하나를 메모리 매핑으로 열기 (열 파일이 없으면 오류)"""
+    column_path = os.path.join(path, f'{column}.npy')
+    if not os.path.exists(column_path):
+        raise ValueError(f'{path}: {column} 열이 없습니다')
+    return np.load(column_path, mmap_mode='r')
+
+@traced(name='data_load', cat='data')
+def load_scores(path):
+    """점수 파일을 메모리 매핑으로 열기 -> (쿼리 ID 또는 None, 점수)
+
+    파싱 없이 매핑만 하므로 여는 비용은 실제로 읽는 페이지 수에 비례.
+    .npy 파일이면 쿼리 ID는 None (호출 측에서 1부터 순서대로 사용).
+    """
+    if os.path.isdir(path):
+        scores, query_ids = (_load_column(path, column) for column in (SCORE_COLUMN, QUERY_ID_COLUMN))
+        if len(query_ids) != len(scores):
+            raise ValueError(f'{path}: 쿼리 ID와 점수 열의 길이가 다릅니다')
+        return query_ids, scores
+    return None, np.load(path, mmap_mode='r')
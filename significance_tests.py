@@ -0,0 +1,266 @@
+import argparse
+import csv
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from quantized_scores import CHUNK_SIZE, LEVEL_VALUES, QUANTIZE_TOLERANCE, QuantizedScores
+from tracing import enable_tracing, save_trace, traced
+
+DEFAULT_PERMUTATIONS = 100000
+# 배치당 순열 수 (개수 형식) / 배치당 난수 키 행렬 원소 수 상한 (원본 배열 형식, 키 + 인덱스 약 64MB)
+COUNT_BATCH_SIZE = 10000
+MAX_PERMUTATION_ELEMENTS = 1 << 22
+# 결과 표 열
+TABLE_COLUMNS = ('group_a', 'group_b', 'n_a', 'n_b', 'test', 'statistic', 'p_value', 'effect')
+
+# 워커 프로세스별 공유 데이터 (initializer에서 한 번만 전달)
+_SHARED = {}
+
+def _level_counts(data):
+    """QuantizedScores면 101칸 개수, 아니면 None (원본 배열 경로 사용)"""
+    return data.counts.astype(np.int64) if isinstance(data, QuantizedScores) else None
+
+def quantize_if_exact(scores):
+    """소수점 둘째 자리 점수면 QuantizedScores로, 아니면 원본 배열 그대로 (반올림으로 값이 바뀌지 않도록 청크별 확인)"""
+    if isinstance(scores, QuantizedScores):
+        return scores
+    scores = np.asarray(scores).reshape(-1)
+    for start in range(0, len(scores), CHUNK_SIZE):
+        chunk = np.asarray(scores[start:start + CHUNK_SIZE], dtype=np.float64)
+        if len(chunk) and (chunk.min() < 0 or chunk.max() > 1
+                           or np.abs(np.rint(chunk * 100) / 100 - chunk).max() > QUANTIZE_TOLERANCE):
+            return scores
+    return QuantizedScores.from_scores(scores)
+
+def ks_test(a, b):
+    """두 표본 Kolmogorov-Smirnov 검정 -> (D, p)
+
+    QuantizedScores 두 개면 101칸 누적 분포 차이의 최댓값으로 D를 계산하고
+    p는 scipy.stats.ks_2samp(method='asymp')와 같은 kstwo 근사 (값이 겹치는 이산 데이터에서는 보수적).
+    """
+    from scipy import stats
+    counts_a, counts_b = _level_counts(a), _level_counts(b)
+    if counts_a is None or counts_b is None:
+        result = stats.ks_2samp(np.asarray(a).reshape(-1), np.asarray(b).reshape(-1), method='asymp')
+        return float(result.statistic), float(result.pvalue)
+    n, m = counts_a.sum(), counts_b.sum()
+    d = float(np.abs(np.cumsum(counts_a) / n - np.cumsum(counts_b) / m).max())
+    en = n * m / (n + m)
+    return d, float(np.clip(stats.kstwo.sf(d, np.round(en)), 0, 1))
+
+def mann_whitney_test(a, b):
+    """Mann-Whitney U 검정 (양측, 연속성 보정, 동점 보정 정규 근사) -> (U_a, p, AUC)
+
+    QuantizedScores 두 개면 값별 개수로 평균 순위(midrank)를 구해 정렬 없이 계산
+    (scipy.stats.mannwhitneyu(method='asymptotic')와 같은 값).
+    AUC = U_a / (n_a n_b) = P(a > b) + P(a = b) / 2
+    """
+    counts_a, counts_b = _level_counts(a), _level_counts(b)
+    if counts_a is None or counts_b is None:
+        from scipy import stats
+        a, b = np.asarray(a).reshape(-1), np.asarray(b).reshape(-1)
+        result = stats.mannwhitneyu(a, b, alternative='two-sided', method='asymptotic')
+        return float(result.statistic), float(result.pvalue), float(result.statistic) / (len(a) * len(b))
+    n_a, n_b = int(counts_a.sum()), int(counts_b.sum())
+    ties = (counts_a + counts_b).astype(np.float64)
+    midranks = np.cumsum(ties) - ties + (ties + 1) / 2
+    u_a = float(counts_a @ midranks) - n_a * (n_a + 1) / 2
+    n = n_a + n_b
+    mean = n_a * n_b / 2
+    var = n_a * n_b / 12 * ((n + 1) - float((ties ** 3 - ties).sum()) / (n * (n - 1)))
+    z = (abs(u_a - mean) - 0.5) / math.sqrt(var) if var > 0 else 0.0
+    p = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return u_a, min(p, 1.0), u_a / (n_a * n_b)
+
+def _mean_difference_batch(size, seed):
+    """순열 배치 하나 -> (size,) 평균 차이 (mean(b) - mean(a)), 공유 데이터는 _SHARED
+
+    개수 형식: 합친 101칸 개수에서 a 크기만큼 다변량 초기하 분포로 뽑음 (쿼리 수와 무관)
+    원본 배열 형식: (size, n_a + n_b) 난수 키 행렬을 행마다 argpartition해 키가 작은 min(n_a, n_b)개를
+    작은 쪽 집단으로 뽑음 (배치 전체를 한 번에 추출, 행마다 균등한 비복원 추출)
+    """
+    rng = np.random.default_rng(seed)
+    n_a, n_b = _SHARED['n_a'], _SHARED['n_b']
+    if 'pooled_counts' in _SHARED:
+        pooled = _SHARED['pooled_counts']
+        values = LEVEL_VALUES.astype(np.float64)
+        counts_a = rng.multivariate_hypergeometric(pooled, n_a, size=size)
+        sum_a = counts_a @ values
+        return (_SHARED['total'] - sum_a) / n_b - sum_a / n_a
+    # 평균 차이는 작은 쪽 집단의 합만으로 정해지므로 그 크기만큼만 뽑아 더함
+    pooled, k = _SHARED['pooled'], min(n_a, n_b)
+    keys = rng.random((size, len(pooled)))
+    index = np.argpartition(keys, k - 1, axis=1)[:, :k]
+    del keys
+    sum_small = pooled[index].sum(axis=1)
+    sum_a = sum_small if k == n_a else _SHARED['total'] - sum_small
+    return (_SHARED['total'] - sum_a) / n_b - sum_a / n_a
+
+def _init_worker(shared):
+    _SHARED.clear()
+    _SHARED.update(shared)
+
+def _permutation_task(size, seed):
+    return _mean_difference_batch(size, seed)
+
+@traced(name='permutation_test', cat='stats')
+def permutation_test(a, b, n_permutations=DEFAULT_PERMUTATIONS, seed=0, jobs=1):
+    """평균 차이(mean(b) - mean(a))의 양측 순열 검정 -> (관측 차이, p)
+
+    p = (|순열 차이| >= |관측 차이|인 순열 수 + 1) / (순열 수 + 1). seed: 정수 또는 SeedSequence
+    배치마다 SeedSequence(seed).spawn()으로 독립 난수 스트림을 쓰므로
+    jobs(프로세스 수)와 관계없이 같은 seed면 같은 결과.
+    """
+    counts_a, counts_b = _level_counts(a), _level_counts(b)
+    values = LEVEL_VALUES.astype(np.float64)
+    if counts_a is not None and counts_b is not None:
+        n_a, n_b = int(counts_a.sum()), int(counts_b.sum())
+        sum_a, sum_b = float(counts_a @ values), float(counts_b @ values)
+        shared = {'pooled_counts': counts_a + counts_b}
+        batch_size = COUNT_BATCH_SIZE
+    else:
+        a = np.asarray(a.to_array() if isinstance(a, QuantizedScores) else a, dtype=np.float64).reshape(-1)
+        b = np.asarray(b.to_array() if isinstance(b, QuantizedScores) else b, dtype=np.float64).reshape(-1)
+        n_a, n_b = len(a), len(b)
+        sum_a, sum_b = float(a.sum()), float(b.sum())
+        shared = {'pooled': np.concatenate([a, b])}
+        batch_size = max(1, MAX_PERMUTATION_ELEMENTS // (n_a + n_b))
+    shared.update(n_a=n_a, n_b=n_b, total=sum_a + sum_b)
+    observed = sum_b / n_b - sum_a / n_a
+
+    sizes = [batch_size] * (n_permutations // batch_size)
+    if n_permutations % batch_size:
+        sizes.append(n_permutations % batch_size)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(sizes))
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(sizes))
+    if jobs <= 1:
+        _init_worker(shared)
+        batches = [_mean_difference_batch(size, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(shared,)) as executor:
+            batches = list(executor.map(_permutation_task, sizes, seeds))
+    differences = np.concatenate(batches)
+    # 부동소수점 합 순서 차이로 관측값과 같은 순열이 빠지지 않도록 작은 허용 오차
+    extreme = np.count_nonzero(np.abs(differences) >= abs(observed) - 1e-12)
+    return observed, (extreme + 1) / (len(differences) + 1)
+
+def compare_distributions(a, b, n_permutations=DEFAULT_PERMUTATIONS, seed=0, jobs=1):
+    """KS, Mann-Whitney, 순열 검정을 한 번에 -> 검정별 dict
+
+    {'ks': (D, p), 'mann_whitney': (U, p, AUC), 'permutation': (평균 차이, p) 또는 None, 'n': (n_a, n_b)}
+    n_permutations=0이면 순열 검정 생략.
+    """
+    return {
+        'ks': ks_test(a, b),
+        'mann_whitney': mann_whitney_test(a, b),
+        'permutation': permutation_test(a, b, n_permutations, seed, jobs) if n_permutations else None,
+        'n_permutations': n_permutations,
+        'n': (len(a), len(b)),
+    }
+
+def result_rows(name_a, name_b, result):
+    """compare_distributions 결과 -> 표 행 목록 (TABLE_COLUMNS 순서의 dict)"""
+    n_a, n_b = result['n']
+    base = {'group_a': name_a, 'group_b': name_b, 'n_a': n_a, 'n_b': n_b}
+    d, p = result['ks']
+    rows = [dict(base, test='ks', statistic=d, p_value=p, effect=d)]
+    u, p, auc = result['mann_whitney']
+    rows.append(dict(base, test='mann_whitney', statistic=u, p_value=p, effect=auc))
+    if result['permutation'] is not None:
+        diff, p = result['permutation']
+        rows.append(dict(base, test=f"permutation_mean_{result['n_permutations']}", statistic=diff,
+                         p_value=p, effect=diff))
+    return rows
+
+@traced(name='pairwise_tests', cat='stats')
+def pairwise_tests(method_scores, n_permutations=DEFAULT_PERMUTATIONS, seed=0, jobs=1):
+    """모든 방법 쌍에 대한 검정 -> 표 행 목록 (쌍마다 seed에서 독립 스트림 분기)
+
+    method_scores: {방법: 점수 배열 또는 QuantizedScores} - 소수점 둘째 자리 점수면
+    센타일 개수로 변환해 개수 경로를 사용.
+    """
+    quantized = {method: quantize_if_exact(scores) for method, scores in method_scores.items()}
+    pairs = list(itertools.combinations(quantized, 2))
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+    rows = []
+    for (name_a, name_b), pair_seed in zip(pairs, seeds):
+        result = compare_distributions(quantized[name_a], quantized[name_b], n_permutations, pair_seed, jobs)
+        rows += result_rows(name_a, name_b, result)
+    return rows
+
+def write_table(path, rows):
+    """검정 결과 표를 CSV로 저장"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=TABLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def format_p(p):
+    """그림/표 출력용 p값 문자열"""
+    if p < 1e-300:
+        return 'p < 1e-300'
+    if p < 1e-3:
+        return f'p = {p:.1e}'
+    return f'p = {p:.3f}'
+
+def annotation_text(result):
+    """그림에 붙일 검정 요약 (여러 줄)"""
+    d, ks_p = result['ks']
+    _, mw_p, auc = result['mann_whitney']
+    lines = [f'KS D = {d:.3f}, {format_p(ks_p)}',
+             f'Mann-Whitney AUC = {auc:.3f}, {format_p(mw_p)}']
+    if result['permutation'] is not None:
+        diff, perm_p = result['permutation']
+        lines.append(f"Permutation Δmean = {diff:+.3f}, {format_p(perm_p)} ({result['n_permutations']} perms)")
+    return '\n'.join(lines)
+
+def print_table(rows):
+    """검정 결과 표 출력"""
+    print(f"{'A':<24}{'B':<24}{'test':<28}{'statistic':>14}{'p':>12}{'effect':>10}")
+    for row in rows:
+        print(f"{row['group_a']:<24}{row['group_b']:<24}{row['test']:<28}"
+              f"{row['statistic']:>14.4g}{row['p_value']:>12.3g}{row['effect']:>10.4f}")
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='방법별 점수 분포의 쌍별 KS/Mann-Whitney/순열 검정')
+    parser.add_argument('--method', action='append', required=True, metavar='NAME=PATH',
+                        help='방법 이름과 점수 파일 (.npy 또는 .scores, 두 번 이상 지정)')
+    parser.add_argument('--permutations', type=int, default=DEFAULT_PERMUTATIONS,
+                        help=f'평균 차이 순열 검정의 순열 수 (0이면 생략, 기본값: {DEFAULT_PERMUTATIONS})')
+    parser.add_argument('--seed', type=int, default=0, help='순열 난수 시드 (기본값: 0)')
+    parser.add_argument('-o', '--output', default=None, help='결과 표 CSV 경로')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='순열 배치를 나눠 실행할 프로세스 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='단계별 span을 Chrome trace JSON으로 저장')
+    args = parser.parse_args(argv)
+    if len(args.method) < 2:
+        parser.error('--method를 두 번 이상 지정해야 합니다')
+    return args
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    from drop_evaluation import parse_method_scores
+    args = parse_args(argv)
+    if args.trace:
+        enable_tracing()
+    rows = pairwise_tests(parse_method_scores(args.method), args.permutations, args.seed, args.jobs)
+    print_table(rows)
+    if args.output:
+        write_table(args.output, rows)
+        print(f"결과 저장: {args.output}")
+    if args.trace:
+        save_trace(args.trace)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(run())
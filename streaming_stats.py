@@ -0,0 +1,291 @@
+import argparse
+import io
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from quantile_sketch import DEFAULT_K, KLLSketch
+from quantized_scores import LEVEL_VALUES, NUM_LEVELS, QUANTIZE_TOLERANCE, QuantizedScores
+from tracing import enable_tracing, save_trace, span, traced
+
+# 한 번에 읽어 집계할 점수 수 (float32 기준 약 16MB)
+CHUNK_SIZE = 1 << 22
+# 텍스트 로그를 읽는 단위 (바이트, 블록 하나가 풀 작업 하나)
+TEXT_BLOCK_BYTES = 1 << 24
+# 처리 중인 청크 외에 미리 읽어 둘 청크 수 (메모리는 (jobs + PREFETCH) x 청크 크기로 제한)
+PREFETCH = 2
+# 통계 출력 순서 (paper_visualization.compute_summary_stats와 같은 키)
+SUMMARY_KEYS = ('Mean', 'Median', 'Std', 'Min', 'Max')
+
+class RunningStats:
+    """단일 패스 요약 통계 누적기 (청크별 결과를 merge()로 합침)
+
+    평균/분산: Welford/Chan 병합 (큰 n에서도 합/제곱합 방식의 자릿수 손실 없음)
+    최솟값/최댓값: 항상 정확
+    중앙값/퍼센타일: 소수점 둘째 자리 점수인 동안은 101칸 개수로 정확하게 (np.percentile과 같음),
+    아닌 값이 한 번이라도 들어오면 그때까지의 개수를 KLL 스케치로 옮겨 근사
+    (정규화 순위 오차 quantile_sketch.normalized_rank_error(k) 이내).
+    """
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.counts = np.zeros(NUM_LEVELS, dtype=np.int64)
+        self.sketch = None
+
+    @classmethod
+    def from_chunk(cls, chunk, k=DEFAULT_K, seed=None):
+        """청크 하나의 통계 (벡터화) - 스레드 풀 작업 단위"""
+        stats = cls(k)
+        chunk = np.asarray(chunk, dtype=np.float64).reshape(-1)
+        if len(chunk) == 0:
+            return stats
+        stats.n = len(chunk)
+        stats.mean = float(chunk.mean())
+        centered = chunk - stats.mean
+        stats.m2 = float(centered @ centered)
+        stats.min, stats.max = float(chunk.min()), float(chunk.max())
+        codes = np.rint(chunk * 100)
+        if (stats.min >= 0 and stats.max <= 1
+                and np.abs(codes / 100 - chunk).max() <= QUANTIZE_TOLERANCE):
+            stats.counts = np.bincount(codes.astype(np.int64), minlength=NUM_LEVELS)
+        else:
+            stats.counts = None
+            stats.sketch = KLLSketch(k, seed).update(chunk)
+        return stats
+
+    @property
+    def is_quantized(self):
+        """모든 값이 소수점 둘째 자리라 개수로 정확하게 계산되는지"""
+        return self.counts is not None
+
+    def _to_sketch(self):
+        if self.counts is not None:
+            self.sketch = KLLSketch.from_counts(LEVEL_VALUES, self.counts, self.k, seed=0)
+            self.counts = None
+        return self.sketch
+
+    def merge(self, other):
+        """다른 누적기 합치기 (Chan et al. 병렬 분산 공식)"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+        else:
+            n = self.n + other.n
+            delta = other.mean - self.mean
+            self.mean += delta * other.n / n
+            self.m2 += other.m2 + delta * delta * self.n * other.n / n
+            self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if self.counts is not None and other.counts is not None:
+            self.counts = self.counts + other.counts
+        else:
+            other_sketch = other.sketch if other.counts is None else \
+                KLLSketch.from_counts(LEVEL_VALUES, other.counts, self.k, seed=0)
+            self._to_sketch().merge(other_sketch)
+        return self
+
+    def update(self, values):
+        """값 배열 추가"""
+        return self.merge(RunningStats.from_chunk(values, self.k))
+
+    def fingerprint(self):
+        """증분 빌드 입력 해시용 상태 (누적 통계와 개수 또는 스케치)"""
+        return {'k': self.k, 'n': self.n, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max,
+                'counts': self.counts, 'sketch': None if self.sketch is None else self.sketch.fingerprint()}
+
+    def __len__(self):
+        return self.n
+
+    def var(self, ddof=0):
+        return self.m2 / (self.n - ddof) if self.n > ddof else 0.0
+
+    def std(self, ddof=0):
+        return math.sqrt(self.var(ddof))
+
+    def quantized(self):
+        """개수 형식이면 QuantizedScores (순서 정보 없음), 아니면 None"""
+        return QuantizedScores.from_counts(self.counts) if self.counts is not None else None
+
+    def percentile(self, q):
+        """퍼센타일 (개수 형식이면 정확, 스케치면 근사)"""
+        if self.n == 0:
+            raise ValueError('빈 데이터로는 퍼센타일을 계산할 수 없습니다')
+        if self.counts is not None:
+            return self.quantized().percentile(q)
+        return self.sketch.percentile(q)
+
+    def median(self):
+        return self.percentile(50)
+
+    def filtered(self, threshold):
+        """threshold 이상인 값의 {'Mean', 'Std', 'Count'} (percentile_histogram 필터와 같은 규칙)
+
+        개수 형식이면 정확, 스케치면 보관 값과 가중치로 근사.
+        """
+        if self.counts is not None:
+            values, weights = LEVEL_VALUES.astype(np.float64), self.counts
+        else:
+            values = np.concatenate(self.sketch.levels)
+            weights = np.concatenate([np.full(len(items), 1 << h, dtype=np.int64)
+                                      for h, items in enumerate(self.sketch.levels)])
+        keep = values >= threshold
+        count = int(weights[keep].sum())
+        if count == 0:
+            return {'Mean': 0.0, 'Std': 0.0, 'Count': 0}
+        mean = float(values[keep] @ weights[keep]) / count
+        var = float(np.square(values[keep] - mean) @ weights[keep]) / count
+        return {'Mean': mean, 'Std': math.sqrt(var), 'Count': count}
+
+    def summary(self):
+        """Mean/Median/Std/Min/Max"""
+        return {'Mean': self.mean, 'Median': float(self.median()), 'Std': self.std(),
+                'Min': self.min, 'Max': self.max}
+
+def parse_text_block(block):
+    """줄 단위로 끊긴 텍스트 블록 -> 점수 배열 (각 줄의 마지막 쉼표 구분 열)
+
+    보통은 np.loadtxt(C 파서)로 한 번에 읽고, 숫자가 아닌 칸(헤더, '-' 같은 결측 표시)이 섞인
+    블록만 줄 단위로 다시 읽어 그 칸을 건너뜀. nan/inf도 점수가 아니므로 버림.
+    """
+    if not block.strip():
+        return np.empty(0, dtype=np.float64)
+    try:
+        values = np.loadtxt(io.BytesIO(block), delimiter=',', usecols=-1, dtype=np.float64, ndmin=1)
+    except ValueError:
+        parsed = []
+        for line in block.split(b'\n'):
+            try:
+                parsed.append(float(line.rsplit(b',', 1)[-1]))
+            except ValueError:
+                continue
+        values = np.array(parsed, dtype=np.float64)
+    return values[np.isfinite(values)]
+
+def _text_blocks(path):
+    """텍스트 로그 -> 줄 경계에서 끊은 원본 바이트 블록 (파싱은 하지 않음)
+
+    마지막 줄바꿈 뒤는 다음 블록으로 넘김.
+    """
+    remainder = b''
+    with open(path, 'rb') as f:
+        while True:
+            with span('read_block', cat='data'):
+                block = f.read(TEXT_BLOCK_BYTES)
+            if not block:
+                break
+            data = remainder + block
+            cut = data.rfind(b'\n') + 1
+            remainder = data[cut:]
+            if cut:
+                yield data[:cut]
+    if remainder:
+        yield remainder
+
+def _is_text_log(source):
+    """score_io 형식(.npy/.scores)이 아닌 파일 경로인지"""
+    if not isinstance(source, (str, os.PathLike)):
+        return False
+    path = os.fspath(source)
+    return not (os.path.isdir(path) or path.endswith('.npy'))
+
+def iter_score_chunks(source, chunk_size=CHUNK_SIZE):
+    """점수 파일을 청크 단위로 순차 읽기 (읽은 청크는 메모리에 복사된 배열)
+
+    source: 배열, .npy/.scores (score_io 형식, 메모리 매핑) 또는 텍스트 로그 경로
+    텍스트 로그는 바이트 블록 하나를 청크 하나로 돌려줌 (chunk_size와 무관).
+    """
+    if _is_text_log(source):
+        for block in _text_blocks(os.fspath(source)):
+            yield parse_text_block(block)
+        return
+    if isinstance(source, (str, os.PathLike)):
+        from score_io import load_scores
+        source = load_scores(os.fspath(source))[1]
+    scores = np.asarray(source).reshape(-1)
+    for start in range(0, len(scores), chunk_size):
+        with span('read_chunk', cat='data'):
+            chunk = np.array(scores[start:start + chunk_size])
+        yield chunk
+
+def _block_stats(block, k, seed):
+    """텍스트 블록 하나를 파싱해 집계 - 스레드 풀 작업 단위"""
+    with span('parse_block', cat='data'):
+        values = parse_text_block(block)
+    return RunningStats.from_chunk(values, k, seed)
+
+@traced(name='stream_stats', cat='stats')
+def stream_stats(source, chunk_size=CHUNK_SIZE, jobs=1, k=DEFAULT_K):
+    """점수 파일 한 번 순차 스캔으로 RunningStats 계산
+
+    읽기는 호출 스레드에서, 청크별 집계는 스레드 풀(jobs개)에서 다음 청크를 읽는 동안 진행.
+    텍스트 로그는 호출 스레드가 원본 바이트 블록만 읽고 파싱까지 풀에서 함.
+    결과는 읽은 순서대로 병합하므로 jobs와 관계없이 같음. 메모리는 (jobs + PREFETCH) 청크로 제한.
+    """
+    if jobs is None or jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if _is_text_log(source):
+        work, chunks = _block_stats, _text_blocks(os.fspath(source))
+    else:
+        work, chunks = RunningStats.from_chunk, iter_score_chunks(source, chunk_size)
+    total = RunningStats(k)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for index, chunk in enumerate(chunks):
+            pending.append(executor.submit(work, chunk, k, index))
+            while len(pending) > jobs + PREFETCH - 1:
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+    return total
+
+def print_summary(name, stats):
+    """요약 통계 한 줄 출력"""
+    summary = stats.summary()
+    mode = '정확' if stats.is_quantized else f'스케치 k={stats.k}'
+    values = ', '.join(f'{key} {summary[key]:.4f}' for key in SUMMARY_KEYS)
+    print(f"{name}: n={stats.n:,}, {values} (중앙값: {mode})")
+
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='메모리보다 큰 점수 파일의 단일 패스 요약 통계')
+    parser.add_argument('inputs', nargs='+',
+                        help='점수 파일 (.npy, .scores 디렉터리 또는 한 줄에 점수 하나인 텍스트 로그)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f'청크당 점수 수 (기본값: {CHUNK_SIZE})')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='청크 집계 스레드 수 (0이면 CPU 코어 수, 기본값: 1)')
+    parser.add_argument('-k', type=int, default=DEFAULT_K,
+                        help=f'소수점 둘째 자리가 아닌 점수의 중앙값 스케치 정확도 (기본값: {DEFAULT_K})')
+    parser.add_argument('--percentiles', default=None, help='추가로 출력할 쉼표 구분 퍼센타일')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='읽기/집계 단계별 span을 Chrome trace JSON으로 저장')
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    """명령행 실행 (cli.py 하위 명령에서도 사용) -> 종료 코드"""
+    args = parse_args(argv)
+    if args.trace:
+        enable_tracing()
+    for path in args.inputs:
+        stats = stream_stats(path, args.chunk_size, args.jobs, args.k)
+        print_summary(path, stats)
+        if args.percentiles:
+            percentiles = [float(p) for p in args.percentiles.split(',')]
+            for p, value in zip(percentiles, np.atleast_1d(stats.percentile(percentiles))):
+                print(f"  {p:g}th percentile: {value:.4f}")
+    if args.trace:
+        save_trace(args.trace)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(run())
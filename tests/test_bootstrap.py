@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from bootstrap import STATISTICS, bootstrap_statistics
+from quantized_scores import QuantizedScores
+
+
+@pytest.mark.parametrize('quantized', [True, False])
+def test_results_do_not_depend_on_jobs(quantized):
+    scores = np.round(np.random.default_rng(0).beta(5, 2, 2_000), 2)
+    data = QuantizedScores.from_scores(scores) if quantized else scores
+    serial = bootstrap_statistics(data, 300, seed=7, jobs=1, batch_size=64)
+    parallel = bootstrap_statistics(data, 300, seed=7, jobs=2, batch_size=64)
+    for name in STATISTICS:
+        assert len(serial[name]) == 300
+        np.testing.assert_array_equal(serial[name], parallel[name])
+
+
+def test_count_resamples_match_array_statistics():
+    scores = np.round(np.random.default_rng(1).beta(5, 2, 5_000), 2).astype(np.float32)
+    counts = bootstrap_statistics(QuantizedScores.from_scores(scores), 2_000, seed=1)
+    arrays = bootstrap_statistics(scores, 2_000, seed=1)
+    for name in STATISTICS:
+        # 서로 다른 재표본 방식이므로 분포 요약만 비교
+        assert counts[name].mean() == pytest.approx(arrays[name].mean(), abs=3e-3)
+    assert counts['Mean'].std() == pytest.approx(scores.std() / np.sqrt(len(scores)), rel=0.1)
@@ -0,0 +1,57 @@
+import importlib
+import sys
+
+import numpy as np
+import pytest
+
+import paper_visualization
+from build_manifest import _local_imports, figure_fingerprint, hash_inputs, source_digest
+from quantized_scores import QuantizedScores
+from streaming_stats import RunningStats
+
+
+def fingerprint(tmp_path, helper_source):
+    (tmp_path / 'fig_helper.py').write_text(helper_source)
+    (tmp_path / 'fig_plot.py').write_text(
+        'def plot():\n    from fig_helper import finish\n    return finish()\n')
+    for cache in (_local_imports, source_digest):
+        cache.cache_clear()
+    sys.modules.pop('fig_plot', None)
+    module = importlib.import_module('fig_plot')
+    return figure_fingerprint(module.plot, 'data')
+
+
+def test_helper_module_change_invalidates_fingerprint(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    before = fingerprint(tmp_path, 'def finish():\n    return 1\n')
+    assert fingerprint(tmp_path, 'def finish():\n    return 1\n') == before
+    assert fingerprint(tmp_path, 'def finish():\n    return 2\n') != before
+
+
+def test_summary_containers_hash_by_state():
+    rng = np.random.default_rng(0)
+    centiles = np.round(rng.random(500), 2)
+    logits = rng.normal(0, 1, 500)
+    for make in (lambda: RunningStats.from_chunk(centiles), lambda: RunningStats.from_chunk(logits, seed=0),
+                 lambda: QuantizedScores.from_scores(centiles),
+                 lambda: QuantizedScores.from_counts(QuantizedScores.from_scores(centiles).counts)):
+        assert hash_inputs({'data': make()}) == hash_inputs({'data': make()})
+    assert hash_inputs(RunningStats.from_chunk(centiles)) != hash_inputs(RunningStats.from_chunk(centiles[1:]))
+
+
+def test_identical_score_file_runs_skip_second_render(tmp_path, monkeypatch):
+    rng = np.random.default_rng(1)
+    paths = []
+    for name in ('baseline', 'proposed'):
+        paths.append(str(tmp_path / f'{name}.npy'))
+        np.save(paths[-1], np.round(rng.random(2_000), 2))
+    monkeypatch.chdir(tmp_path)
+    kwargs = dict(incremental=True, themes=('bw',), bootstrap=0, score_files=paths)
+    first = paper_visualization.main(**kwargs)
+    assert all(r['ok'] and not r['skipped'] for r in first)
+
+    # 두 번째 실행은 분석 계산 없이 모든 그림을 건너뜀
+    monkeypatch.setattr(paper_visualization, 'compute_paper_analysis',
+                        lambda *args, **kwargs: pytest.fail('분석을 다시 계산함'))
+    second = paper_visualization.main(**kwargs)
+    assert all(r['ok'] and r['skipped'] for r in second)
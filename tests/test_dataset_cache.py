@@ -0,0 +1,26 @@
+import numpy as np
+
+from dataset_cache import clear_dataset_cache, load_dataset
+
+CALLS = []
+
+
+def generate(n_queries=10, seed=0):
+    CALLS.append(seed)
+    return np.random.default_rng(seed).random(n_queries).astype(np.float32)
+
+
+def test_memory_cache_is_keyed_by_cache_dir(tmp_path):
+    clear_dataset_cache()
+    CALLS.clear()
+    plain = load_dataset(generate, 10, 1)
+    assert load_dataset(generate, 10, 1) is plain
+    cached = load_dataset(generate, 10, 1, tmp_path / 'a')
+    # 메모리 캐시에 있어도 처음 쓰는 cache_dir에는 파일을 만듦
+    assert len(list((tmp_path / 'a').iterdir())) == 1
+    np.testing.assert_array_equal(cached, plain)
+    clear_dataset_cache()
+    reloaded = load_dataset(generate, 10, 1, tmp_path / 'a')
+    assert isinstance(reloaded, np.memmap)
+    assert CALLS == [1, 1]
+    clear_dataset_cache()
@@ -0,0 +1,19 @@
+import numpy as np
+
+from density_grid import DEFAULT_Y_RANGE, compute_density_grid
+from quantized_scores import QuantizedScores
+
+
+def test_counts_match_histogram2d(tmp_path):
+    rng = np.random.default_rng(0)
+    scores = np.round(rng.random(10_007), 2)     # y_range 밖 점수(0.19 이하)는 제외됨
+    shape = (37, 81)
+    path = str(tmp_path / 'scores.npy')
+    np.save(path, scores)
+    n = len(scores)
+    expected, _, _ = np.histogram2d(np.arange(n) * shape[0] / n, scores, bins=shape,
+                                    range=[(0, shape[0]), DEFAULT_Y_RANGE])
+    for source in (scores, path, QuantizedScores.from_scores(scores)):
+        grid = compute_density_grid(source, shape, chunk_size=1_000)
+        np.testing.assert_array_equal(grid['counts'], expected)
+        assert grid['extent'] == (0, n / 1000, *DEFAULT_Y_RANGE)
@@ -0,0 +1,66 @@
+import json
+import os
+
+import numpy as np
+
+from batch_mode import enable_batch_mode
+from drift_monitor import ALERT_FIELDS, DriftMonitor, SlidingWindow, classify_shape
+from percentile_histogram import (generate_balanced_array, generate_concentrated_array,
+                                  generate_dispersed_array)
+
+GENERATORS = {'concentrated': generate_concentrated_array, 'dispersed': generate_dispersed_array,
+              'balanced': generate_balanced_array}
+
+
+def window_of(shape, n=2_000, seed=0):
+    scores = np.clip(np.round(GENERATORS[shape](n, seed=seed), 2), 0, 1)
+    window = SlidingWindow()
+    window.add_batch(scores, np.zeros(n))
+    assert window.shape() == shape
+    return window
+
+
+def shape_events(monitor, shape, timestamp):
+    monitor.windows['s'] = window_of(shape, seed=timestamp)
+    return [(e['kind'], e['status']) for e in monitor.check(timestamp) if e['kind'].startswith('shape')]
+
+
+def test_shape_alert_follows_current_shape(tmp_path):
+    monitor = DriftMonitor(names=('s',), output_dir=str(tmp_path))
+    monitor.set_reference('s', window_of('concentrated').counts)
+    assert shape_events(monitor, 'balanced', 1) == [('shape:balanced', 'fire')]
+    assert shape_events(monitor, 'dispersed', 2) == [('shape:dispersed', 'fire'),
+                                                     ('shape:balanced', 'resolve')]
+    assert [key for _, key in monitor.active if key[0] == 'shape'] == [('shape', 'dispersed')]
+    assert shape_events(monitor, 'concentrated', 3) == [('shape:dispersed', 'resolve')]
+
+
+def test_alert_values_are_rounded_float64(tmp_path):
+    monitor = DriftMonitor(names=('s',), output_dir=str(tmp_path))
+    monitor.set_reference('s', window_of('concentrated').counts)
+    monitor.windows['s'] = window_of('dispersed')
+    for event in monitor.check(1):
+        record = json.loads(json.dumps({key: event[key] for key in ALERT_FIELDS}))
+        for key in ('reference', 'current'):
+            if isinstance(record[key], float):
+                assert record[key] == round(record[key], 6)
+    thresholds = [e for e in monitor.alerts if e['kind'].startswith('threshold')]
+    assert thresholds and all(len(repr(e['reference'])) <= 8 for e in thresholds)
+
+
+def test_refresh_writes_to_output_dir(tmp_path, monkeypatch):
+    enable_batch_mode()
+    monkeypatch.chdir(tmp_path)
+    monitor = DriftMonitor(output_dir='out')
+    for name in GENERATORS:
+        monitor.windows[name] = window_of(name)
+    monitor.now = 0.0
+    assert monitor.refresh()
+    assert os.getcwd() == str(tmp_path)
+    assert not any(name.endswith('.png') for name in os.listdir(tmp_path))
+    assert 'percentile_histograms.png' in os.listdir(tmp_path / 'out')
+
+
+def test_classify_shape_on_generators():
+    for shape in GENERATORS:
+        assert classify_shape(window_of(shape, seed=7).counts) == shape
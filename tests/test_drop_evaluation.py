@@ -0,0 +1,42 @@
+import numpy as np
+
+from drop_evaluation import best_f1_thresholds, drop_curves, drop_metrics_at
+
+
+def brute_force(scores, labels, threshold):
+    dropped = scores < threshold
+    tp = np.sum(dropped & labels)
+    precision = tp / dropped.sum() if dropped.sum() else 0.0
+    recall = tp / labels.sum() if labels.sum() else 0.0
+    f1 = 2 * tp / (dropped.sum() + labels.sum()) if dropped.sum() + labels.sum() else 0.0
+    return precision, recall, f1
+
+
+def test_drop_curves_match_brute_force_thresholds():
+    rng = np.random.default_rng(0)
+    # 동점이 많은 소수점 둘째 자리 점수 두 방법
+    scores = np.round(rng.random((2, 400)), 2)
+    labels = rng.random(400) < 0.3
+    curves = drop_curves(scores, labels)
+    for m in range(2):
+        for j in range(400):
+            expected = brute_force(scores[m], labels, curves['thresholds'][m, j])
+            got = (curves['precision'][m, j], curves['recall'][m, j], curves['f1'][m, j])
+            np.testing.assert_allclose(got, expected, err_msg=f'method {m}, column {j}')
+        # 모든 점수 사이 임계값 중 F1 최대와 같아야 함
+        candidates = np.append(np.unique(scores[m]), np.nextafter(scores[m].max(), np.inf))
+        best = max(brute_force(scores[m], labels, t)[2] for t in candidates)
+        assert curves['f1'][m].max() == best
+
+
+def test_metrics_at_best_threshold():
+    rng = np.random.default_rng(1)
+    scores = rng.random((3, 200))
+    labels = rng.random((3, 200)) < 0.5
+    curves = drop_curves(scores, labels)
+    thresholds = best_f1_thresholds(curves)
+    precision, recall, f1 = drop_metrics_at(scores, labels, thresholds)
+    for m in range(3):
+        np.testing.assert_allclose((precision[m], recall[m], f1[m]),
+                                   brute_force(scores[m], labels[m], thresholds[m]))
+        assert f1[m] == curves['f1'][m].max()
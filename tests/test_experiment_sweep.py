@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pytest
+
+from experiment_sweep import SUMMARY_STATS, evaluate_run, summarize_sweep
+
+
+def write_run(tmp_path, **methods):
+    paths = {}
+    for method, scores in methods.items():
+        paths[method] = str(tmp_path / f'{method}.npy')
+        np.save(paths[method], scores)
+    return {'dataset': 'd', 'run': 'r', 'methods': paths}
+
+
+def reference_stats(scores):
+    return dict(zip(SUMMARY_STATS, (scores.mean(), np.median(scores), scores.std(),
+                                    np.percentile(scores, 10), np.percentile(scores, 90))))
+
+
+def test_unquantized_scores_are_not_rounded(tmp_path):
+    rng = np.random.default_rng(0)
+    logits = rng.normal(0, 3, 1_000)            # 0-1 범위 밖, 소수점 둘째 자리 아님
+    centiles = np.round(rng.random(1_000), 2)
+    result = evaluate_run(write_run(tmp_path, logits=logits, centiles=centiles))
+    assert result['ok'], result['error']
+    records = summarize_sweep([result])['records']
+    for method, scores in (('logits', logits), ('centiles', centiles)):
+        values = {r['metric']: r['value'] for r in records if r['method'] == method}
+        expected = reference_stats(scores.astype(np.float64))
+        assert values == pytest.approx(expected, rel=1e-6, abs=1e-9)
+    # 그림용 개수는 모든 점수를 (양 끝 칸 포함) 한 번씩 셈
+    assert result['counts'].sum(axis=1).tolist() == [1_000, 1_000]
+
+
+def test_run_figures_written_under_out_dir(tmp_path, monkeypatch):
+    rng = np.random.default_rng(1)
+    work = tmp_path / 'work'
+    work.mkdir()
+    monkeypatch.chdir(work)
+    run = write_run(tmp_path, a=np.round(rng.random(200), 2), b=np.round(rng.random(200), 2))
+    result = evaluate_run(run, out_dir=str(tmp_path / 'out'), themes=('bw',))
+    assert result['ok'], result['error']
+    # 호출한 쪽의 작업 디렉터리는 그대로, 그림은 out/<dataset>/<run>/ 아래에만 저장
+    assert os.getcwd() == str(work)
+    assert not list(work.iterdir())
+    assert (tmp_path / 'out' / 'd' / 'r' / 'kde_comparison_bw.png').exists()
@@ -0,0 +1,33 @@
+import numpy as np
+from scipy import stats
+
+from fast_kde import fast_kde, kde_density
+from quantized_scores import QuantizedScores
+
+
+def test_quantized_kde_matches_gaussian_kde():
+    rng = np.random.default_rng(0)
+    scores = np.round(rng.beta(5, 2, 5_000), 2)
+    coords = np.linspace(-0.2, 1.2, 301)
+    expected = stats.gaussian_kde(scores)(coords)
+    np.testing.assert_allclose(kde_density(scores, coords, decimals=2), expected, rtol=1e-9, atol=1e-12)
+    quantized = kde_density(QuantizedScores.from_scores(scores), coords, decimals=2)
+    np.testing.assert_allclose(quantized, stats.gaussian_kde(scores.astype(np.float32))(coords),
+                               rtol=1e-6, atol=1e-9)
+
+
+def test_binned_kde_is_close_to_gaussian_kde():
+    rng = np.random.default_rng(1)
+    data = np.concatenate([rng.normal(0, 1, 20_000), rng.normal(5, 0.5, 10_000)])
+    grid, density = fast_kde(data)
+    expected = stats.gaussian_kde(data)(grid)
+    assert np.abs(density - expected).max() <= 1e-3 * expected.max()
+
+
+def test_bandwidth_methods_match_scipy():
+    data = np.random.default_rng(2).normal(size=500)
+    coords = np.linspace(-4, 4, 50)
+    for method in ('silverman', 0.3):
+        expected = stats.gaussian_kde(data, bw_method=method)(coords)
+        np.testing.assert_allclose(kde_density(data, coords, bw_method=method, num_bins=4096),
+                                   expected, rtol=1e-3, atol=1e-5)
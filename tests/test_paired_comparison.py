@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from paired_comparison import join_query_ids
+
+
+def reference_join(ids_a, ids_b):
+    """파이썬 dict 기준 조인 (중복 ID는 처음 나온 행)"""
+    first_a, first_b = {}, {}
+    for i, key in enumerate(ids_a.tolist()):
+        first_a.setdefault(key, i)
+    for i, key in enumerate(ids_b.tolist()):
+        first_b.setdefault(key, i)
+    common = sorted(set(first_a) & set(first_b))
+    return {
+        'query_ids': common,
+        'index_a': [first_a[k] for k in common],
+        'index_b': [first_b[k] for k in common],
+        'only_a': sorted(set(first_a) - set(first_b)),
+        'only_b': sorted(set(first_b) - set(first_a)),
+        'duplicates_a': sorted(k for k in first_a if ids_a.tolist().count(k) > 1),
+        'duplicates_b': sorted(k for k in first_b if ids_b.tolist().count(k) > 1),
+    }
+
+
+def make_ids(kind, rng):
+    if kind == 'dense':
+        return rng.integers(0, 300, 250), rng.integers(50, 350, 280)
+    if kind == 'sparse':
+        pool = rng.choice(10 ** 12, 400, replace=False)
+        return rng.choice(pool, 250), rng.choice(pool, 280)
+    pool = np.array([f'q{i}' for i in range(400)])
+    return rng.choice(pool, 250), rng.choice(pool, 280)
+
+
+@pytest.mark.parametrize('kind', ['dense', 'sparse', 'string'])
+def test_join_matches_dict_reference(kind):
+    rng = np.random.default_rng(0)
+    ids_a, ids_b = make_ids(kind, rng)
+    result = join_query_ids(ids_a, ids_b)
+    expected = reference_join(ids_a, ids_b)
+    assert expected['duplicates_a'] and expected['only_a'] and expected['only_b']
+    for key, value in expected.items():
+        assert result[key].tolist() == value, key
+
+
+def test_same_order_and_permuted_ids():
+    ids = np.arange(10, 20)
+    same = join_query_ids(ids, ids.copy())
+    assert same['index_a'].tolist() == same['index_b'].tolist() == list(range(10))
+    shuffled = np.random.default_rng(1).permutation(ids)
+    result = join_query_ids(ids, shuffled)
+    np.testing.assert_array_equal(shuffled[result['index_b']], ids[result['index_a']])
+    assert len(result['only_a']) == len(result['only_b']) == 0
@@ -0,0 +1,52 @@
+import pytest
+
+import paper_visualization
+import paper_visualization_bw
+
+
+def test_bw_entry_point_rejects_themes():
+    with pytest.raises(SystemExit):
+        paper_visualization_bw.parse_args(['--themes', 'color'])
+    assert not hasattr(paper_visualization_bw.parse_args([]), 'themes')
+    assert paper_visualization.parse_args(['--themes', 'bw']).themes == ('bw',)
+
+
+def test_bw_entry_point_forwards_density(monkeypatch):
+    calls = []
+    monkeypatch.setattr(paper_visualization_bw, 'render_paper_figures',
+                        lambda *args, **kwargs: calls.append(kwargs) or [])
+    assert paper_visualization_bw.run(['--density', 'raster']) == 0
+    assert calls[0]['density'] == 'raster'
+    assert calls[0]['themes'] == ('bw',)
+
+
+def test_hexbin_grid_matches_matplotlib_hexbin():
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    y = np.round(np.clip(rng.normal(0.6, 0.12, 6_600), 0, 1), 2)
+    x = np.arange(len(y)) / 1000
+    grid = paper_visualization.compute_hexbin_grid(x, y, gridsize=50)
+
+    fig, (ax1, ax2) = plt.subplots(1, 2)
+    reference = ax1.hexbin(x, y, gridsize=50, cmap='Blues')
+    np.testing.assert_array_equal(grid['counts'], reference.get_array())
+    np.testing.assert_allclose(np.column_stack([grid['x'], grid['y']]), reference.get_offsets())
+
+    # 같은 셀을 같은 육각형과 색으로 그림
+    drawn = paper_visualization.draw_hexbin_grid(ax2, grid, cmap='Blues', alpha=None)
+    np.testing.assert_allclose(drawn.get_paths()[0].vertices, reference.get_paths()[0].vertices)
+    fig.canvas.draw()
+    np.testing.assert_array_equal(drawn.get_facecolors(), reference.get_facecolors())
+    plt.close(fig)
+
+
+def test_list_generators_wrap_array_generators():
+    import numpy as np
+
+    for to_list, to_array in ((paper_visualization.generate_baseline_data, paper_visualization.generate_baseline_array),
+                              (paper_visualization.generate_proposed_data, paper_visualization.generate_proposed_array)):
+        data = to_list(500)
+        assert isinstance(data, list) and all(type(v) is float and v == round(v, 2) for v in data)
+        np.testing.assert_allclose(data, to_array(500), atol=1e-6)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import percentile_histogram
+from percentile_histogram import (PERCENTILES, calculate_filter_statistics, filter_scores,
+                                  load_percentile_datasets)
+from quantized_scores import QuantizedScores
+
+
+@pytest.mark.parametrize('method', ['exact', 'sketch'])
+def test_filter_statistics_use_the_shown_threshold(method):
+    datasets = load_percentile_datasets(1000, threshold_method=method, sketch_k=64)
+    for name in PERCENTILES:
+        data, threshold = datasets[name], datasets['thresholds'][name]
+        kept = np.asarray(filter_scores(data, threshold), dtype=np.float64)
+        stats = calculate_filter_statistics(data, threshold)
+        assert stats['Filtered']['Count'] == len(kept)
+        assert stats['Filtered']['Mean'] == pytest.approx(kept.mean())
+        assert stats['Filtered']['Std'] == pytest.approx(kept.std())
+        assert stats['Original']['Count'] == len(data)
+
+
+def test_quantized_filter_statistics_match_array():
+    scores = np.round(np.random.default_rng(0).random(2_000), 2)
+    by_array = calculate_filter_statistics(scores, 0.3)
+    by_counts = calculate_filter_statistics(QuantizedScores.from_scores(scores), 0.3)
+    for part in ('Original', 'Filtered'):
+        assert by_counts[part]['Count'] == by_array[part]['Count']
+        assert by_counts[part]['Mean'] == pytest.approx(by_array[part]['Mean'], rel=1e-6)
+        assert by_counts[part]['Std'] == pytest.approx(by_array[part]['Std'], rel=1e-5)
+
+
+@pytest.mark.parametrize('name', list(PERCENTILES))
+def test_list_generators_wrap_array_generators(name):
+    data = getattr(percentile_histogram, f'generate_{name}_data')(300)
+    assert isinstance(data, list) and data == sorted(data)
+    np.testing.assert_array_equal(data, getattr(percentile_histogram, f'generate_{name}_array')(300))
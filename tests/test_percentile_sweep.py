@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from percentile_sweep import percentile_sweep
+from quantized_scores import QuantizedScores
+
+
+def brute_force(values, percentiles):
+    """퍼센타일마다 np.percentile 임계값으로 직접 필터링"""
+    rows = []
+    for p in percentiles:
+        threshold = np.percentile(values, p)
+        kept = values[values >= threshold]
+        rows.append((threshold, len(kept), kept.mean(), kept.std()))
+    return np.array(rows).T
+
+
+@pytest.mark.parametrize('quantized', [False, True])
+def test_sweep_matches_brute_force(quantized):
+    rng = np.random.default_rng(0)
+    values = np.clip(np.round(rng.normal(0.6, 0.15, 20_000), 2), 0, 1)
+    percentiles = np.arange(1, 100)
+    data = QuantizedScores.from_scores(values) if quantized else values
+    # QuantizedScores는 float32 점수 값을 그대로 씀
+    reference = values.astype(np.float32).astype(np.float64) if quantized else values
+    sweep = percentile_sweep(data, percentiles)
+    thresholds, counts, means, stds = brute_force(reference, percentiles)
+    np.testing.assert_allclose(sweep['thresholds'], thresholds, rtol=1e-12)
+    np.testing.assert_array_equal(sweep['counts'], counts)
+    np.testing.assert_allclose(sweep['means'], means, rtol=1e-9)
+    np.testing.assert_allclose(sweep['stds'], stds, rtol=1e-6, atol=1e-12)
+    assert sweep['original_count'] == len(values)
+    assert sweep['original_std'] == pytest.approx(reference.std())
+
+
+def test_quantized_sweep_matches_array_sweep():
+    values = np.round(np.random.default_rng(1).random(5_000), 2)
+    quantized = QuantizedScores.from_scores(values)
+    by_counts = percentile_sweep(quantized)
+    by_array = percentile_sweep(quantized.to_array())
+    for key in ('thresholds', 'counts', 'means', 'stds'):
+        np.testing.assert_allclose(by_counts[key], by_array[key], rtol=1e-9, atol=1e-12)
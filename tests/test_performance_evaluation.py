@@ -0,0 +1,19 @@
+import numpy as np
+
+from batch_mode import enable_batch_mode
+from performance_evaluation import load_performance_data, plot_improvement_analysis
+
+
+def test_improvement_analysis_with_other_methods(tmp_path, monkeypatch):
+    enable_batch_mode()
+    monkeypatch.chdir(tmp_path)
+    rows = ['dataset,method,metric,value']
+    for d in ('a', 'b'):
+        for m, method in enumerate(('bm25', 'dense', 'hybrid')):
+            for k, metric in enumerate(('nDCG@10', 'Recall@100', 'MRR')):
+                rows.append(f'{d},{method},{metric},{10 * m + k + (d == "b")}')
+    (tmp_path / 'metrics.csv').write_text('\n'.join(rows) + '\n')
+    df = load_performance_data(str(tmp_path / 'metrics.csv'))
+    np.testing.assert_allclose(df['Improvement (%p)'], [20, 20, 20])
+    plot_improvement_analysis(df)
+    assert (tmp_path / 'improvement_analysis.png').stat().st_size > 0
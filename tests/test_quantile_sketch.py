@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from percentile_histogram import load_threshold_sketch
+from quantile_sketch import KLLSketch, normalized_rank_error, sketch_scores
+
+
+def rank_errors(sketch, values, percentiles):
+    ordered = np.sort(values)
+    estimates = np.atleast_1d(sketch.percentile(percentiles))
+    ranks = np.searchsorted(ordered, estimates, side='left') / len(ordered)
+    return np.abs(ranks - np.asarray(percentiles) / 100)
+
+
+def test_rank_error_after_merge():
+    rng = np.random.default_rng(0)
+    parts = [rng.normal(i, 1 + i, 40_000) for i in range(8)]
+    merged = KLLSketch(seed=1)
+    for i, part in enumerate(parts):
+        merged.merge(sketch_scores(part, seed=10 + i))
+    values = np.concatenate(parts)
+    assert merged.n == len(values)
+    assert not merged.is_exact
+    assert merged.retained < len(values) // 50
+    percentiles = np.arange(1, 100)
+    assert rank_errors(merged, values, percentiles).max() <= normalized_rank_error(merged.k)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+def test_save_load_keeps_source(tmp_path):
+    sketch = sketch_scores(np.arange(1000.0), k=64, seed=0)
+    sketch.source = {'n_queries': 1000, 'seed': 42}
+    sketch.save(tmp_path / 's.npz')
+    loaded = KLLSketch.load(tmp_path / 's.npz')
+    assert loaded.source == sketch.source
+    assert loaded.percentile(50) == sketch.percentile(50)
+
+
+def test_threshold_sketch_rebuilt_when_parameters_change(tmp_path):
+    small, large = np.linspace(0, 1, 100), np.linspace(0, 10, 1000)
+    first = load_threshold_sketch('d', small, 64, tmp_path, {'n_queries': 100, 'seed': 1})
+    assert first.n == 100
+    reused = load_threshold_sketch('d', large, 64, tmp_path, {'n_queries': 100, 'seed': 1})
+    assert reused.n == 100
+    for k, source in ((64, {'n_queries': 1000, 'seed': 1}), (128, {'n_queries': 1000, 'seed': 1})):
+        rebuilt = load_threshold_sketch('d', large, k, tmp_path, source)
+        assert (rebuilt.n, rebuilt.k) == (1000, k)
+        assert KLLSketch.load(tmp_path / 'd.npz').source == source
+
+
+def test_external_sketch_with_other_k_is_refused(tmp_path):
+    sketch_scores(np.arange(100.0), k=64).save(tmp_path / 'd.npz')
+    assert load_threshold_sketch('d', None, 64, tmp_path, {'n_queries': 5}).n == 100
+    with pytest.raises(ValueError):
+        load_threshold_sketch('d', None, 128, tmp_path, {'n_queries': 5})
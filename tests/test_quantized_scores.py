@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from quantized_scores import QuantizedScores, as_quantized
+
+
+def centile_scores(n=10_001, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.clip(np.round(rng.beta(5, 2, n), 2), 0, 1).astype(np.float32)
+
+
+def test_bincount_statistics_match_numpy():
+    scores = centile_scores()
+    quantized = QuantizedScores.from_scores(scores)
+    reference = scores.astype(np.float64)
+    q = np.linspace(0, 100, 41)
+    np.testing.assert_allclose(quantized.percentile(q), np.percentile(reference, q), rtol=1e-12)
+    assert quantized.median() == pytest.approx(np.median(reference))
+    assert quantized.mean() == pytest.approx(reference.mean(), rel=1e-12)
+    assert quantized.std(ddof=1) == pytest.approx(reference.std(ddof=1), rel=1e-12)
+    assert (quantized.min(), quantized.max()) == (reference.min(), reference.max())
+    np.testing.assert_array_equal(quantized.to_array(), scores)
+
+
+def test_counts_only_matches_codes():
+    quantized = QuantizedScores.from_scores(centile_scores(seed=1))
+    from_counts = QuantizedScores.from_counts(quantized.counts)
+    np.testing.assert_allclose(from_counts.percentile([10, 50, 90]), quantized.percentile([10, 50, 90]))
+    assert len(from_counts) == len(quantized)
+
+
+def test_non_centile_scores_are_not_rounded_silently():
+    scores = np.array([0.5, 0.123, 0.25])
+    with pytest.raises(ValueError):
+        QuantizedScores.from_scores(scores)
+    with pytest.raises(ValueError):
+        as_quantized(scores)
+    np.testing.assert_allclose(as_quantized(scores, rounding=True).to_array(), [0.5, 0.12, 0.25])
+
+
+def test_out_of_range_scores_raise():
+    with pytest.raises(ValueError):
+        QuantizedScores.from_scores([0.5, 1.5], rounding=True)
@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from render_server import _make_handler, resolve_output
+
+def test_resolve_output_under_root(tmp_path):
+    assert resolve_output('sub/figure.png', tmp_path) == str(tmp_path / 'sub' / 'figure.png')
+    assert resolve_output(str(tmp_path / 'figure.png'), tmp_path) == str(tmp_path / 'figure.png')
+
+@pytest.mark.parametrize('output', ['../evil.txt', '/tmp/evil.txt', '.', 'link/evil.txt'])
+def test_resolve_output_rejects_escape(tmp_path, output):
+    root = tmp_path / 'root'
+    root.mkdir()
+    os.symlink(tmp_path, root / 'link')
+    with pytest.raises(ValueError):
+        resolve_output(output, root)
+
+class _StubService:
+    """submit 호출만 기록하는 RenderService 대역 (워커 프로세스 없이 HTTP 처리만 확인)"""
+
+    def __init__(self, root):
+        self.root = root
+        self.submitted = []
+
+    def submit(self, figure, params, output):
+        resolve_output(output, self.root)
+        self.submitted.append(output)
+        return 'job'
+
+    def describe(self, job_id):
+        return {'id': job_id, 'status': 'queued'}
+
+    def job_count(self):
+        return len(self.submitted)
+
+@pytest.fixture
+def server(tmp_path):
+    service = _StubService(tmp_path)
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _make_handler(service))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield service, f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+def _post(url, payload, content_type):
+    req = urllib.request.Request(f'{url}/render', data=json.dumps(payload).encode('utf-8'),
+                                 headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+def test_post_requires_json_content_type(server):
+    service, url = server
+    payload = {'figure': 'scatter', 'output': 'figure.png', 'wait': False}
+    assert _post(url, payload, 'text/plain') == 415
+    assert _post(url, payload, 'application/json; charset=utf-8') == 202
+    assert service.submitted == ['figure.png']
+
+def test_post_rejects_output_outside_root(server):
+    service, url = server
+    payload = {'figure': 'scatter', 'output': '/tmp/evil_target.txt', 'wait': False}
+    assert _post(url, payload, 'application/json') == 400
+    assert service.submitted == []
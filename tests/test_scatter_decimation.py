@@ -0,0 +1,38 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from scatter_decimation import axes_pixel_shape, decimate_scatter, reduced_scatter
+
+def test_decimate_keeps_first_point_per_cell_and_extremes():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, 5000)
+    y = rng.uniform(0, 1, 5000)
+    keep = decimate_scatter(x, y, (0, 10), (0, 1), (20, 10), chunk_size=777)
+    cells = np.minimum((x * 2).astype(int), 19) * 10 + np.minimum((y * 10).astype(int), 9)
+    _, first = np.unique(cells, return_index=True)
+    extremes = [x.argmin(), x.argmax(), y.argmin(), y.argmax()]
+    np.testing.assert_array_equal(keep, np.union1d(first, extremes))
+
+def test_drawn_points_bounded_by_axes_cells():
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    rng = np.random.default_rng(1)
+    drawn = []
+    for n in (10_000, 300_000, 1_000_000):
+        ax1.cla()
+        _, count = reduced_scatter(ax1, np.arange(n), rng.uniform(0.1, 1.0, n), (0.1, 1.0), s=8)
+        drawn.append(count)
+    plt.close(fig)
+    # 마커 지름 기준 칸: 그림 전체가 아닌 축 하나의 칸 수 + 극값 점 4개가 상한
+    cells = np.prod(axes_pixel_shape(ax1, 300, np.sqrt(8) * 300 / 72 / 4))
+    assert cells < 250_000
+    assert max(drawn) <= cells + 4
+
+def test_cell_grid_follows_axes_not_figure():
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    nx, ny = axes_pixel_shape(ax1, 300, 1.0)
+    plt.close(fig)
+    assert nx < 14 * 300 / 2 and ny < 5 * 300
+    assert nx == pytest.approx(ax1.get_window_extent().width * 300 / fig.dpi, abs=1)
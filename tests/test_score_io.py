@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pytest
+
+from score_io import QUERY_ID_COLUMN, load_scores, save_scores
+
+
+def test_npy_round_trip(tmp_path):
+    scores = np.round(np.random.default_rng(0).random(1_000), 2)
+    path = str(tmp_path / 'scores.npy')
+    save_scores(path, scores)
+    query_ids, loaded = load_scores(path)
+    assert query_ids is None
+    assert isinstance(loaded, np.memmap)
+    assert loaded.dtype == np.float32 and loaded.shape == (1_000,)
+    np.testing.assert_array_equal(loaded, scores.astype(np.float32))
+    with pytest.raises(ValueError):
+        save_scores(path, scores, query_ids=np.arange(1_000))
+
+
+def test_columnar_round_trip(tmp_path):
+    scores = np.round(np.random.default_rng(1).random(500), 2)
+    query_ids = np.arange(500, dtype=np.int64)[::-1] * 3
+    path = str(tmp_path / 'run.scores')
+    save_scores(path, scores, query_ids)
+    loaded_ids, loaded = load_scores(path)
+    assert loaded_ids.dtype == np.int64 and loaded_ids.shape == (500,)
+    assert loaded.dtype == np.float32 and loaded.shape == (500,)
+    np.testing.assert_array_equal(loaded_ids, query_ids)
+    np.testing.assert_array_equal(loaded, scores.astype(np.float32))
+
+    # 쿼리 ID를 생략하면 1부터 순서대로
+    save_scores(path, scores)
+    np.testing.assert_array_equal(load_scores(path)[0], np.arange(1, 501))
+
+
+def test_columnar_errors(tmp_path):
+    path = str(tmp_path / 'run.scores')
+    with pytest.raises(ValueError):
+        save_scores(path, np.zeros(3), query_ids=np.arange(4))
+
+    save_scores(path, np.zeros(3))
+    np.save(os.path.join(path, f'{QUERY_ID_COLUMN}.npy'), np.arange(4, dtype=np.int64))
+    with pytest.raises(ValueError):
+        load_scores(path)
+
+    os.remove(os.path.join(path, f'{QUERY_ID_COLUMN}.npy'))
+    with pytest.raises(ValueError):
+        load_scores(path)
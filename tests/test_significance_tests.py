@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from quantized_scores import QuantizedScores
+from significance_tests import ks_test, mann_whitney_test, permutation_test, quantize_if_exact
+
+@pytest.fixture
+def scores():
+    rng = np.random.default_rng(0)
+    a = np.round(rng.beta(5, 2, 4000), 2)
+    b = np.round(rng.beta(4, 2, 3000), 2)
+    return a, b
+
+def test_quantize_if_exact(scores):
+    a, _ = scores
+    assert isinstance(quantize_if_exact(a), QuantizedScores)
+    # 소수점 둘째 자리가 아니거나 0-1 범위 밖이면 반올림하지 않고 원본 그대로
+    np.testing.assert_array_equal(quantize_if_exact(a + 0.001), a + 0.001)
+    np.testing.assert_array_equal(quantize_if_exact(a - 1), a - 1)
+
+def test_ks_count_path_matches_scipy(scores):
+    a, b = scores
+    d, p = ks_test(QuantizedScores.from_scores(a), QuantizedScores.from_scores(b))
+    expected = stats.ks_2samp(a, b, method='asymp')
+    assert d == pytest.approx(expected.statistic, abs=1e-12)
+    assert p == pytest.approx(expected.pvalue, rel=1e-6)
+
+def test_mann_whitney_count_path_matches_scipy(scores):
+    a, b = scores
+    u, p, auc = mann_whitney_test(QuantizedScores.from_scores(a), QuantizedScores.from_scores(b))
+    expected = stats.mannwhitneyu(a, b, alternative='two-sided', method='asymptotic')
+    assert u == pytest.approx(expected.statistic)
+    assert p == pytest.approx(expected.pvalue, rel=1e-9)
+    assert auc == pytest.approx(expected.statistic / (len(a) * len(b)))
+
+@pytest.mark.parametrize('quantized', [True, False])
+def test_permutation_independent_of_jobs(scores, quantized):
+    a, b = scores
+    if quantized:
+        a, b = QuantizedScores.from_scores(a), QuantizedScores.from_scores(b)
+    else:
+        a, b = a + 1e-3, b
+    serial = permutation_test(a, b, 3000, seed=7, jobs=1)
+    parallel = permutation_test(a, b, 3000, seed=7, jobs=2)
+    assert serial == parallel
+
+def test_permutation_p_value_matches_scipy():
+    rng = np.random.default_rng(2)
+    a = rng.normal(0, 1, 300)
+    b = rng.normal(0.15, 1, 200)
+    _, p = permutation_test(a, b, 20000, seed=0)
+    expected = stats.permutation_test((b, a), lambda x, y: x.mean() - y.mean(),
+                                      n_resamples=20000, random_state=0).pvalue
+    assert p == pytest.approx(expected, abs=0.01)
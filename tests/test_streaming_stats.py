@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from quantile_sketch import normalized_rank_error
+from streaming_stats import RunningStats, parse_text_block, stream_stats
+
+
+@pytest.mark.parametrize('quantized', [True, False])
+def test_chunked_merge_matches_numpy(quantized):
+    rng = np.random.default_rng(0)
+    values = rng.random(50_000)
+    if quantized:
+        values = np.round(values, 2)
+    stats = stream_stats(values, chunk_size=4_097, jobs=3)
+    assert stats.n == len(values)
+    assert stats.is_quantized == quantized
+    assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert stats.var(ddof=1) == pytest.approx(values.var(ddof=1), rel=1e-10)
+    assert (stats.min, stats.max) == (values.min(), values.max())
+    if quantized:
+        assert stats.median() == pytest.approx(np.median(values))
+    else:
+        rank = np.searchsorted(np.sort(values), stats.median()) / len(values)
+        assert abs(rank - 0.5) <= normalized_rank_error(stats.k)
+
+
+def test_merge_is_stable_for_large_offset():
+    # 합/제곱합 방식이면 자릿수 손실이 나는 큰 평균에서도 분산이 맞아야 함
+    rng = np.random.default_rng(1)
+    values = 1e9 + rng.random(10_000)
+    stats = RunningStats()
+    for chunk in np.array_split(values, 7):
+        stats.merge(RunningStats.from_chunk(chunk))
+    assert stats.var() == pytest.approx(values.var(), rel=1e-6)
+
+
+def test_text_block_skips_unparsable_fields():
+    block = b'query,score\n1,0.5\n2,-\n3, 0.25\n\n4,nan\n0.75\n'
+    np.testing.assert_array_equal(parse_text_block(block), [0.5, 0.25, 0.75])
+
+
+def test_text_log_matches_array(tmp_path, monkeypatch):
+    import streaming_stats
+    # 블록 경계가 줄 중간에 걸리도록 작은 블록으로 읽기
+    monkeypatch.setattr(streaming_stats, 'TEXT_BLOCK_BYTES', 1_000)
+    values = np.round(np.random.default_rng(2).random(5_000), 2)
+    path = tmp_path / 'scores.log'
+    path.write_text('id,score\n' + ''.join(f'{i},{v:.2f}\n' for i, v in enumerate(values)) + '9,-')
+    stats = stream_stats(path, jobs=2)
+    assert stats.n == len(values)
+    np.testing.assert_array_equal(stats.counts, RunningStats.from_chunk(values).counts)
@@ -0,0 +1,151 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 활성화된 추적기 (None이면 비활성 - span()은 공유 no-op 컨텍스트를 반환)
+_TRACER = None
+_NULL_SPAN = nullcontext()
+
+def _peak_rss_kb():
+    """현재 프로세스 최대 RSS (KB, 측정 불가면 0)"""
+    if resource is None:
+        return 0
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트 단위
+    return maxrss // 1024 if sys.platform == 'darwin' else maxrss
+
+class _Tracer:
+    """span 이벤트 수집기 (Chrome trace-event 'X' 이벤트 형식으로 보관)"""
+
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.events = []
+        self.lock = threading.Lock()
+
+    def add(self, event):
+        with self.lock:
+            self.events.append(event)
+
+class _Span:
+    """벽시계 시간, CPU 시간, 최대 RSS 증가량을 재는 구간"""
+
+    __slots__ = ('tracer', 'name', 'args', 'start', 'cpu', 'rss')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.rss = _peak_rss_kb()
+        self.cpu = time.process_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        args = dict(self.args)
+        args['cpu_ms'] = round((time.process_time() - self.cpu) * 1000, 3)
+        # ru_maxrss는 최댓값이므로 구간 동안 최대 RSS가 늘어난 만큼
+        args['peak_rss_delta_mb'] = round((_peak_rss_kb() - self.rss) / 1024, 3)
+        if exc_type is not None:
+            args['error'] = exc_type.__name__
+        self.tracer.add({
+            'name': self.name, 'cat': args.pop('cat', 'plot'), 'ph': 'X',
+            'ts': (self.start - self.tracer.origin) * 1e6, 'dur': (end - self.start) * 1e6,
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args,
+        })
+        return False
+
+def enable_tracing(origin=None):
+    """추적 시작 (이전 기록은 버림)
+
+    origin: 시각 기준점 (perf_counter 초). 병렬 워커는 부모의 기준점을 받아
+    같은 시간축에 기록 (perf_counter는 시스템 전역 단조 시계).
+    """
+    global _TRACER
+    _TRACER = _Tracer(origin)
+
+def disable_tracing():
+    """추적 중지 후 기록된 이벤트 반환"""
+    global _TRACER
+    events = _TRACER.events if _TRACER is not None else []
+    _TRACER = None
+    return events
+
+def is_tracing():
+    """추적 활성화 여부"""
+    return _TRACER is not None
+
+def span(name, **args):
+    """추적 구간 (비활성 시 공유 no-op 컨텍스트라 비용은 함수 호출 1회)
+
+    with span('kde', cat='stats'):
+        ...
+    """
+    if _TRACER is None:
+        return _NULL_SPAN
+    return _Span(_TRACER, name, args)
+
+def traced(func=None, name=None, cat='plot'):
+    """함수 호출 전체를 span으로 감싸는 데코레이터 (비활성 시 전역 변수 확인 1회)"""
+    if func is None:
+        return lambda f: traced(f, name=name, cat=cat)
+    span_name = name or func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if _TRACER is None:
+            return func(*args, **kwargs)
+        with _Span(_TRACER, span_name, {'cat': cat}):
+            return func(*args, **kwargs)
+    return wrapper
+
+def pop_trace_events():
+    """지금까지 기록된 이벤트를 반환하고 비움 (병렬 워커가 부모에게 전달할 때 사용)"""
+    if _TRACER is None:
+        return []
+    with _TRACER.lock:
+        events, _TRACER.events = _TRACER.events, []
+    return events
+
+def add_trace_events(events):
+    """다른 프로세스(병렬 워커)에서 기록한 이벤트 병합"""
+    if _TRACER is None:
+        return
+    with _TRACER.lock:
+        _TRACER.events.extend(events)
+
+def trace_origin():
+    """현재 추적의 시작 시각 (perf_counter 기준 초, 비활성이면 None)"""
+    return None if _TRACER is None else _TRACER.origin
+
+def save_trace(path):
+    """추적 결과 저장 후 안내 출력 (스크립트 종료 시 사용)"""
+    count = export_chrome_trace(path)
+    print(f"추적 기록 저장: {path} (span {count}개, chrome://tracing 또는 Perfetto에서 열기)")
+
+def export_chrome_trace(path):
+    """기록된 span을 Chrome trace-event JSON으로 저장 (chrome://tracing, Perfetto에서 열람)"""
+    events = [] if _TRACER is None else list(_TRACER.events)
+    # 프로세스 이름 메타데이터 (병렬 워커 구분용)
+    main_pid = os.getpid()
+    pids = sorted({event['pid'] for event in events})
+    metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                 'args': {'name': 'main' if pid == main_pid else f'worker-{pid}'}}
+                for pid in pids]
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': metadata + sorted(events, key=lambda e: e['ts']),
+                   'displayTimeUnit': 'ms'}, f)
+    os.replace(tmp_path, path)
+    return len(events)